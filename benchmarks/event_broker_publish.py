@@ -0,0 +1,43 @@
+"""
+Measure how many events per second EventBroker.publish delivers with
+1, 10 and 100 subscribers.
+
+Usage: python -m benchmarks.event_broker_publish [events]
+"""
+
+import sys
+from time import perf_counter
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+
+
+class Subscriber:
+    def __init__(self):
+        self.received = 0
+        EventBroker.subscribe(event=TestEvent.test_started, func=self.on_test_started)
+
+    def on_test_started(self, **kwargs):
+        self.received += 1
+
+
+def measure(*, subscriber_count, event_count):
+    EventBroker.reset()
+    subscribers = [Subscriber() for _ in range(subscriber_count)]
+    started = perf_counter()
+    for _ in range(event_count):
+        EventBroker.publish(event=TestEvent.test_started, test_name="spam")
+    elapsed = perf_counter() - started
+    assert all(s.received == event_count for s in subscribers)
+    return event_count / elapsed
+
+
+def main(event_count=10000):
+    for subscriber_count in (1, 10, 100):
+        rate = measure(subscriber_count=subscriber_count, event_count=event_count)
+        print(f"{subscriber_count:>4} subscribers: {rate:12,.0f} events per second")
+    EventBroker.reset()
+
+
+if "__main__" == __name__:
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,57 @@
+"""
+Compare the cost of journaling a suite's events with the cost of compiling
+results, building a JUnit report and saving artifacts as they happen.
+
+Usage: python -m benchmarks.event_journal [tests]
+"""
+
+import os
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.reporters.artifact_saver import ArtifactSaver
+from questions_three.reporters.event_journal import EventJournal
+from questions_three.reporters.junit_reporter import JunitReporter
+from questions_three.reporters.result_compiler import ResultCompiler
+
+
+def run_suite(test_count):
+    EventBroker.publish(event=TestEvent.suite_started, suite_name="Benchmark")
+    for n in range(test_count):
+        name = "test %d" % n
+        EventBroker.publish(event=TestEvent.test_started, test_name=name)
+        EventBroker.publish(event=TestEvent.artifact_created, artifact="x" * 1000, artifact_type="note")
+        if n % 10 == 0:
+            EventBroker.publish(event=TestEvent.test_failed, test_name=name, exception=AssertionError("nope"))
+        EventBroker.publish(event=TestEvent.test_ended, test_name=name)
+    EventBroker.publish(event=TestEvent.suite_ended, suite_name="Benchmark")
+
+
+def measure(reporter_classes, test_count):
+    EventBroker.reset()
+    reporters = [cls() for cls in reporter_classes]
+    for reporter in reporters:
+        reporter.activate()
+    started = perf_counter()
+    run_suite(test_count)
+    for reporter in reporters:
+        if isinstance(reporter, EventJournal):
+            reporter.close()
+    return perf_counter() - started
+
+
+def main(test_count=2000):
+    with TemporaryDirectory() as reports_path:
+        os.environ["REPORTS_PATH"] = reports_path
+        live = measure((ArtifactSaver, JunitReporter, ResultCompiler), test_count)
+        journaled = measure((EventJournal,), test_count)
+    print(f"Live reporters: {live * 1000:8.1f} ms for {test_count} tests")
+    print(f"Event journal:  {journaled * 1000:8.1f} ms for {test_count} tests")
+    EventBroker.reset()
+
+
+if "__main__" == __name__:
+    main(*[int(arg) for arg in sys.argv[1:2]])
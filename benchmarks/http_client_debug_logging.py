@@ -0,0 +1,61 @@
+"""
+Measure the per-request overhead HttpClient adds for a large response body
+with debug logging disabled and enabled.
+
+HttpClient used to decode and format every response body for its debug log
+whether or not debug logging was enabled, so the "DEBUG" figure below is
+what every request used to cost.
+
+Usage: python -m benchmarks.http_client_debug_logging [body megabytes] [requests]
+"""
+
+import json
+import logging
+import os
+import sys
+from time import perf_counter
+
+import requests
+from twin_sister import open_dependency_context
+from twin_sister.fakes import EndlessFake
+
+from questions_three.http_client import HttpClient
+
+
+def build_response(body):
+    response = requests.models.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = body
+    return response
+
+
+def measure(*, level, body, count):
+    with open(os.devnull, "w") as devnull:
+        context = open_dependency_context(supply_env=True, supply_logging=True)
+        try:
+            context.logging.StreamHandler = lambda *args, **kwargs: logging.StreamHandler(devnull)
+            context.set_env(QUESTIONS_THREE_HTTP_CLIENT_LOG_LEVEL=level)
+            requests_stub = EndlessFake()
+            requests_stub.get = lambda *args, **kwargs: build_response(body)
+            context.inject(requests, requests_stub)
+            client = HttpClient()
+            started = perf_counter()
+            for _ in range(count):
+                client.get("http://example.com/export")
+            return (perf_counter() - started) / count
+        finally:
+            context.close()
+
+
+def main(megabytes=2.0, count=20):
+    records = int(megabytes * 1024 * 1024 / 64)
+    body = json.dumps([{"id": n, "name": "spam" * 8} for n in range(records)]).encode("utf-8")
+    print(f"Response body: {len(body) / 1024 / 1024:.1f} MiB, {count} requests per level")
+    for level in ("INFO", "DEBUG"):
+        seconds = measure(level=level, body=body, count=count)
+        print(f"{level:>5}: {seconds * 1000:9.3f} ms per request")
+
+
+if "__main__" == __name__:
+    main(*[float(arg) for arg in sys.argv[1:2]], *[int(arg) for arg in sys.argv[2:3]])
@@ -0,0 +1,63 @@
+"""
+Measure the peak memory HttpClient uses to fetch a large body from a
+local server with get (which reads the whole body) and with download
+(which writes it to a file as it arrives).
+
+Usage: python -m benchmarks.http_client_download [megabytes]
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import sys
+from tempfile import TemporaryDirectory
+from threading import Thread
+import tracemalloc
+
+from questions_three.http_client import HttpClient
+
+CHUNK = b"x" * 65536
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    megabytes = 64
+
+    def do_GET(self):
+        chunks = self.megabytes * 16
+        self.send_response(200)
+        self.send_header("Content-Length", str(chunks * len(CHUNK)))
+        self.end_headers()
+        for _ in range(chunks):
+            self.wfile.write(CHUNK)
+
+    def log_message(self, *args):
+        pass
+
+
+def peak_megabytes(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def main(megabytes=64):
+    Handler.megabytes = megabytes
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:%d/" % server.server_address[1]
+    try:
+        client = HttpClient()
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "body")
+            print(f"get:      {peak_megabytes(lambda: client.get(url)):7.1f} MiB peak for {megabytes} MiB")
+            print(f"download: {peak_megabytes(lambda: client.download(url, path)):7.1f} MiB peak for {megabytes} MiB")
+    finally:
+        server.shutdown()
+
+
+if "__main__" == __name__:
+    main(*[int(arg) for arg in sys.argv[1:2]])
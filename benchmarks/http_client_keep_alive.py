@@ -0,0 +1,64 @@
+"""
+Measure how long HttpClient takes per request to a local server with
+connection keep-alive enabled and disabled.
+
+Without keep-alive, every request opens (and, over HTTPS, negotiates) a new
+connection, so the difference grows with the distance to the server.
+
+Usage: python -m benchmarks.http_client_keep_alive [requests]
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import sys
+from threading import Thread
+from time import perf_counter
+
+from twin_sister import open_dependency_context
+
+from questions_three.http_client import HttpClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Otherwise the body waits for the client to acknowledge the headers
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b"spam"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def measure(*, keep_alive, url, count):
+    context = open_dependency_context(supply_env=True)
+    try:
+        context.set_env(HTTP_CLIENT_KEEP_ALIVE=str(keep_alive))
+        client = HttpClient()
+        client.get(url)
+        started = perf_counter()
+        for _ in range(count):
+            client.get(url)
+        return (perf_counter() - started) / count
+    finally:
+        context.close()
+
+
+def main(count=500):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:%d/" % server.server_address[1]
+    try:
+        for keep_alive in (False, True):
+            seconds = measure(keep_alive=keep_alive, url=url, count=count)
+            print(f"keep-alive {str(keep_alive):>5}: {seconds * 1e6:9.1f} µs per request")
+    finally:
+        server.shutdown()
+
+
+if "__main__" == __name__:
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,46 @@
+"""
+Measure how long HttpClient takes to fetch many resources from a local
+server that takes 5 ms to answer each, one at a time and with map.
+
+Usage: python -m benchmarks.http_client_map [requests] [max workers]
+"""
+
+from http.server import ThreadingHTTPServer
+import sys
+from threading import Thread
+from time import perf_counter, sleep
+
+from twin_sister import open_dependency_context
+
+from questions_three.http_client import HttpClient
+
+from .http_client_keep_alive import Handler
+
+
+class SlowHandler(Handler):
+    def do_GET(self):
+        sleep(0.005)
+        super().do_GET()
+
+
+def main(count=200, max_workers=10):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    urls = ["http://127.0.0.1:%d/%d" % (server.server_address[1], n) for n in range(count)]
+    context = open_dependency_context(supply_env=True)
+    try:
+        client = HttpClient()
+        started = perf_counter()
+        for url in urls:
+            client.get(url)
+        print(f"one at a time: {perf_counter() - started:7.3f} s for {count} requests")
+        started = perf_counter()
+        client.map(urls, max_workers=max_workers)
+        print(f"map ({max_workers:2d} workers): {perf_counter() - started:7.3f} s for {count} requests")
+    finally:
+        context.close()
+        server.shutdown()
+
+
+if "__main__" == __name__:
+    main(*[int(arg) for arg in sys.argv[1:3]])
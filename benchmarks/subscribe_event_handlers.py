@@ -0,0 +1,26 @@
+"""
+Measure how long it takes to create an HttpClient, which subscribes its
+event handlers as it is created.
+
+Usage: python -m benchmarks.subscribe_event_handlers [clients]
+"""
+
+import sys
+from time import perf_counter
+
+from questions_three.event_broker import EventBroker
+from questions_three.http_client import HttpClient
+
+
+def main(client_count=10000):
+    EventBroker.reset()
+    started = perf_counter()
+    for _ in range(client_count):
+        HttpClient()
+    elapsed = perf_counter() - started
+    print(f"{elapsed / client_count * 1e6:,.1f} microseconds per HttpClient")
+    EventBroker.reset()
+
+
+if "__main__" == __name__:
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -1,3 +1,6 @@
+from io import TextIOWrapper
+from tempfile import SpooledTemporaryFile
+
 import boto3
 from twin_sister import dependency
 
@@ -7,6 +10,10 @@ from questions_three.module_cfg import config_for_module
 from questions_three.reporters.artifact_saver import ArtifactSaver
 from questions_three.reporters.artifact_saver.artifact_saver import sanitize_filename
 
+# Keep up to this many bytes of a streamed artifact in memory before
+#  spilling it to a temporary file
+SPOOL_MAX_BYTES = 1024 * 1024
+
 
 def _assemble_file_save_path(path, filename):
     prefix_object = config_for_module(__name__).s3_prefix_object_name
@@ -26,11 +33,20 @@ class S3ArtifactSaver(ArtifactSaver):
         if not bucket:
             raise InvalidConfiguration("$S3_BUCKET_FOR_ARTIFACTS is not set")
         client = dependency(boto3).client("s3")
-        kwargs = {"Bucket": bucket, "Key": _assemble_file_save_path(path, filename), "Body": artifact}
+        kwargs = {"Bucket": bucket, "Key": _assemble_file_save_path(path, filename)}
         if content_type:
             kwargs["ContentType"] = content_type
         log.debug(f"PUT {bucket}:{path}/{filename}")
-        client.put_object(**kwargs)
+        if hasattr(artifact, "write_to"):
+            with SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as body:
+                text = TextIOWrapper(body, encoding="utf-8")
+                artifact.write_to(text)
+                text.flush()
+                text.detach()
+                body.seek(0)
+                client.put_object(Body=body, **kwargs)
+        else:
+            client.put_object(Body=artifact, **kwargs)
 
     def path_for_artifact(self, suite_name, test_name, run_id):
         if suite_name is None:
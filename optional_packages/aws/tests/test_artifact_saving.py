@@ -19,15 +19,28 @@ def publish_report(filename="spam", content="spam"):
     EventBroker.publish(event=TestEvent.report_created, report_filename=filename, report_content=content)
 
 
+class StreamedArtifact:
+    def __init__(self, *pieces):
+        self.pieces = pieces
+
+    def write_to(self, f):
+        for piece in self.pieces:
+            f.write(piece)
+
+    def __str__(self):
+        return "".join(self.pieces)
+
+
 class BotoStub(EndlessFake):
     def __init__(self):
         super().__init__()
         self.s3_put_object_spy = FunctionSpy()
+        self.s3_put_object = self.s3_put_object_spy
 
     def client(self, service_name):
         client = EndlessFake()
         if "s3" == service_name:
-            client.put_object = self.s3_put_object_spy
+            client.put_object = self.s3_put_object
         return client
 
 
@@ -36,9 +49,9 @@ class TestArtifactSaving(TestCase):
         EventBroker.reset()
         self.context = open_dependency_context(supply_env=True, supply_logging=True)
         EventBroker.reset()
-        boto_stub = BotoStub()
-        self.put_spy = boto_stub.s3_put_object_spy
-        self.context.inject(boto3, boto_stub)
+        self.boto_stub = BotoStub()
+        self.put_spy = self.boto_stub.s3_put_object_spy
+        self.context.inject(boto3, self.boto_stub)
         self.context.set_env(S3_BUCKET_FOR_ARTIFACTS="something")
         self.sut = S3ArtifactSaver()
         self.sut.activate()
@@ -118,6 +131,16 @@ class TestArtifactSaving(TestCase):
         publish_artifact(artifact=expected)
         expect(self.put_spy["Body"]).to(equal(expected))
 
+    def test_writes_streamed_artifact(self):
+        bodies = []
+
+        def put_object(*, Body, **kwargs):
+            bodies.append(Body.read())
+
+        self.boto_stub.s3_put_object = put_object
+        publish_artifact(artifact=StreamedArtifact("spam, ", "spam, ", "and eggs \N{SNOWMAN}"))
+        expect(bodies).to(equal(["spam, spam, and eggs \N{SNOWMAN}".encode("utf-8")]))
+
     def test_names_file_with_artifact_type_if_provided(self):
         expected = "holy-grail"
         publish_artifact(artifact_type=expected)
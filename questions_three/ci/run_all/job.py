@@ -14,7 +14,8 @@ def now():
 
 
 class Job:
-    def __init__(self, *, path_to_script, output_stream):
+    def __init__(self, *, path_to_script, output_stream, env=None):
+        self._env = env
         self._last_flush = None
         self._output_stream = output_stream
         self._path_to_script = path_to_script
@@ -33,7 +34,9 @@ class Job:
         return (now() - self._last_flush).total_seconds() > FLUSH_INTERVAL
 
     def run(self):
-        self._proc = dependency(Popen)([dependency(sys.executable), self._path_to_script], stderr=STDOUT, stdout=PIPE)
+        self._proc = dependency(Popen)(
+            [dependency(sys.executable), self._path_to_script], env=self._env, stderr=STDOUT, stdout=PIPE
+        )
         self._last_flush = now()
 
     def kill(self):
@@ -10,7 +10,13 @@ from .job import Job
 
 
 class Pool:
-    def __init__(self, limit):
+    def __init__(self, limit, *, env=None):
+        """
+        limit -- (int or None) Run at most this number of jobs at once
+        env -- (dict or None) Run each job in this environment
+          (or inherit ours if None)
+        """
+        self._env = env
         self._limit = limit
         self._running = []
         self._log = dependency(logger_for_module)(__name__)
@@ -26,11 +32,11 @@ class Pool:
             elif exit_code > 0:
                 self.failure_count += 1
         self._running = running
-        self._log.debug("In progress: %s" % str([job.name for job in running]))
+        self._log.debug("In progress: %s", [job.name for job in running])
 
     def add(self, suite_filename):
         self._log.info("Executing %s\n" % suite_filename)
-        job = Job(path_to_script=suite_filename, output_stream=self._stdout)
+        job = Job(path_to_script=suite_filename, output_stream=self._stdout, env=self._env)
         job.run()
         self._running.append(job)
 
@@ -4,8 +4,11 @@ from time import sleep
 
 from twin_sister import dependency
 
+from questions_three.event_broker.event_bus import EventBusServer
 from questions_three.logging import logger_for_module
 from questions_three.module_cfg import config_for_module
+from questions_three.module_cfg.snapshot import SNAPSHOT_ENV_VAR, create_snapshot
+from questions_three.scaffolds.common.activate_reporters import activate_reporters
 
 from .pool import Pool
 
@@ -32,6 +35,32 @@ def _float_or_none(name, value):
         raise TypeError(f"Expected {name} ({value}) to be a number") from e
 
 
+def environment_for_suites(cfg, *, suite_dir, event_bus=None):
+    """
+    Return the environment in which to run each suite
+      (or None to inherit ours unchanged)
+    """
+    additions = {}
+    if cfg.share_config_snapshot_with_suites:
+        additions[SNAPSHOT_ENV_VAR] = create_snapshot(extra_dirs=[suite_dir])
+    if event_bus is not None:
+        additions.update(event_bus.environment())
+    if not additions:
+        return None
+    return dict(dependency(os).environ, **additions)
+
+
+def start_event_bus(cfg):
+    """
+    If suites are to forward their events to us, activate reporters and
+      return an EventBusServer to receive the events (otherwise None)
+    """
+    if not cfg.forward_suite_events:
+        return None
+    activate_reporters()
+    return dependency(EventBusServer)()
+
+
 def run_all(path):
     """
     Run all tests beneath the given path
@@ -46,14 +75,17 @@ def run_all(path):
         expiry = dependency(datetime).now() + timedelta(
             seconds=_float_or_none(name="$RUN_ALL_TIMEOUT", value=cfg.run_all_timeout)
         )
-    pool = Pool(limit)
+    event_bus = start_event_bus(cfg)
+    pool = Pool(limit, env=environment_for_suites(cfg, suite_dir=path, event_bus=event_bus))
     queue = list(discover(path))
     while queue:
         if expiry and dependency(datetime).now() > expiry:
             break
         while pool.has_capacity() and queue:
             pool.add(queue.pop(0))
-        log.debug("Waiting in queue: %d" % len(queue))
+        log.debug("Waiting in queue: %d", len(queue))
         sleep(throttle)
     pool.wait_for_jobs(expiry=expiry)
+    if event_bus is not None:
+        event_bus.close()
     return pool.failure_count
@@ -7,6 +7,7 @@ TestEvent = Enum(
     artifact_created
     http_request_sent
     http_response_received
+    load_measured
     report_created
     sample_measured
     suite_ended
@@ -1,2 +1,3 @@
 from .event_broker import EventBroker  # noqa: F401
+from .event_context import current_event_context, propagate_event_context  # noqa: F401
 from .handler_detection import subscribe_event_handlers  # noqa: F401
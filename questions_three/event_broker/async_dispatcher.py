@@ -0,0 +1,54 @@
+from queue import Queue
+from threading import Thread, current_thread
+
+from questions_three.logging import logger_for_module
+
+from .call_subscriber import call_subscriber
+
+_STOP = object()
+
+
+class AsyncDispatcher:
+    """
+    Calls subscribers on a background thread, one at a time, in the order
+      they were dispatched
+    """
+
+    def __init__(self, *, max_size):
+        self._queue = Queue(maxsize=max_size)
+        self._thread = Thread(target=self._run, name="EventDispatcher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                caller, func, kwargs, timings = item
+                caller(func, log=logger_for_module(__name__), kwargs=kwargs, timings=timings)
+            finally:
+                self._queue.task_done()
+
+    def dispatch(self, func, kwargs, timings=None, *, caller=call_subscriber):
+        """
+        Queue a call to func with the given keyword arguments.
+        When the queue is full, wait for room.
+        """
+        self._queue.put((caller, func, kwargs, timings))
+
+    def flush(self):
+        """
+        Wait until every queued call has completed
+        """
+        self._queue.join()
+
+    def is_running_in_this_thread(self):
+        return current_thread() is self._thread
+
+    def stop(self):
+        """
+        Complete every queued call and stop the background thread
+        """
+        self._queue.put(_STOP)
+        self._thread.join()
@@ -0,0 +1,50 @@
+import asyncio
+from time import perf_counter
+
+from questions_three.vanilla import format_exception
+
+# Keeps tasks scheduled by run_coroutine alive until they finish
+_scheduled = set()
+
+
+def call_subscriber(func, *, log, kwargs, timings=None):
+    log.debug("Executing %s", func)
+    started = perf_counter()
+    try:
+        func(**kwargs)
+        log.debug("%s exited cleanly", func)
+    except Exception as e:
+        log.error(format_exception(e))
+    if timings is not None:
+        timings.record(func=func, event=kwargs["event"], elapsed=perf_counter() - started)
+
+
+async def acall_subscriber(func, *, log, kwargs, timings=None):
+    log.debug("Executing %s", func)
+    started = perf_counter()
+    try:
+        await func(**kwargs)
+        log.debug("%s exited cleanly", func)
+    except Exception as e:
+        log.error(format_exception(e))
+    if timings is not None:
+        timings.record(func=func, event=kwargs["event"], elapsed=perf_counter() - started)
+
+
+def call_coroutine_subscriber(func, *, log, kwargs, timings=None):
+    run_coroutine(acall_subscriber(func, log=log, kwargs=kwargs, timings=timings))
+
+
+def run_coroutine(coro):
+    """
+    Run a coroutine to completion if this thread has no event loop running.
+    Otherwise, we cannot wait for it, so schedule it on the running loop.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(coro)
+        return
+    task = loop.create_task(coro)
+    _scheduled.add(task)
+    task.add_done_callback(_scheduled.discard)
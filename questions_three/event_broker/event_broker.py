@@ -1,79 +1,307 @@
+import asyncio
+import atexit
 from datetime import datetime
+from inspect import iscoroutinefunction
+import json
+import os
+from threading import Lock
 import weakref
 
 from twin_sister import dependency
 
+from questions_three.constants import TestEvent
 from questions_three.logging import logger_for_module
 from questions_three.module_cfg import config_for_module
-from questions_three.vanilla import format_exception
+from questions_three.module_cfg.environment_index import index_environment
 
+from .async_dispatcher import AsyncDispatcher
+from .call_subscriber import acall_subscriber, call_coroutine_subscriber, call_subscriber
+from .event_context import clear_event_context, close_event_context, current_event_context, open_event_context
+from .subscriber_timings import SubscriberTimings
 
-def call_if_alive(ref, **kwargs):
-    log = logger_for_module(__name__)
-    func = ref()
-    if func:
-        log.debug(f"Executing {func}")
-        try:
-            func(**kwargs)
-            log.debug(f"{func} exited cleanly")
-        except Exception as e:
-            log.error(format_exception(e))
+# Before and after publishing one of these events, wait for every
+#  asynchronous subscriber to catch up
+FLUSH_BARRIER_EVENTS = frozenset((TestEvent.suite_results_compiled, TestEvent.suite_ended))
 
 
 def current_time():
     return dependency(datetime).now()
 
 
+def compile_filter(where):
+    """
+    Turn a dict of event property names and wanted values into a tuple
+      that is quick to check.  A set of values matches any of its members.
+    """
+    if not where:
+        return None
+    return tuple(
+        (name, frozenset(wanted) if isinstance(wanted, (set, frozenset)) else None, wanted)
+        for name, wanted in where.items()
+    )
+
+
+def matches_filter(compiled, properties):
+    for name, choices, wanted in compiled:
+        value = properties.get(name)
+        if choices is None:
+            if value != wanted:
+                return False
+        elif not _is_among(value, choices):
+            return False
+    return True
+
+
+def _is_among(value, choices):
+    try:
+        return value in choices
+    except TypeError:
+        # An unhashable value cannot be looked up in a set
+        return any(value == choice for choice in choices)
+
+
 def is_bound(func):
     return hasattr(func, "__self__") and func.__self__
 
 
 class EventBroker:
+    # Held while changing the subscriber table.
+    # Publishers read it without locking because each event's subscribers
+    #  are an immutable tuple that is replaced rather than changed.
+    _lock = Lock()
+
     @classmethod
     def get_subscribers(cls):
         """
         Return a set containing all subscriber functions
         """
         found = set()
-        for event, refs in cls._subscribers.items():
-            found = found | set([r() for r in refs if r()])
+        for event, subscriptions in cls._subscribers.items():
+            found = found | set([subscription[0]() for subscription in subscriptions if subscription[0]()])
         return found
 
     @classmethod
-    def publish(cls, *, event, event_time=None, **kwargs):
-        conf = config_for_module(__name__)
+    def _refresh_config(cls):
+        # Settings can come from the environment, so look them up again
+        #  only when the environment changes
+        index = index_environment(dependency(os).environ)
+        if index is not cls._config_source:
+            config = config_for_module(__name__)
+            with cls._lock:
+                cls._run_id = config.test_run_id
+                cls._dispatch_async = config.event_dispatch_async
+                cls._dispatch_queue_size = int(config.event_dispatch_queue_size)
+                if not config.event_subscriber_timing:
+                    cls._timings = None
+                elif cls._timings is None:
+                    cls._timings = SubscriberTimings()
+                cls._config_source = index
+
+    @classmethod
+    def _current_dispatcher(cls):
+        if cls._dispatch_async:
+            if cls._dispatcher is None:
+                with cls._lock:
+                    if cls._dispatcher is None:
+                        cls._dispatcher = AsyncDispatcher(max_size=cls._dispatch_queue_size)
+        elif cls._dispatcher is not None:
+            cls._stop_dispatcher()
+        return cls._dispatcher
+
+    @classmethod
+    def _stop_dispatcher(cls):
+        with cls._lock:
+            dispatcher = cls._dispatcher
+            cls._dispatcher = None
+        if dispatcher is not None:
+            dispatcher.stop()
+
+    @classmethod
+    def _prune(cls, event):
+        with cls._lock:
+            living = tuple(s for s in cls._subscribers.get(event, ()) if s[0]() is not None)
+            if living:
+                cls._subscribers[event] = living
+            else:
+                cls._subscribers.pop(event, None)
+
+    @classmethod
+    def flush(cls):
+        """
+        Wait until asynchronous subscribers have handled every event
+          published so far
+        """
+        dispatcher = cls._dispatcher
+        if dispatcher is not None and not dispatcher.is_running_in_this_thread():
+            dispatcher.flush()
+
+    @classmethod
+    def _deliver(cls, *, event, event_time, run_id, properties, coroutines=None):
+        """
+        Call each subscriber interested in the event.
+        If given a list, add coroutine subscribers' calls to it instead of
+          running them here.
+        Return the published properties and, if asynchronous subscribers
+          must be flushed after the event, the dispatcher.
+        """
         log = logger_for_module(__name__)
-        run_id = conf.test_run_id
+        if cls._dispatcher is not None and cls._dispatcher.is_running_in_this_thread():
+            # Already behind everything queued before us, so queueing again
+            #  would gain nothing and could wait forever on a full queue
+            dispatcher = None
+        else:
+            cls._refresh_config()
+            dispatcher = cls._current_dispatcher()
+        barrier = dispatcher is not None and event in FLUSH_BARRIER_EVENTS
         if event_time is None:
             event_time = current_time()
         log.debug(event)
-        if event in cls._subscribers.keys():
-            for subscriber in cls._subscribers[event]:
-                call_if_alive(subscriber, event=event, event_time=event_time, run_id=run_id, **kwargs)
+        open_event_context(event, properties)
+        if barrier:
+            dispatcher.flush()
+        found_dead = False
+        timings = cls._timings
+        if run_id is None:
+            run_id = cls._run_id
+        kwargs = dict(current_event_context(), **properties, event=event, event_time=event_time, run_id=run_id)
+        streamed = TestEvent.artifact_created == event and hasattr(kwargs.get("artifact"), "write_to")
+        text_kwargs = None
+        for ref, critical, where, is_coroutine, streams_artifacts in cls._subscribers.get(event, ()):
+            if where is not None and not matches_filter(where, kwargs):
+                continue
+            func = ref()
+            if func is None:
+                found_dead = True
+                continue
+            call_kwargs = kwargs
+            if streamed and not streams_artifacts:
+                # Subscribers that have not opted in get the artifact as a string
+                if text_kwargs is None:
+                    text_kwargs = dict(kwargs, artifact=str(kwargs["artifact"]))
+                call_kwargs = text_kwargs
+            if not is_coroutine:
+                if critical or dispatcher is None:
+                    call_subscriber(func, log=log, kwargs=call_kwargs, timings=timings)
+                else:
+                    dispatcher.dispatch(func, call_kwargs, timings)
+            elif coroutines is not None:
+                coroutines.append(acall_subscriber(func, log=log, kwargs=call_kwargs, timings=timings))
+            elif critical or dispatcher is None:
+                call_coroutine_subscriber(func, log=log, kwargs=call_kwargs, timings=timings)
+            else:
+                dispatcher.dispatch(func, call_kwargs, timings, caller=call_coroutine_subscriber)
+        if found_dead:
+            cls._prune(event)
+        return kwargs, (dispatcher if barrier else None)
+
+    @classmethod
+    def publish(cls, *, event, event_time=None, run_id=None, **kwargs):
+        """
+        Call each subscriber to the event with the given properties.
+        The run ID defaults to the configured test_run_id.
+        """
+        kwargs, barrier = cls._deliver(event=event, event_time=event_time, run_id=run_id, properties=kwargs)
+        if cls._timings is not None and TestEvent.suite_ended == event:
+            # Before the barrier, so asynchronous subscribers get it before the suite is over
+            cls.publish(**cls._subscriber_timings_artifact(suite_name=kwargs.get("suite_name")))
+        if barrier is not None:
+            barrier.flush()
+        close_event_context(event)
+
+    @classmethod
+    async def apublish(cls, *, event, event_time=None, run_id=None, **kwargs):
+        """
+        Publish an event from a coroutine.
+        Coroutine subscribers are awaited concurrently.  Others are called
+          as publish would call them.
+        """
+        coroutines = []
+        kwargs, barrier = cls._deliver(
+            event=event, event_time=event_time, run_id=run_id, properties=kwargs, coroutines=coroutines
+        )
+        if coroutines:
+            await asyncio.gather(*coroutines)
+        if cls._timings is not None and TestEvent.suite_ended == event:
+            await cls.apublish(**cls._subscriber_timings_artifact(suite_name=kwargs.get("suite_name")))
+        if barrier is not None:
+            barrier.flush()
+        close_event_context(event)
+
+    @classmethod
+    def _subscriber_timings_artifact(cls, *, suite_name):
+        return dict(
+            event=TestEvent.artifact_created,
+            # Each suite's artifact describes only that suite
+            artifact=json.dumps(cls._timings.summary(reset=True), indent=2),
+            artifact_type="subscriber_timings",
+            artifact_mime_type="application/json",
+            suite_name=suite_name,
+        )
+
+    @classmethod
+    def subscriber_timings(cls):
+        """
+        Return a list of dicts describing how long each subscriber has spent
+          handling each event since the last suite ended, with the most
+          time-consuming first.
+        Timings are recorded only when event_subscriber_timing is enabled.
+        """
+        cls._refresh_config()
+        return [] if cls._timings is None else cls._timings.summary()
 
     @classmethod
     def reset(cls):
-        cls._subscribers = {}  # event -> [subscribers]
+        if getattr(cls, "_dispatcher", None) is not None:
+            cls._stop_dispatcher()
+        with cls._lock:
+            # event -> ((weak reference, critical, compiled filter, is coroutine, streams artifacts),)
+            cls._subscribers = {}
+            cls._dispatcher = None
+            cls._run_id = None
+            cls._dispatch_async = False
+            cls._dispatch_queue_size = None
+            cls._timings = None
+            cls._config_source = None
+        clear_event_context()
 
     @classmethod
-    def _subscribe(cls, *, func, event):
-        if event not in cls._subscribers.keys():
-            cls._subscribers[event] = []
+    def _subscribe(cls, *, func, event, critical, where, streams_artifacts):
         if is_bound(func):
             subscriber = weakref.WeakMethod(func)
         else:
             subscriber = weakref.ref(func)
-        cls._subscribers[event].append(subscriber)
+        with cls._lock:
+            # The table is copied anyway, so leave the dead behind
+            living = tuple(s for s in cls._subscribers.get(event, ()) if s[0]() is not None)
+            cls._subscribers[event] = living + (
+                (subscriber, critical, where, iscoroutinefunction(func), streams_artifacts),
+            )
 
     @classmethod
-    def subscribe(cls, *, func, event=None, events=None):
+    def subscribe(cls, *, func, event=None, events=None, critical=True, where=None, streams_artifacts=False):
+        """
+        Arrange for func to be called each time the event is published.
+        A non-critical subscriber may be called from a background thread
+          when asynchronous dispatch is enabled.
+        where is an optional dict of event property names and values.
+          If given, func is called only for events whose properties match
+          (e.g. where={"artifact_type": "screenshot"}).
+          A set of values matches any of its members.
+        An artifact that can write itself to a file (see write_to in
+          TranscriptArtifact) reaches a subscriber as a string unless it
+          sets streams_artifacts to True.
+        """
         if not (bool(event) ^ bool(events)):
             raise TypeError("An event or events must be specified (but not both)")
+        where = compile_filter(where)
         if events:
             for event in events:
-                cls._subscribe(func=func, event=event)
+                cls._subscribe(
+                    func=func, event=event, critical=critical, where=where, streams_artifacts=streams_artifacts
+                )
         else:
-            cls._subscribe(func=func, event=event)
+            cls._subscribe(func=func, event=event, critical=critical, where=where, streams_artifacts=streams_artifacts)
 
 
 EventBroker.reset()
+atexit.register(EventBroker.flush)
@@ -0,0 +1,125 @@
+"""
+Carry events from suites running in child processes to the parent's broker
+"""
+
+import atexit
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+import os
+from threading import Lock, Thread
+
+from twin_sister import dependency
+
+from questions_three.constants import TestEvent
+from questions_three.logging import logger_for_module
+from questions_three.vanilla import path_to_entry_script
+
+from .event_broker import EventBroker
+from .event_serialization import pack_event, unpack_event
+
+EVENT_BUS_ADDRESS_ENV_VAR = "QUESTIONS_THREE_EVENT_BUS_ADDRESS"
+EVENT_BUS_KEY_ENV_VAR = "QUESTIONS_THREE_EVENT_BUS_KEY"
+
+
+class EventForwarder:
+    """
+    Sends every test event published in this process to the event bus
+    """
+
+    def __init__(self, *, address, authkey):
+        self._connection = dependency(Client)(address, authkey=authkey)
+        self._lock = Lock()
+        self._entry_script = dependency(path_to_entry_script)()
+
+    def activate(self):
+        EventBroker.subscribe(events=list(TestEvent), func=self.forward)
+        atexit.register(self.close)
+
+    def forward(self, *, event, event_time=None, **kwargs):
+        if TestEvent.suite_started == event:
+            # Lets the parent's reporters tell where the suite came from
+            kwargs.setdefault("entry_script", self._entry_script)
+        kwargs.pop("run_id", None)  # The parent's broker adds its own
+        message = pack_event(event=event, event_time=event_time, properties=kwargs)
+        with self._lock:
+            self._connection.send_bytes(message)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def forwarder_from_environment():
+    """
+    Return an EventForwarder if the process that launched us is listening
+      for events (or None if it is not)
+    """
+    env = dependency(os).environ
+    address = env.get(EVENT_BUS_ADDRESS_ENV_VAR)
+    if not address:
+        return None
+    return EventForwarder(address=address, authkey=bytes.fromhex(env[EVENT_BUS_KEY_ENV_VAR]))
+
+
+class EventBusServer:
+    """
+    Receives events from child processes and publishes them to our broker,
+      one at a time
+    """
+
+    def __init__(self):
+        self._authkey = dependency(os).urandom(16)
+        self._listener = dependency(Listener)(authkey=self._authkey)
+        self._publish_lock = Lock()
+        self._closing = False
+        self._readers = []
+        self._accepter = Thread(target=self._accept, name="EventBusAccepter", daemon=True)
+        self._accepter.start()
+
+    def environment(self):
+        """
+        Return the environment variables a child needs to find the bus
+        """
+        return {EVENT_BUS_ADDRESS_ENV_VAR: self._listener.address, EVENT_BUS_KEY_ENV_VAR: self._authkey.hex()}
+
+    def _accept(self):
+        while True:
+            try:
+                connection = self._listener.accept()
+            except Exception as e:
+                if self._closing:
+                    return
+                logger_for_module(__name__).warning("Rejected event bus connection: %s", e)
+                continue
+            reader = Thread(target=self._receive, args=(connection,), name="EventBusReader", daemon=True)
+            self._readers.append(reader)
+            reader.start()
+
+    def _receive(self, connection):
+        with connection:
+            while True:
+                try:
+                    message = connection.recv_bytes()
+                except (EOFError, OSError):
+                    return
+                event, event_time, kwargs = unpack_event(message)
+                with self._publish_lock:
+                    EventBroker.publish(event=event, event_time=event_time, **kwargs)
+
+    def close(self):
+        """
+        Stop accepting connections and wait until every child that connected
+          has hung up and all of its events have been published
+        """
+        self._closing = True
+        # Closing the listener would not wake the accepting thread, but a
+        #  connection it refuses will
+        try:
+            dependency(Client)(self._listener.address, authkey=b"closing").close()
+        except AuthenticationError:
+            pass
+        self._accepter.join()
+        self._listener.close()
+        for reader in self._readers:
+            reader.join()
+        EventBroker.flush()
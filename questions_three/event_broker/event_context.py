@@ -0,0 +1,53 @@
+from contextvars import ContextVar, copy_context
+from functools import wraps
+
+from questions_three.constants import TestEvent
+
+# Names of the suite and test in progress.  Each thread (and each copy of a
+#  context handed to a worker thread) sees its own.
+_names = ContextVar("questions_three_event_context", default={})
+
+_OPENING_EVENTS = {TestEvent.suite_started: "suite_name", TestEvent.test_started: "test_name"}
+_CLOSING_EVENTS = {TestEvent.suite_ended: "suite_name", TestEvent.test_ended: "test_name"}
+
+
+def current_event_context():
+    """
+    Return a dict containing the names of the suite and test in progress
+      (whichever are known)
+    """
+    return _names.get()
+
+
+def clear_event_context():
+    _names.set({})
+
+
+def open_event_context(event, properties):
+    key = _OPENING_EVENTS.get(event)
+    if key is not None and properties.get(key) is not None:
+        _names.set(dict(_names.get(), **{key: properties[key]}))
+
+
+def close_event_context(event):
+    key = _CLOSING_EVENTS.get(event)
+    if key is not None and key in _names.get():
+        names = dict(_names.get())
+        del names[key]
+        _names.set(names)
+
+
+def propagate_event_context(func):
+    """
+    Return a function that calls func with the caller's suite and test names,
+      so events it publishes from a worker thread are attributed correctly.
+    Wrap the function before handing it to the thread.
+    """
+    context = copy_context()
+
+    @wraps(func)
+    def run_in_context(*args, **kwargs):
+        # A context can be entered by only one thread at a time
+        return context.copy().run(func, *args, **kwargs)
+
+    return run_in_context
@@ -0,0 +1,141 @@
+"""
+Compact serialization for events that leave this process
+"""
+
+from io import BytesIO
+import pickle
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from questions_three.constants import TestEvent
+from questions_three.logging import logger_for_module
+from questions_three.vanilla import format_exception
+
+PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+# What an event journal may refer to.  A journal can come from somewhere
+#  else, such as another build's artifacts, and unpickling anything else
+#  could run arbitrary code.
+JOURNAL_GLOBALS = frozenset(
+    (
+        ("builtins", "bytearray"),
+        ("builtins", "complex"),
+        ("builtins", "frozenset"),
+        ("builtins", "set"),
+        ("collections", "OrderedDict"),
+        ("datetime", "date"),
+        ("datetime", "datetime"),
+        ("datetime", "time"),
+        ("datetime", "timedelta"),
+        ("datetime", "timezone"),
+        ("http.cookiejar", "Cookie"),
+        ("http.cookiejar", "DefaultCookiePolicy"),
+        (__name__, "_rebuild_exception"),
+        ("requests.cookies", "RequestsCookieJar"),
+        ("requests.models", "PreparedRequest"),
+        ("requests.models", "Response"),
+        ("requests.structures", "CaseInsensitiveDict"),
+        ("uuid", "UUID"),
+    )
+)
+
+
+class ForwardedException(Exception):
+    """
+    Stands in for an exception raised in another process, which may be of
+      a class the receiving process cannot import
+    """
+
+    def __init__(self, message, *, original_type, formatted_exception):
+        super().__init__(message)
+        self.original_type = original_type
+        self.formatted_exception = formatted_exception
+
+    def __reduce__(self):
+        return (_rebuild_exception, (str(self), self.original_type, self.formatted_exception))
+
+    @classmethod
+    def from_exception(cls, e):
+        return cls(
+            str(e),
+            original_type=str(getattr(e, "original_type", type(e))),
+            formatted_exception=format_exception(e),
+        )
+
+
+def _rebuild_exception(message, original_type, formatted_exception):
+    return ForwardedException(message, original_type=original_type, formatted_exception=formatted_exception)
+
+
+class _JournalUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        if (module, name) not in JOURNAL_GLOBALS:
+            raise pickle.UnpicklingError("%s.%s is not allowed in an event journal" % (module, name))
+        return super().find_class(module, name)
+
+
+def _load_restricted(packed):
+    return _JournalUnpickler(BytesIO(packed)).load()
+
+
+def without_unread_body(response):
+    """
+    Return a copy of a streamed response with its status and headers but
+      not its body, which belongs to whoever is reading the stream.
+    (Pickling the response itself would read the whole body into memory.)
+    """
+    copy = requests.Response()
+    copy.status_code = response.status_code
+    copy.reason = response.reason
+    copy.headers = CaseInsensitiveDict(response.headers)
+    copy.url = response.url
+    copy.encoding = response.encoding
+    copy._content = None
+    copy._content_consumed = True
+    return copy
+
+
+def pack_property(value):
+    if isinstance(value, BaseException):
+        value = ForwardedException.from_exception(value)
+    elif isinstance(value, requests.Response) and value._content is False and value.raw is not None:
+        value = without_unread_body(value)
+    try:
+        return pickle.dumps(value, protocol=PROTOCOL)
+    except Exception:
+        return pickle.dumps(repr(value), protocol=PROTOCOL)
+
+
+def unpack_property(name, packed, *, restricted=False):
+    load = _load_restricted if restricted else pickle.loads
+    try:
+        return load(packed)
+    except Exception as e:
+        logger_for_module(__name__).warning("Failed to unpack event property %s: %s", name, e)
+        return None
+
+
+def pack_event(*, event, event_time, properties):
+    """
+    Return bytes representing a TestEvent and its properties.
+    Each property is packed separately, so one that cannot be unpacked
+      does not cost the others.
+    """
+    packed = {name: pack_property(value) for name, value in properties.items()}
+    return pickle.dumps((event.name, event_time, packed), protocol=PROTOCOL)
+
+
+def unpack_event(packed, *, restricted=False):
+    """
+    Return (event, event_time, properties) from bytes made by pack_event.
+    If restricted, refuse to unpickle anything but JOURNAL_GLOBALS and
+      plain data.  A property that refers to anything else is None.
+    """
+    load = _load_restricted if restricted else pickle.loads
+    event_name, event_time, properties = load(packed)
+    return (
+        TestEvent[event_name],
+        event_time,
+        {name: unpack_property(name, value, restricted=restricted) for name, value in properties.items()},
+    )
@@ -1,4 +1,5 @@
 import re
+from weakref import WeakKeyDictionary
 
 from questions_three.constants import TestEvent
 from questions_three.exceptions import UndefinedEvent
@@ -7,14 +8,17 @@ from .event_broker import EventBroker
 
 EVENT_HANDLER_PATTERN = re.compile("^on_(.+)$")
 
+# class -> ((handler name, event),)
+_handler_maps = WeakKeyDictionary()
+
 
 def event_for_handler(handler_name):
     mat = EVENT_HANDLER_PATTERN.search(handler_name)
     if not mat:
         raise RuntimeError("Failed to parse %s" % handler_name)
     event = mat.group(1)
-    if event in [e.name for e in TestEvent]:
-        return TestEvent[mat.group(1)]
+    if event in TestEvent.__members__:
+        return TestEvent[event]
     raise UndefinedEvent('"%s" is not defined as a test event' % event)
 
 
@@ -22,11 +26,44 @@ def event_handler_names(obj):
     return [name for name in dir(obj) if name.startswith("on_")]
 
 
+def handler_map(obj, names):
+    return tuple((name, event_for_handler(name)) for name in names if hasattr(getattr(obj, name, None), "__call__"))
+
+
+def handler_map_for_class(cls):
+    """
+    Return ((handler name, event),) for the event handlers a class defines.
+    The map is worked out (and undefined events rejected) once per class.
+    """
+    try:
+        return _handler_maps[cls]
+    except KeyError:
+        found = handler_map(cls, event_handler_names(cls))
+        _handler_maps[cls] = found
+        return found
+
+
 def subscribe_event_handlers(obj):
     """
     Detect event handlers in an object and subscribe each to its event.
+    An object that sets event_handlers_are_critical to False allows its
+      handlers to be called asynchronously.
+    An object that sets event_handlers_stream_artifacts to True receives
+      artifacts that can write themselves to a file as they are, rather
+      than as strings.
     """
-    for func_name in event_handler_names(obj):
-        attr = getattr(obj, func_name)
-        if hasattr(attr, "__call__"):
-            EventBroker.subscribe(event=event_for_handler(func_name), func=getattr(obj, func_name))
+    critical = getattr(obj, "event_handlers_are_critical", True)
+    streams_artifacts = getattr(obj, "event_handlers_stream_artifacts", False)
+    handlers = handler_map_for_class(type(obj))
+    instance_attributes = getattr(obj, "__dict__", None)
+    if instance_attributes:
+        # Handlers can also be attached to the instance itself
+        extra = [name for name in instance_attributes if name.startswith("on_")]
+        if extra:
+            handlers = dict(handlers)
+            handlers.update(handler_map(obj, extra))
+            handlers = handlers.items()
+    for func_name, event in handlers:
+        EventBroker.subscribe(
+            event=event, func=getattr(obj, func_name), critical=critical, streams_artifacts=streams_artifacts
+        )
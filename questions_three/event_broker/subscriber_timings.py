@@ -0,0 +1,48 @@
+from threading import Lock
+
+
+def subscriber_name(func):
+    return "%s.%s" % (getattr(func, "__module__", None), getattr(func, "__qualname__", repr(func)))
+
+
+class SubscriberTimings:
+    """
+    Call count, total time and longest time for each subscriber and event
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._stats = {}  # (subscriber name, event) -> [calls, total seconds, max seconds]
+
+    def record(self, *, func, event, elapsed):
+        key = (subscriber_name(func), event)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                self._stats[key] = [1, elapsed, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                if elapsed > stats[2]:
+                    stats[2] = elapsed
+
+    def summary(self, *, reset=False):
+        """
+        Return a list of dicts, one per subscriber and event,
+          with the most time-consuming first.
+        If reset is True, start counting afresh.
+        """
+        with self._lock:
+            items = [(key, list(stats)) for key, stats in self._stats.items()]
+            if reset:
+                self._stats = {}
+        return [
+            {
+                "subscriber": name,
+                "event": getattr(event, "name", str(event)),
+                "calls": calls,
+                "total_seconds": total,
+                "max_seconds": longest,
+            }
+            for (name, event), (calls, total, longest) in sorted(items, key=lambda item: -item[1][1])
+        ]
@@ -34,3 +34,9 @@ class UndefinedEvent(Exception):
     """
     Something referenced a test event not defined in TestEvent
     """
+
+
+class UnrecordedRequest(RuntimeError):
+    """
+    HttpClient is replaying a cassette that holds no response to a request
+    """
@@ -1 +1,2 @@
+from .async_http_client import AsyncHttpClient  # noqa: F401
 from .http_client import HttpClient  # noqa: F401
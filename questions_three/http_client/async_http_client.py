@@ -0,0 +1,43 @@
+import asyncio
+
+from twin_sister import dependency
+
+from .http_client import HttpClient
+from .response_stream import DEFAULT_CHUNK_SIZE
+
+
+class AsyncHttpClient(HttpClient):
+    """
+    An HttpClient whose request methods are coroutines.
+
+    Requests are sent from a thread pool, so many can wait on the network
+      at once while the event loop keeps running.  Events are published
+      with EventBroker.apublish.  Exceptional response callbacks may be
+      coroutine functions.
+
+    executor -- (concurrent.futures.Executor) Send requests from here.
+      If None, use the event loop's default executor.
+    """
+
+    def __init__(self, *, executor=None):
+        super().__init__()
+        self._executor = executor
+
+    def _request(self, method, url, **kwargs):
+        return self._request_async(self._executor, method, url, **kwargs)
+
+    async def stream(self, url, *, method="get", chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+        """
+        Like HttpClient.stream.  Read the body with "async for".
+        """
+        resp = await self._request(method.lower(), url, stream=True, **kwargs)
+        return self._open_stream(resp, chunk_size=chunk_size, executor=self._executor)
+
+    async def download(self, url, path, *, method="get", chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+        """
+        Like HttpClient.download
+        """
+        body = await self.stream(url, method=method, chunk_size=chunk_size, **kwargs)
+        with body, dependency(open)(path, "wb") as f:
+            await asyncio.get_running_loop().run_in_executor(self._executor, body.write_to, f)
+        return body.response
@@ -0,0 +1,152 @@
+"""
+HTTP traffic recorded to a file (a "cassette") so that it can be played
+  back later instead of going to the network.
+
+A cassette holds one JSON object per line, each a request (method, URL
+  and a hash of the body) and the response it received.
+"""
+
+import atexit
+from hashlib import sha256
+import json
+from threading import Lock
+from urllib.parse import urlencode
+
+from twin_sister import dependency
+
+from questions_three.exceptions import UnrecordedRequest
+from questions_three.logging import logger_for_module
+
+from .response_record import rebuild_response, record_response
+from .url_with_params import url_with_params
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# path -> recorder or player, so every client in the process shares one
+_recorders = {}
+_players = {}
+_lock = Lock()
+
+
+def body_hash(data):
+    """
+    Return a hash of a request body, or None for a body (such as a file)
+      that cannot be read without consuming it
+    """
+    if data is None:
+        body = b""
+    elif isinstance(data, bytes):
+        body = data
+    elif isinstance(data, str):
+        body = data.encode("utf-8")
+    elif isinstance(data, dict):
+        body = urlencode(sorted(data.items()), doseq=True).encode("utf-8")
+    elif isinstance(data, (list, tuple)):
+        body = urlencode(data, doseq=True).encode("utf-8")
+    else:
+        return None
+    return sha256(body).hexdigest()
+
+
+def request_key(method, url, *, data=None, params=None):
+    return method.upper(), url_with_params(url, params), body_hash(data)
+
+
+class CassetteRecorder:
+    """
+    Adds each request and its response to the end of a cassette file.
+    Several processes (such as suites run by run_all) can record to the
+      same file at once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = Lock()
+        self._file = dependency(open)(path, "a", encoding="utf-8")
+        atexit.register(self.close)
+
+    def send_and_record(self, send, method, url, *, data=None, params=None, **kwargs):
+        if kwargs.get("stream"):
+            # Recording the body would read it all into memory
+            logger_for_module(__name__).warning(
+                "Not recording streamed %s %s to %s", method.upper(), url_with_params(url, params), self.path
+            )
+            return send()
+        resp = send()
+        self.record(method, url, data=data, params=params, response=resp)
+        return resp
+
+    def record(self, method, url, *, data=None, params=None, response):
+        method, url, hashed = request_key(method, url, data=data, params=params)
+        line = json.dumps(dict(method=method, url=url, body_hash=hashed, **record_response(response)))
+        with self._lock:
+            # Keeps lines from other processes from running into this one
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            try:
+                self._file.write(line + "\n")
+                self._file.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class CassettePlayer:
+    """
+    Answers requests with the responses recorded in a cassette file.
+    If the same request was recorded more than once, the responses are
+      played in the order they were recorded, and the last is repeated.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = Lock()
+        self._recorded = {}  # request key -> records
+        self._played = {}  # request key -> number played
+        with dependency(open)(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    key = (record["method"], record["url"], record["body_hash"])
+                    self._recorded.setdefault(key, []).append(record)
+
+    def response_for(self, method, url, *, data=None, params=None, **kwargs):
+        key = request_key(method, url, data=data, params=params)
+        if key not in self._recorded:
+            # A body that could not be hashed matches any body
+            key = key[:2] + (None,)
+        if key not in self._recorded:
+            raise UnrecordedRequest(f"{self.path} holds no response to {key[0]} {key[1]} with this body")
+        with self._lock:
+            played = self._played.get(key, 0)
+            self._played[key] = played + 1
+        records = self._recorded[key]
+        record = records[min(played, len(records) - 1)]
+        return rebuild_response(record, url=record["url"])
+
+
+def cassette_recorder(path):
+    """
+    Return the CassetteRecorder for path, creating it if necessary
+    """
+    with _lock:
+        if path not in _recorders:
+            _recorders[path] = CassetteRecorder(path)
+        return _recorders[path]
+
+
+def cassette_player(path):
+    """
+    Return the CassettePlayer for path, loading the cassette if necessary
+    """
+    with _lock:
+        if path not in _players:
+            _players[path] = CassettePlayer(path)
+        return _players[path]
@@ -0,0 +1,45 @@
+"""
+Keep-alive connections for HttpClients that do not keep cookies
+"""
+
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock
+
+import requests
+from twin_sister import dependency
+
+from .request_timings import TimedHTTPAdapter
+
+# (hosts, connections per host) -> Session
+_sessions = {}
+_lock = Lock()
+
+
+def pooled_session(*, hosts, connections_per_host):
+    """
+    Return a Session that keeps up to connections_per_host idle connections
+      to each of the hosts most recently contacted and never stores cookies.
+    The same Session is returned to every caller that asks for the same
+      pool sizes, so clients share their connections.
+    If something stands in for the requests module (a fake in a test,
+      say), return the stand-in, so requests go to it as they would
+      without a pool.
+    """
+    transport = dependency(requests)
+    if transport is not requests:
+        return transport
+    key = (hosts, connections_per_host)
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = transport.Session()
+                # Without cookies, a shared session carries no state from
+                #  one request to the next
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = TimedHTTPAdapter(pool_connections=hosts, pool_maxsize=connections_per_host)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _sessions[key] = session
+    return session
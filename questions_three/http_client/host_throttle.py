@@ -0,0 +1,85 @@
+"""
+Client-side limits on how hard HTTP clients in this process press each host
+"""
+
+from threading import BoundedSemaphore, Lock
+import time
+from urllib.parse import urlsplit
+
+from twin_sister import dependency
+
+# (host, requests per second, burst, max concurrent) -> HostThrottle
+_throttles = {}
+_lock = Lock()
+
+
+class TokenBucket:
+    """
+    Hands out up to rate tokens per second, allowing up to burst at once
+      after a quiet spell.
+    When the bucket is empty, each caller reserves the next token to come,
+      so callers are spaced evenly instead of arriving all at once.
+    """
+
+    def __init__(self, *, rate, burst=1):
+        self._rate = rate
+        self._capacity = burst
+        self._tokens = burst
+        self._updated = time.perf_counter()
+        self._lock = Lock()
+
+    def reserve(self):
+        """
+        Take a token and return the number of seconds to wait before using it
+        """
+        with self._lock:
+            now = time.perf_counter()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+
+class HostThrottle:
+    """
+    Limits the requests to one host to a steady rate and the number in
+      flight at once.  Either limit may be None for no limit.
+    """
+
+    def __init__(self, *, requests_per_second=None, burst=1, max_concurrent=None):
+        self._bucket = None if requests_per_second is None else TokenBucket(rate=requests_per_second, burst=burst)
+        self._slots = None if max_concurrent is None else BoundedSemaphore(max_concurrent)
+
+    def acquire(self):
+        """
+        Wait until a request may be sent.
+        The caller must call release when the response arrives.
+        """
+        if self._slots is not None:
+            self._slots.acquire()
+        if self._bucket is not None:
+            delay = self._bucket.reserve()
+            if delay > 0:
+                dependency(time.sleep)(delay)
+
+    def release(self):
+        if self._slots is not None:
+            self._slots.release()
+
+
+def host_throttle(url, *, requests_per_second=None, burst=1, max_concurrent=None):
+    """
+    Return the HostThrottle for the host in url, or None if there are no
+      limits.
+    Every caller that asks for the same host and limits gets the same
+      HostThrottle, so clients share it.
+    """
+    if requests_per_second is None and max_concurrent is None:
+        return None
+    key = (urlsplit(url).netloc.lower(), requests_per_second, burst, max_concurrent)
+    with _lock:
+        if key not in _throttles:
+            _throttles[key] = HostThrottle(
+                requests_per_second=requests_per_second, burst=burst, max_concurrent=max_concurrent
+            )
+        return _throttles[key]
@@ -1,18 +1,30 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from inspect import isawaitable
+from logging import DEBUG
 import requests
+from time import perf_counter
 from uuid import uuid4
 
 from twin_sister import dependency
 
 from questions_three.constants import TestEvent
 from questions_three.event_broker import EventBroker, subscribe_event_handlers
-from questions_three.exceptions import TooManyRedirects
+from questions_three.exceptions import InvalidConfiguration, TooManyRedirects
 from questions_three.logging import logger_for_module
 from questions_three.module_cfg import config_for_module
 
+from .cassette import cassette_player, cassette_recorder
+from .connection_pool import pooled_session
 from .construct_redirect_url import construct_redirect_url
 from .extract_location_header import extract_location_header
+from .host_throttle import host_throttle
 from .inspect_response import inspect_response
-from .transcript import Transcript
+from .request_timings import TimedHTTPAdapter, send_timed
+from .response_cache import ResponseCache
+from .response_stream import DEFAULT_CHUNK_SIZE, ResponseStream
+from .transcript import Transcript, body_is_unread
 
 # See https://tools.ietf.org/html/rfc7231#section-6.4.4
 # and https://tools.ietf.org/html/rfc7238 for 308
@@ -20,6 +32,9 @@ HANDLE_THESE_REDIRECT_STATUS_CODES = (301, 302, 303, 307, 308)
 
 STOP_FOLLOWING_REDIRECTS_AFTER_THIS_MANY = 5
 
+# How the transcript marks responses that came from the cache
+CACHE_STATUS_NOTES = {"hit": "from cache", "revalidated": "revalidated"}
+
 
 class HttpClient:
     def __init__(self):
@@ -30,21 +45,70 @@ class HttpClient:
         if config.http_proxy:
             proxy = config.http_proxy
             self._proxies["http"] = proxy
-            log.debug(f"Using HTTP proxy {proxy}")
+            log.debug("Using HTTP proxy %s", proxy)
         if config.https_proxy:
             proxy = config.https_proxy
             self._proxies["https"] = proxy
-            log.debug(f"(Using HTTPS proxy {proxy}")
+            log.debug("Using HTTPS proxy %s", proxy)
         self._exception_callbacks = {}
         self._logger = logger_for_module(__name__)
         self._session = None
+        self._cache = None
+        self._recorder = None
+        self._player = None
         self._persistent_headers = {}
         self._transcript = Transcript()
+        self._max_body_size = int(config.http_transcript_max_body_size)
         self._verify_certs = config.https_verify_certs
-        log.debug(f"Socket timeout: {self._socket_timeout()}")
+        self._keep_alive = config.http_client_keep_alive
+        self._pool_hosts = int(config.http_client_pool_hosts)
+        self._pool_connections_per_host = int(config.http_client_pool_connections_per_host)
+        self._requests_per_second_per_host = self._optional_number(
+            config.http_client_requests_per_second_per_host, float
+        )
+        self._burst_per_host = int(config.http_client_burst_per_host)
+        self._max_concurrent_requests_per_host = self._optional_number(
+            config.http_client_max_concurrent_requests_per_host, int
+        )
+        log.debug("Socket timeout: %s", self._socket_timeout())
+        if config.http_record_cassette and config.http_replay_cassette:
+            raise InvalidConfiguration("Cannot both record and replay HTTP traffic")
+        if config.http_record_cassette:
+            self.record_to(config.http_record_cassette)
+        if config.http_replay_cassette:
+            self.replay_from(config.http_replay_cassette)
 
     def enable_cookies(self):
         self._session = dependency(requests).Session()
+        adapter = TimedHTTPAdapter()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def enable_cache(self):
+        """
+        Keep cacheable GET responses and reuse them while they are fresh.
+        Once stale, revalidate them with If-None-Match or If-Modified-Since.
+        """
+        config = config_for_module(__name__)
+        self._cache = dependency(ResponseCache)(
+            max_bytes=int(config.http_cache_max_bytes), directory=config.http_cache_directory or None
+        )
+
+    def record_to(self, path):
+        """
+        Add each request and its response to a cassette file, which
+          replay_from can play back later.
+        Streamed requests are sent but not recorded.
+        """
+        self._recorder = dependency(cassette_recorder)(path)
+
+    def replay_from(self, path):
+        """
+        Instead of sending requests, answer them with the responses
+          recorded in a cassette file.
+        Raise UnrecordedRequest for a request the cassette does not hold.
+        """
+        self._player = dependency(cassette_player)(path)
 
     def set_exceptional_response_callback(self, *, exception_class, callback):
         """
@@ -96,10 +160,65 @@ class HttpClient:
     def put(self, *args, **kwargs):
         return self._request("put", *args, **kwargs)
 
+    def stream(self, url, *, method="get", chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+        """
+        Send a request and return a ResponseStream that reads the response
+          body chunk_size bytes at a time instead of all at once.
+        Only the first HTTP_TRANSCRIPT_MAX_BODY_SIZE bytes of the body go
+          to the transcript.  Error responses raise exceptions as usual.
+        """
+        resp = self._request(method.lower(), url, stream=True, **kwargs)
+        return self._open_stream(resp, chunk_size=chunk_size)
+
+    def download(self, url, path, *, method="get", chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+        """
+        Send a request, write the response body to the file at path
+          as it arrives, and return the response
+        """
+        with self.stream(url, method=method, chunk_size=chunk_size, **kwargs) as body:
+            with dependency(open)(path, "wb") as f:
+                body.write_to(f)
+        return body.response
+
+    def _open_stream(self, resp, *, chunk_size, executor=None):
+        return ResponseStream(
+            resp, chunk_size=chunk_size, on_chunk=self._transcript.streaming(resp), executor=executor
+        )
+
+    def map(self, specs, *, max_workers=None, return_exceptions=False):
+        """
+        Send many requests at once and return their responses in the
+          same order.  Each request is handled exactly as a single one is.
+        Cannot be called from a coroutine (use AsyncHttpClient instead).
+
+        specs -- (iterable) Each a URL to GET or a dict of keyword
+          arguments for one request, including "url" and optionally
+          "method" (default "get", in either case)
+        max_workers -- (int) Wait for up to this number of responses at
+          once.  Default is HTTP_CLIENT_POOL_CONNECTIONS_PER_HOST.
+        return_exceptions -- (bool) If True, put the exception a request
+          raises in place of its response.  Otherwise, wait for every
+          request to finish and then raise the first exception in order.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers or self._pool_connections_per_host) as executor:
+            results = asyncio.run(self._map_async(executor, specs))
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    async def _map_async(self, executor, specs):
+        pending = []
+        for spec in specs:
+            kwargs = {"url": spec} if isinstance(spec, str) else dict(spec)
+            pending.append(self._request_async(executor, kwargs.pop("method", "get").lower(), **kwargs))
+        return await asyncio.gather(*pending, return_exceptions=True)
+
     def on_suite_erred(self, suite_name=None, test_name=None, **kwargs):
         EventBroker.publish(
             event=TestEvent.artifact_created,
-            artifact=str(self._transcript),
+            artifact=self._transcript.artifact(),
             artifact_mime_type="text/plain",
             artifact_type="http_transcript",
             suite_name=suite_name,
@@ -109,17 +228,24 @@ class HttpClient:
     on_test_erred = on_suite_erred
     on_test_failed = on_suite_erred
 
-    def _send_plain_request(self, method, *args, **kwargs):
+    def _plain_request_sender(self, method, *args, **kwargs):
         kwargs["allow_redirects"] = False
         if self._proxies and "proxies" not in kwargs.keys():
             kwargs["proxies"] = self._proxies
-        func = getattr(dependency(requests), method)
-        return func(*args, timeout=self._socket_timeout(), **kwargs)
+        if self._keep_alive:
+            transport = dependency(pooled_session)(
+                hosts=self._pool_hosts, connections_per_host=self._pool_connections_per_host
+            )
+        else:
+            transport = dependency(requests)
+        func = getattr(transport, method.lower())
+        return partial(func, *args, timeout=self._socket_timeout(), **kwargs)
 
-    def _send_session_request(self, method, url, *, verify, proxies=None, **kwargs):
+    def _session_request_sender(self, method, url, *, verify, proxies=None, **kwargs):
         request = requests.Request(method.upper(), url, **kwargs)
         prepped = self._session.prepare_request(request)
-        return self._session.send(
+        return partial(
+            self._session.send,
             prepped,
             allow_redirects=False,
             verify=verify,
@@ -127,6 +253,41 @@ class HttpClient:
             timeout=self._socket_timeout(),
         )
 
+    def _request_sender(self, method, url, **kwargs):
+        """
+        Return a function that sends the request and returns the response.
+        Dependencies are resolved here, so the function can run in any thread.
+        """
+        if self._player is not None:
+            return partial(self._player.response_for, method, url, **kwargs)
+        if self._session is None:
+            send = self._plain_request_sender(method, url, **kwargs)
+        else:
+            send = self._session_request_sender(method, url, **kwargs)
+        if self._recorder is not None:
+            return partial(self._recorder.send_and_record, send, method, url, **kwargs)
+        return send
+
+    def _throttle_for(self, url):
+        """
+        Return the HostThrottle that limits requests to the host in url,
+          or None if there are no limits
+        """
+        if self._player is not None:
+            return None
+        return dependency(host_throttle)(
+            url,
+            requests_per_second=self._requests_per_second_per_host,
+            burst=self._burst_per_host,
+            max_concurrent=self._max_concurrent_requests_per_host,
+        )
+
+    @staticmethod
+    def _optional_number(value, convert):
+        if value is None or value == "":
+            return None
+        return convert(value)
+
     @staticmethod
     def _check_request_kwargs(kwargs):
         if "json" in kwargs.keys():
@@ -147,49 +308,199 @@ class HttpClient:
                 raise TypeError("expected $CLIENT_SOCKET_TIMEOUT " f'("{timeout}") to be a number') from e
         return timeout
 
-    def _request(self, method, url, headers={}, data=None, redirect_depth=0, **kwargs):
+    def _start_request(self, method, url, *, headers, data, kwargs):
+        """
+        Check and record a request.
+        Return the headers to send and the properties of the request event.
+        """
         self._check_request_kwargs(kwargs)
         headers = dict(self._persistent_headers, **headers)
         self._transcript.add_request(method, url, data=data, headers=headers, **kwargs)
-        self._logger.debug("%s %s" % (method.upper(), url))
-        self._logger.debug(f"Request headers: {headers}")
-        if self._session is None:
-            func = self._send_plain_request
-        else:
-            func = self._send_session_request
-        request_uuid = uuid4()
-        EventBroker.publish(
-            event=TestEvent.http_request_sent,
+        if self._logger.isEnabledFor(DEBUG):
+            self._logger.debug("%s %s", method.upper(), url)
+            self._logger.debug("Request headers: %s", headers)
+        return headers, dict(
             http_method=method.upper(),
             request_headers=headers,
             request_url=url,
             request_data=data,
-            request_uuid=request_uuid,
+            request_uuid=uuid4(),
+        )
+
+    def _consult_cache(self, method, url, *, headers, data, kwargs):
+        """
+        Look for a cached response to a request.
+        Return the cache key (None if the response cannot be cached),
+          the cache entry (None if there is none), the cached response
+          (None unless it is fresh) and the headers to send.
+        """
+        # A session's cookies could make the response one user's alone
+        if self._cache is None or self._session is not None or method != "get" or data is not None:
+            return None, None, None, headers
+        headers = dict(self._persistent_headers, **headers)
+        # A caller who sends its own conditions wants to see the answer
+        if any(name.lower().startswith("if-") for name in headers):
+            return None, None, None, headers
+        key = self._cache.key_for(url, kwargs, headers)
+        if key is None:
+            return None, None, None, headers
+        entry = self._cache.lookup(key, headers)
+        if entry is None:
+            return key, None, None, headers
+        if entry.is_fresh():
+            return key, entry, entry.stored_response(), headers
+        return key, entry, None, dict(headers, **entry.validators())
+
+    def _update_cache(self, key, entry, resp, headers):
+        """
+        Store a response or, if it confirms that a cached one is still good,
+          substitute the cached one.
+        Return the response and its cache status (None if not cacheable).
+        """
+        if key is None:
+            return resp, None
+        if resp.status_code == 304 and entry is not None:
+            return self._cache.refresh(key, entry, resp).stored_response(), "revalidated"
+        self._cache.store(key, resp, headers)
+        return resp, "miss"
+
+    @staticmethod
+    def _response_properties(request_properties, resp, cache_status, timings):
+        properties = dict(
+            request_uuid=request_properties["request_uuid"],
+            http_method=request_properties["http_method"],
+            request_url=request_properties["request_url"],
+            response=resp,
+        )
+        if cache_status is not None:
+            properties["cache_status"] = cache_status
+        if timings is not None:
+            properties["request_timings"] = timings
+        return properties
+
+    def _finish_response(self, resp, *, method, url, redirect_depth, cache_status=None, timings=None):
+        """
+        Record a response.
+        Return the URL to follow if it redirects us or None if it does not.
+        """
+        if body_is_unread(resp) and resp.status_code >= 400:
+            self._read_error_body(resp)
+        if self._logger.isEnabledFor(DEBUG):
+            if body_is_unread(resp):
+                self._logger.debug("HTTP %d (body streamed)", resp.status_code)
+            else:
+                # Decoding the body can be expensive, so do it only if it will be logged
+                self._logger.debug("HTTP %d\n%s", resp.status_code, resp.text)
+            self._logger.debug("Response headers: %s", resp.headers)
+        self._transcript.add_response(
+            resp, method=method, url=url, note=CACHE_STATUS_NOTES.get(cache_status), timings=timings
         )
-        resp = func(method, url, headers=headers, data=data, verify=self._verify_certs, **kwargs)
-        EventBroker.publish(event=TestEvent.http_response_received, request_uuid=request_uuid, response=resp)
-        self._logger.debug("HTTP %d\n%s" % (resp.status_code, resp.text))
-        self._logger.debug(f"Response headers: {resp.headers}")
-        self._transcript.add_response(resp)
         if resp.status_code in HANDLE_THESE_REDIRECT_STATUS_CODES:
             if redirect_depth >= STOP_FOLLOWING_REDIRECTS_AFTER_THIS_MANY - 1:
                 raise TooManyRedirects("Detected likely infinite HTTP redirection")
+            if body_is_unread(resp):
+                # Nobody will read it, so free the connection
+                resp.close()
+            return construct_redirect_url(request_url=url, response_location_header=extract_location_header(resp))
+        return None
+
+    def _read_error_body(self, resp):
+        """
+        Read enough of a streamed error response to explain the error,
+          but no more than HTTP_TRANSCRIPT_MAX_BODY_SIZE bytes
+        """
+        chunks = []
+        size = 0
+        for chunk in resp.iter_content(chunk_size=DEFAULT_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self._max_body_size:
+                break
+        resp._content = b"".join(chunks)[: self._max_body_size]
+        resp.close()
+
+    def _callbacks_for(self, exception):
+        return [
+            callback
+            for exception_class, callback in self._exception_callbacks.items()
+            if isinstance(exception, exception_class)
+        ]
+
+    def _request(self, method, url, headers={}, data=None, redirect_depth=0, **kwargs):
+        cache_key, cache_entry, resp, headers = self._consult_cache(
+            method, url, headers=headers, data=data, kwargs=kwargs
+        )
+        headers, request_properties = self._start_request(method, url, headers=headers, data=data, kwargs=kwargs)
+        EventBroker.publish(event=TestEvent.http_request_sent, **request_properties)
+        timings = None
+        if resp is None:
+            send = self._request_sender(method, url, headers=headers, data=data, verify=self._verify_certs, **kwargs)
+            resp, timings = send_timed(send, queued_at=perf_counter(), throttle=self._throttle_for(url))
+            resp, cache_status = self._update_cache(cache_key, cache_entry, resp, headers)
+        else:
+            cache_status = "hit"
+        EventBroker.publish(
+            event=TestEvent.http_response_received,
+            **self._response_properties(request_properties, resp, cache_status, timings),
+        )
+        redirect_url = self._finish_response(
+            resp, method=method, url=url, redirect_depth=redirect_depth, cache_status=cache_status, timings=timings
+        )
+        if redirect_url is not None:
             return self._request(
-                method,
-                construct_redirect_url(request_url=url, response_location_header=extract_location_header(resp)),
-                data=data,
-                headers=headers,
-                redirect_depth=redirect_depth + 1,
-                **kwargs,
+                method, redirect_url, data=data, headers=headers, redirect_depth=redirect_depth + 1, **kwargs
+            )
+        try:
+            dependency(inspect_response)(resp)
+        except Exception as e:
+            for callback in self._callbacks_for(e):
+                response = callback(exception=e)
+                if response is not None:
+                    return response
+            raise
+
+        return resp
+
+    async def _request_async(self, executor, method, url, headers={}, data=None, redirect_depth=0, **kwargs):
+        """
+        Like _request, but send from the executor and publish events with
+          EventBroker.apublish.  Exceptional response callbacks may be
+          coroutine functions.
+        """
+        cache_key, cache_entry, resp, headers = self._consult_cache(
+            method, url, headers=headers, data=data, kwargs=kwargs
+        )
+        headers, request_properties = self._start_request(method, url, headers=headers, data=data, kwargs=kwargs)
+        await EventBroker.apublish(event=TestEvent.http_request_sent, **request_properties)
+        timings = None
+        if resp is None:
+            send = self._request_sender(method, url, headers=headers, data=data, verify=self._verify_certs, **kwargs)
+            resp, timings = await asyncio.get_running_loop().run_in_executor(
+                executor, partial(send_timed, send, queued_at=perf_counter(), throttle=self._throttle_for(url))
+            )
+            resp, cache_status = self._update_cache(cache_key, cache_entry, resp, headers)
+        else:
+            cache_status = "hit"
+        await EventBroker.apublish(
+            event=TestEvent.http_response_received,
+            **self._response_properties(request_properties, resp, cache_status, timings),
+        )
+        redirect_url = self._finish_response(
+            resp, method=method, url=url, redirect_depth=redirect_depth, cache_status=cache_status, timings=timings
+        )
+        if redirect_url is not None:
+            return await self._request_async(
+                executor, method, redirect_url, data=data, headers=headers, redirect_depth=redirect_depth + 1, **kwargs
             )
         try:
             dependency(inspect_response)(resp)
         except Exception as e:
-            for exception_class, callback in self._exception_callbacks.items():
-                if isinstance(e, exception_class):
-                    response = callback(exception=e)
-                    if response is not None:
-                        return response
+            for callback in self._callbacks_for(e):
+                response = callback(exception=e)
+                if isawaitable(response):
+                    response = await response
+                if response is not None:
+                    return response
             raise
 
         return resp
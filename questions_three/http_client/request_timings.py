@@ -0,0 +1,127 @@
+"""
+Where the time goes in each HTTP request
+"""
+
+from datetime import timedelta
+from threading import local
+from time import perf_counter
+
+from requests.adapters import HTTPAdapter
+from urllib3 import poolmanager
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# What TimedHTTPAdapter saw while sending the current request in this thread
+_sending = local()
+
+
+class ConnectTimer:
+    """
+    Adds the time a connection takes to open (including any TLS handshake)
+      to the request this thread is sending
+    """
+
+    def connect(self):
+        started = perf_counter()
+        try:
+            super().connect()
+        finally:
+            _sending.connect_seconds = getattr(_sending, "connect_seconds", 0.0) + perf_counter() - started
+
+
+class TimedHTTPConnection(ConnectTimer, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(ConnectTimer, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+TIMED_POOL_CLASSES = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter whose connections report how long they take to open
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+
+    def proxy_manager_for(self, *args, **kwargs):
+        manager = super().proxy_manager_for(*args, **kwargs)
+        # Leave alone managers with pools of their own, such as SOCKS
+        if manager.pool_classes_by_scheme is poolmanager.pool_classes_by_scheme:
+            manager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+        return manager
+
+    def send(self, *args, **kwargs):
+        _sending.measured = True
+        return super().send(*args, **kwargs)
+
+
+def send_timed(send, *, queued_at, throttle=None):
+    """
+    Call send and return the response it returns and a dict of timings
+      in seconds, measured with a monotonic clock.
+    If a HostThrottle is given, hold it from before sending until the
+      response arrives.
+
+    queue -- From queued_at until this thread took up the request (as when
+      waiting for a thread in a busy pool)
+    throttle -- Waiting for the throttle to allow the request.  None if
+      there is no throttle.
+    connect -- Opening new connections, including any TLS handshake.
+      0 if a kept-alive connection was reused.  None if unknown because
+      the request did not go through a TimedHTTPAdapter.
+    first_byte -- From sending the request until the response headers arrived
+    total -- From sending the request until the response was returned,
+      which includes reading the body unless it was streamed
+    """
+    _sending.measured = False
+    _sending.connect_seconds = 0.0
+    taken_up = perf_counter()
+    if throttle is not None:
+        throttle.acquire()
+    started = perf_counter()
+    try:
+        resp = send()
+    finally:
+        if throttle is not None:
+            throttle.release()
+    total = perf_counter() - started
+    # requests measures this with a monotonic clock too
+    elapsed = getattr(resp, "elapsed", None)
+    return resp, {
+        "queue": max(0.0, taken_up - queued_at),
+        "throttle": None if throttle is None else started - taken_up,
+        "connect": _sending.connect_seconds if _sending.measured else None,
+        "first_byte": elapsed.total_seconds() if isinstance(elapsed, timedelta) else None,
+        "total": total,
+    }
+
+
+def describe_timings(timings):
+    """
+    Return a summary like "in 31.2 ms (queue 0.1 ms, connect 5.0 ms, first byte 30.0 ms)"
+    """
+    parts = [
+        "%s %.1f ms" % (name, timings[key] * 1000)
+        for key, name in (
+            ("queue", "queue"),
+            ("throttle", "throttle"),
+            ("connect", "connect"),
+            ("first_byte", "first byte"),
+        )
+        if timings.get(key) is not None
+    ]
+    return "in %.1f ms (%s)" % (timings["total"] * 1000, ", ".join(parts))
@@ -0,0 +1,259 @@
+"""
+A private cache for GET responses, following the parts of RFC 7234 that
+  matter to a single client: freshness from Cache-Control max-age or
+  Expires, revalidation with ETag and Last-Modified, and Vary
+"""
+
+from collections import OrderedDict
+from copy import copy
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from hashlib import sha256
+import json
+import os
+from threading import Lock
+
+from requests.structures import CaseInsensitiveDict
+from twin_sister import dependency
+
+from questions_three.logging import logger_for_module
+
+from .response_record import rebuild_response, record_response
+from .url_with_params import url_with_params
+
+# Headers in a 304 response that replace those of the stored response
+UPDATED_BY_NOT_MODIFIED = ("Cache-Control", "Date", "ETag", "Expires", "Last-Modified")
+
+# A request with any of these keyword arguments is not looked up or stored
+UNCACHEABLE_REQUEST_ARGUMENTS = ("auth", "cert", "cookies", "data", "files", "stream")
+
+# A request with any of these headers is not looked up or stored
+UNCACHEABLE_REQUEST_HEADERS = ("authorization", "cookie")
+
+
+def now():
+    return dependency(datetime).now()
+
+
+def parse_cache_control(value):
+    """
+    Return a dict of Cache-Control directives (lowercase) and their values
+      (or None for directives without one)
+    """
+    directives = {}
+    for item in (value or "").split(","):
+        name, _, argument = item.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def parse_http_date(value):
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers):
+    """
+    Return the number of seconds a response may be used without revalidation
+    """
+    directives = parse_cache_control(headers.get("Cache-Control"))
+    if "no-cache" in directives:
+        return 0
+    if "max-age" in directives:
+        try:
+            return max(0, int(directives["max-age"]))
+        except (TypeError, ValueError):
+            return 0
+    expires = parse_http_date(headers.get("Expires"))
+    date = parse_http_date(headers.get("Date"))
+    if expires is None or date is None:
+        return 0
+    try:
+        return max(0, (expires - date).total_seconds())
+    except TypeError:
+        # One has a time zone and the other does not
+        return 0
+
+
+class CacheEntry:
+    def __init__(self, *, response, stored_at, vary):
+        self.response = response
+        self.stored_at = stored_at
+        self.vary = vary  # request header name -> value when stored
+        self.size = len(response.content or b"")
+
+    def is_fresh(self):
+        age = (now() - self.stored_at).total_seconds()
+        return age < freshness_lifetime(self.response.headers)
+
+    def matches(self, request_headers):
+        return all(request_headers.get(name) == value for name, value in self.vary.items())
+
+    def validators(self):
+        """
+        Return headers that ask the server to answer 304 if the stored
+          response is still good
+        """
+        found = {}
+        if "ETag" in self.response.headers:
+            found["If-None-Match"] = self.response.headers["ETag"]
+        if "Last-Modified" in self.response.headers:
+            found["If-Modified-Since"] = self.response.headers["Last-Modified"]
+        return found
+
+    def stored_response(self):
+        # The caller gets its own copy to do with as it pleases
+        response = copy(self.response)
+        response.headers = CaseInsensitiveDict(self.response.headers)
+        return response
+
+
+class ResponseCache:
+    """
+    Keeps GET responses in memory, discarding the least recently used
+      when they hold more than max_bytes of content.
+    If given a directory, also writes each response there, where other
+      processes (and later runs) can find it.
+    """
+
+    def __init__(self, *, max_bytes, directory=None):
+        self._max_bytes = max_bytes
+        self._directory = directory
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        if directory:
+            dependency(os).makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key_for(url, request_kwargs, request_headers={}):
+        """
+        Return the key for a GET request or None if it should not be cached.
+        Responses to requests with credentials or cookies are not cached
+          because the key does not tell one user from another.
+        """
+        if any(request_kwargs.get(name) for name in UNCACHEABLE_REQUEST_ARGUMENTS):
+            return None
+        if any(name.lower() in UNCACHEABLE_REQUEST_HEADERS for name in request_headers):
+            return None
+        return url_with_params(url, request_kwargs.get("params"))
+
+    def lookup(self, key, request_headers):
+        """
+        Return the CacheEntry for the key if there is one that suits
+          the request headers
+        """
+        request_headers = CaseInsensitiveDict(request_headers)
+        if "no-store" in parse_cache_control(request_headers.get("Cache-Control")):
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self._directory:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None or not entry.matches(request_headers):
+            return None
+        return entry
+
+    def store(self, key, response, request_headers):
+        """
+        Store the response if it can be reused.  Return True if it was stored.
+        """
+        request_headers = CaseInsensitiveDict(request_headers)
+        if response.status_code != 200:
+            return False
+        for directives in (
+            parse_cache_control(request_headers.get("Cache-Control")),
+            parse_cache_control(response.headers.get("Cache-Control")),
+        ):
+            if "no-store" in directives:
+                return False
+        vary_names = [name.strip() for name in response.headers.get("Vary", "").split(",") if name.strip()]
+        if "*" in vary_names:
+            return False
+        entry = CacheEntry(
+            response=response,
+            stored_at=now(),
+            vary={name: request_headers.get(name) for name in vary_names},
+        )
+        if entry.size > self._max_bytes:
+            return False
+        if not (entry.validators() or freshness_lifetime(response.headers)):
+            return False
+        self._remember(key, entry)
+        self._share(key, entry)
+        return True
+
+    def refresh(self, key, entry, not_modified):
+        """
+        Update a stored response from a 304 response and return the entry
+        """
+        response = entry.stored_response()
+        for name in UPDATED_BY_NOT_MODIFIED:
+            if name in not_modified.headers:
+                response.headers[name] = not_modified.headers[name]
+        refreshed = CacheEntry(response=response, stored_at=now(), vary=entry.vary)
+        self._remember(key, refreshed)
+        self._share(key, refreshed)
+        return refreshed
+
+    def _remember(self, key, entry):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self._max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def _filename(self, key):
+        return os.path.join(self._directory, sha256(key.encode("utf-8")).hexdigest() + ".response")
+
+    def _share(self, key, entry):
+        """
+        Write the entry to the directory unless the response is meant
+          for this client alone
+        """
+        if self._directory and "private" not in parse_cache_control(entry.response.headers.get("Cache-Control")):
+            self._save(key, entry)
+
+    def _save(self, key, entry):
+        filename = self._filename(key)
+        temporary = "%s.%d" % (filename, os.getpid())
+        stored = {
+            "key": key,
+            "stored_at": entry.stored_at.isoformat(),
+            "vary": entry.vary,
+            "response": record_response(entry.response),
+        }
+        try:
+            with dependency(open)(temporary, "w", encoding="utf-8") as f:
+                json.dump(stored, f)
+            dependency(os).replace(temporary, filename)
+        except OSError as e:
+            logger_for_module(__name__).warning("Failed to write %s to the response cache: %s", key, e)
+
+    def _load(self, key):
+        try:
+            with dependency(open)(self._filename(key), "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored["key"] != key:
+                return None
+            return CacheEntry(
+                response=rebuild_response(stored["response"], url=key),
+                stored_at=datetime.fromisoformat(stored["stored_at"]),
+                vary=stored["vary"],
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger_for_module(__name__).warning("Failed to read %s from the response cache: %s", key, e)
+            return None
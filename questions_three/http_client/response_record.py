@@ -0,0 +1,37 @@
+"""
+Responses as plain data that can be written to a file as JSON and read
+  back without trusting the file to run code
+"""
+
+from base64 import b64decode, b64encode
+
+import requests
+
+
+def record_response(response):
+    """
+    Return a dict of the response's status, headers and content
+    """
+    return {
+        "status_code": response.status_code,
+        "reason": response.reason,
+        "headers": dict(response.headers),
+        "encoding": response.encoding,
+        "content": b64encode(response.content or b"").decode("ascii"),
+    }
+
+
+def rebuild_response(record, *, url=None):
+    """
+    Return a Response built from a dict made by record_response
+    """
+    response = requests.Response()
+    response.status_code = record["status_code"]
+    response.reason = record["reason"]
+    response.headers.update(record["headers"])
+    response.encoding = record["encoding"]
+    response.url = url
+    response._content = b64decode(record["content"])
+    # Lets iter_content serve the body from memory
+    response._content_consumed = True
+    return response
@@ -0,0 +1,62 @@
+import asyncio
+
+# Read streamed bodies this many bytes at a time unless told otherwise
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class ResponseStream:
+    """
+    The body of a streamed response, a chunk (bytes) at a time.
+    Iterate over it with "for" or, in a coroutine, "async for".
+    Closes the response when the body runs out or, if the body is not
+      read to the end, when a "with" block around it exits.
+
+    response -- The response, whose status and headers are available now
+    """
+
+    def __init__(self, response, *, chunk_size, on_chunk, executor=None):
+        self.response = response
+        self._chunks = response.iter_content(chunk_size=chunk_size)
+        self._on_chunk = on_chunk
+        self._executor = executor
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.close()
+            raise
+        self._on_chunk(chunk)
+        return chunk
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        chunk = await asyncio.get_running_loop().run_in_executor(self._executor, self._next_or_none)
+        if chunk is None:
+            raise StopAsyncIteration
+        return chunk
+
+    def _next_or_none(self):
+        # StopIteration cannot cross into a Future, so translate it
+        return next(self, None)
+
+    def write_to(self, f):
+        """
+        Write the rest of the body to a binary file
+        """
+        for chunk in self:
+            f.write(chunk)
+
+    def close(self):
+        self.response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
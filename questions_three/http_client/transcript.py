@@ -1,7 +1,22 @@
+from codecs import getincrementaldecoder
+from collections import deque
 from datetime import datetime
+from functools import partial
+from io import StringIO
+from tempfile import TemporaryFile
+from threading import Lock
 
 from twin_sister import dependency
 
+from questions_three.module_cfg import config_for_module
+
+from .request_timings import describe_timings
+
+# Copy spilled records to the artifact sink this many bytes at a time
+CHUNK_SIZE = 65536
+
+RECORD_SEPARATOR = "\n\n"
+
 
 def expand_headers(headers):
     return "\n".join(["%s: %s" % (k, v) for k, v in headers.items()])
@@ -11,6 +26,38 @@ def now():
     return dependency(datetime.utcnow)()
 
 
+def body_is_unread(response):
+    """
+    Return True if the response was streamed and its body has not been read
+      into memory (and so must be left to its reader)
+    """
+    return getattr(response, "_content", None) is False and getattr(response, "raw", None) is not None
+
+
+def body_size(response):
+    # Look only at a body that has already been read, so that measuring it
+    #  neither reads nor decodes anything
+    content = getattr(response, "_content", None)
+    return len(content) if isinstance(content, bytes) else 0
+
+
+def body_text(response, limit):
+    """
+    Return the response body as text, truncated after limit bytes
+    """
+    if body_is_unread(response):
+        # Reading a streamed body here would take it away from its reader
+        return ""
+    content = getattr(response, "_content", None)
+    if isinstance(content, bytes) and len(content) > limit:
+        text = content[:limit].decode(response.encoding or "utf-8", errors="replace")
+        return "%s\n[%d more bytes not shown]" % (text, len(content) - limit)
+    text = response.text
+    if text and len(text) > limit:
+        return "%s\n[%d more characters not shown]" % (text[:limit], len(text) - limit)
+    return text
+
+
 class Request:
     def __init__(self, method, url, headers={}, data=None, **kwargs):
         self.timestamp = now()
@@ -18,6 +65,10 @@ class Request:
         self.url = url
         self.headers = headers
         self.data = "\n\n" + str(data) if data else ""
+        self.size = len(url) + len(self.data) + sum(len(str(k)) + len(str(v)) for k, v in headers.items())
+
+    def render(self, body_limit):
+        return str(self)
 
     def __str__(self):
         return (
@@ -29,29 +80,177 @@ class Request:
 
 
 class Response:
-    def __init__(self, requests_response):
+    def __init__(self, requests_response, method=None, url=None, note=None, timings=None):
         self.timestamp = now()
         self.response = requests_response
+        # Identifies the request when responses arrive out of order
+        self.for_request = " to %s %s" % (method.upper(), url) if method else ""
+        if note:
+            self.for_request += " (%s)" % note
+        if timings:
+            self.for_request += " " + describe_timings(timings)
+        self.size = body_size(requests_response)
+        # Filled in by capture as a streamed body is read
+        self.prefix = None
+        self.streamed_bytes = 0
 
-    def __str__(self):
-        body = "\n\n%s" % self.response.text if self.response.text else ""
+    def capture(self, chunk, *, limit):
+        """
+        Keep the first limit bytes of a streamed body
+        """
+        if self.prefix is None:
+            self.prefix = bytearray()
+        room = limit - len(self.prefix)
+        if room > 0:
+            self.prefix += chunk[:room]
+        self.streamed_bytes += len(chunk)
+
+    def streamed_text(self, limit):
+        prefix = bytes(self.prefix[:limit])
+        text = prefix.decode(self.response.encoding or "utf-8", errors="replace")
+        if self.streamed_bytes > len(prefix):
+            return "%s\n[%d more bytes streamed]" % (text, self.streamed_bytes - len(prefix))
+        return text
+
+    def render(self, body_limit):
+        if self.prefix is None:
+            text = body_text(self.response, body_limit)
+        else:
+            text = self.streamed_text(body_limit)
+        body = "\n\n%s" % text if text else ""
         return (
-            " --------- Response at %s\n" % self.timestamp.isoformat()
+            " --------- Response at %s%s\n" % (self.timestamp.isoformat(), self.for_request)
             + "\n%d\n" % self.response.status_code
             + expand_headers(self.response.headers)
             + body
         )
 
 
+class TranscriptArtifact:
+    """
+    The transcript as it stood when the artifact was created.
+    Rather than build one giant string, write_to copies it to a file
+      piece by piece.  str() renders the whole thing, and a pickled
+      artifact becomes a plain string.
+    """
+
+    def __init__(self, *, records, spill_file, spilled_bytes, dropped, lock, body_limit):
+        self._records = records
+        self._spill_file = spill_file
+        self._spilled_bytes = spilled_bytes
+        self._dropped = dropped
+        self._lock = lock
+        self._body_limit = body_limit
+
+    def write_to(self, f):
+        """
+        Write the transcript to a text file
+        """
+        if self._dropped:
+            f.write(" --------- %d earlier records discarded%s" % (self._dropped, RECORD_SEPARATOR))
+        if self._spill_file is not None:
+            decoder = getincrementaldecoder("utf-8")()
+            position = 0
+            while position < self._spilled_bytes:
+                with self._lock:
+                    self._spill_file.seek(position)
+                    chunk = self._spill_file.read(min(CHUNK_SIZE, self._spilled_bytes - position))
+                if not chunk:
+                    break
+                position += len(chunk)
+                f.write(decoder.decode(chunk))
+            f.write(decoder.decode(b"", final=True))
+        for n, record in enumerate(self._records):
+            if n:
+                f.write(RECORD_SEPARATOR)
+            f.write(record.render(self._body_limit))
+
+    def __str__(self):
+        buffer = StringIO()
+        self.write_to(buffer)
+        return buffer.getvalue()
+
+    def __reduce__(self):
+        return (str, (str(self),))
+
+
 class Transcript:
+    """
+    HTTP requests and responses in the order they happened.
+
+    The most recent records stay in memory.  When there are more than
+      http_transcript_max_records of them or they hold more than
+      http_transcript_max_memory bytes, the oldest are rendered to a
+      temporary file (or discarded if http_transcript_spill_to_disk is off).
+    Response bodies are truncated after http_transcript_max_body_size bytes.
+    """
+
     def __init__(self):
-        self.records = []
+        config = config_for_module(__name__)
+        self._max_records = int(config.http_transcript_max_records)
+        self._max_memory = int(config.http_transcript_max_memory)
+        self._body_limit = int(config.http_transcript_max_body_size)
+        self._spill = config.http_transcript_spill_to_disk
+        self._lock = Lock()
+        self.records = deque()
+        self._memory = 0
+        self._spill_file = None
+        self._spilled_bytes = 0
+        self._dropped = 0
 
     def add_request(self, method, url, **kwargs):
-        self.records.append(Request(method, url, **kwargs))
+        self._add(Request(method, url, **kwargs))
+
+    def add_response(self, requests_response, method=None, url=None, note=None, timings=None):
+        self._add(Response(requests_response, method=method, url=url, note=note, timings=timings))
+
+    def streaming(self, requests_response):
+        """
+        Return a function that records the chunks of a streamed response
+          body as they are read, keeping the first
+          http_transcript_max_body_size bytes
+        """
+        with self._lock:
+            for record in reversed(self.records):
+                if getattr(record, "response", None) is requests_response:
+                    return partial(record.capture, limit=self._body_limit)
+        # Already spilled or discarded
+        return lambda chunk: None
+
+    def _add(self, record):
+        with self._lock:
+            self.records.append(record)
+            self._memory += record.size
+            while len(self.records) > 1 and (len(self.records) > self._max_records or self._memory > self._max_memory):
+                self._evict(self.records.popleft())
+
+    def _evict(self, record):
+        self._memory -= record.size
+        if not self._spill:
+            self._dropped += 1
+            return
+        if self._spill_file is None:
+            self._spill_file = TemporaryFile(mode="w+b")
+        data = (record.render(self._body_limit) + RECORD_SEPARATOR).encode("utf-8")
+        self._spill_file.seek(self._spilled_bytes)
+        self._spill_file.write(data)
+        self._spilled_bytes += len(data)
 
-    def add_response(self, requests_response):
-        self.records.append(Response(requests_response))
+    def artifact(self):
+        """
+        Return a TranscriptArtifact of the transcript so far
+        """
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.flush()
+            return TranscriptArtifact(
+                records=list(self.records),
+                spill_file=self._spill_file,
+                spilled_bytes=self._spilled_bytes,
+                dropped=self._dropped,
+                lock=self._lock,
+                body_limit=self._body_limit,
+            )
 
     def __str__(self):
-        return "\n\n".join([str(r) for r in self.records])
+        return str(self.artifact())
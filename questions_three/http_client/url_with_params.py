@@ -0,0 +1,13 @@
+from urllib.parse import urlencode
+
+
+def url_with_params(url, params):
+    """
+    Return the URL with params (a dict or sequence of pairs, as given to
+      requests) added to its query, in a repeatable order
+    """
+    if not params:
+        return url
+    if isinstance(params, dict):
+        params = sorted(params.items())
+    return "%s%s%s" % (url, "&" if "?" in url else "?", urlencode(params, doseq=True))
@@ -1 +1,2 @@
 from .logger_for_module import logger_for_module  # noqa: F401
+from .log_queue import disable_log_queue, enable_log_queue, flush_log_queue, log_queue_is_enabled  # noqa: F401
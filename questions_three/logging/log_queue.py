@@ -0,0 +1,92 @@
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+
+from twin_sister import dependency
+
+from .logger_for_module import route_through_queue
+
+
+class _BoundedQueueHandler(QueueHandler):
+    def enqueue(self, record):
+        # Wait for room rather than discard the record
+        self.queue.put(record)
+
+
+class _BoundedQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class LogQueue:
+    """
+    Bounded queue of log records, drained to stderr by a background thread
+    """
+
+    def __init__(self, *, max_size):
+        self._queue = Queue(maxsize=max_size)
+        self._listener = _BoundedQueueListener(self._queue, dependency(logging).StreamHandler())
+
+    def create_handler(self):
+        return _BoundedQueueHandler(self._queue)
+
+    def flush(self):
+        """
+        Wait until every record in the queue has been written
+        """
+        self._queue.join()
+
+    def start(self):
+        self._listener.start()
+
+    def stop(self):
+        """
+        Write every record in the queue and stop the background thread
+        """
+        self._listener.stop()
+
+
+_active = None
+_exit_hook_registered = False
+
+
+def enable_log_queue(*, max_size):
+    """
+    Route records from every logger_for_module logger through a queue so
+      writing them does not hold up the thread that logged them.
+    When the queue holds max_size records, logging waits for room.
+    """
+    global _active, _exit_hook_registered
+    if _active is not None:
+        return
+    _active = LogQueue(max_size=max_size)
+    _active.start()
+    route_through_queue(_active)
+    if not _exit_hook_registered:
+        atexit.register(disable_log_queue)
+        _exit_hook_registered = True
+
+
+def flush_log_queue():
+    """
+    Wait until every queued record has been written
+    """
+    if _active is not None:
+        _active.flush()
+
+
+def disable_log_queue():
+    """
+    Write every queued record and resume writing records directly
+    """
+    global _active
+    if _active is None:
+        return
+    route_through_queue(None)
+    _active.stop()
+    _active = None
+
+
+def log_queue_is_enabled():
+    return _active is not None
@@ -7,24 +7,67 @@ from twin_sister import dependency
 from .constants import MESSAGE_FORMAT
 
 
-def _parent_module_name(module_name):
+class _Registration:
+    def __init__(self, *, logger, logging_module, level_variables):
+        self.logger = logger
+        # The logging module that supplied the handler
+        self.logging_module = logging_module
+        # Names of the environment variables that control the level,
+        #  most specific first
+        self.level_variables = level_variables
+        # Values of those variables when the level was last set
+        self.level_settings = None
+
+
+# module name -> _Registration
+_registry = {}
+# If set, every logger sends its records through this LogQueue
+_log_queue = None
+
+
+def _level_variables(module_name):
     parts = module_name.split(".")
-    if len(parts) > 1:
-        return ".".join(parts[:-1])
-    return None
+    return tuple("%s_LOG_LEVEL" % "_".join(parts[:n]).upper() for n in range(len(parts), 0, -1))
+
 
+def _level_from_settings(settings):
+    for setting in settings:
+        if setting is not None:
+            return getattr(logging, setting)
+    return INFO
 
-def _level_for_module(module_name, environ):
-    var_name = "%s_LOG_LEVEL" % module_name.replace(".", "_").upper()
-    if var_name in environ.keys():
-        level = getattr(logging, environ[var_name])
+
+def _create_handler(logging_module):
+    if _log_queue is None:
+        handler = logging_module.StreamHandler()
     else:
-        parent_module = _parent_module_name(module_name)
-        if parent_module:
-            level = _level_for_module(parent_module, environ=environ)
-        else:
-            level = INFO
-    return level
+        handler = _log_queue.create_handler()
+    handler.setFormatter(Formatter(fmt=MESSAGE_FORMAT))
+    return handler
+
+
+def _register(module_name, logging_module):
+    logger = Logger(name=module_name)
+    logger.addHandler(_create_handler(logging_module))
+    registration = _Registration(
+        logger=logger, logging_module=logging_module, level_variables=_level_variables(module_name)
+    )
+    _registry[module_name] = registration
+    return registration
+
+
+def route_through_queue(log_queue):
+    """
+    Send records from every logger (existing and future) through the given
+      LogQueue or, if it is None, directly to a stream handler
+    """
+    global _log_queue
+    _log_queue = log_queue
+    for registration in list(_registry.values()):
+        logger = registration.logger
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(_create_handler(registration.logging_module))
 
 
 def logger_for_module(module_name):
@@ -33,12 +76,18 @@ def logger_for_module(module_name):
     Its level can be controlled by an environment variable:
       <module_name.upper()>_LOG_LEVEL=<DEBUG | INFO | WARNING | ERROR>
 
+    The same Logger is returned each time the same name is requested.
+    Its level is recalculated whenever the controlling variables change.
+
     module_name -- (str)  Name of the module
     """
     environ = dependency(os).environ
-    handler = dependency(logging).StreamHandler()
-    handler.setFormatter(Formatter(fmt=MESSAGE_FORMAT))
-    logger = Logger(name=module_name)
-    logger.addHandler(handler)
-    logger.setLevel(_level_for_module(module_name, environ=environ))
-    return logger
+    logging_module = dependency(logging)
+    registration = _registry.get(module_name)
+    if registration is None or registration.logging_module is not logging_module:
+        registration = _register(module_name, logging_module)
+    settings = tuple(environ.get(name) for name in registration.level_variables)
+    if settings != registration.level_settings:
+        registration.logger.setLevel(_level_from_settings(settings))
+        registration.level_settings = settings
+    return registration.logger
@@ -1 +1,4 @@
 from .loader import config_for_module  # noqa: F401
+from .snapshot import load_snapshot_from_environment
+
+load_snapshot_from_environment()
@@ -0,0 +1,46 @@
+def _raw_mapping(environ):
+    # os.environ keeps its contents in a plain dict.  Comparing that dict
+    #  happens entirely in C, so it is far cheaper than iterating over the
+    #  decoding mapping in front of it.
+    return getattr(environ, "_data", environ)
+
+
+class EnvironmentIndex:
+    """
+    Case-insensitive index of the variables in an environment
+    """
+
+    def __init__(self, environ):
+        self._snapshot = dict(_raw_mapping(environ))
+        self._index = {}
+        for k, v in environ.items():
+            self._index.setdefault(k.lower(), []).append(v)
+
+    def is_current(self, environ):
+        """
+        Return True if the environment has not changed since it was indexed
+        """
+        return _raw_mapping(environ) == self._snapshot
+
+    def values_for(self, name):
+        """
+        Return a list of values for every variable whose name matches
+          the given one (case insensitive)
+        """
+        return self._index.get(name.lower(), [])
+
+
+_latest = None
+
+
+def index_environment(environ):
+    """
+    Return an EnvironmentIndex for the given environment.
+    The index is rebuilt only when the environment changes.
+    """
+    global _latest
+    latest = _latest
+    if latest is None or not latest.is_current(environ):
+        latest = EnvironmentIndex(environ)
+        _latest = latest
+    return latest
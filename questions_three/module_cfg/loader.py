@@ -16,6 +16,22 @@ from .module_cfg import ModuleCfg
 UNIT_TEST_MODE = False
 VALID_TYPES = (bool, float, int, str, type(None))
 YML_FILENAME = "module_cfg.yml"
+# Configuration files contain only scalars, so the safe loader suffices.
+#  Prefer the libyaml binding when it is available because it is much faster.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# filename -> (stamp, defaults parsed from the file)
+_file_cache = {}
+# module name -> ((filename, stamp) for the module and each ancestor, resolved defaults)
+_module_cache = {}
+
+
+def clear_cache():
+    """
+    Forget all parsed configuration files and resolved defaults
+    """
+    _file_cache.clear()
+    _module_cache.clear()
 
 
 def validate_defaults(defaults, *, filename):
@@ -37,6 +53,19 @@ def contents_of_file(filename):
     return ""
 
 
+def file_stamp(filename):
+    """
+    Return a value that changes whenever the file changes
+      (or None if the file does not exist)
+    """
+    stat = dependency(os).stat if UNIT_TEST_MODE else os.stat
+    try:
+        info = stat(filename)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
 def parent_module(module):
     parts = module.__name__.split(".")
     if len(parts) > 1:
@@ -45,19 +74,65 @@ def parent_module(module):
     return None
 
 
-def inherit_missing_defaults(*, defaults, parent_module):
-    return dict(defaults_for_module(parent_module), **defaults)
+def config_filenames(module):
+    """
+    Return the configuration filename for the module and each of its
+      ancestors, nearest first
+    """
+    filenames = []
+    while module is not None:
+        filenames.append(module_filename(module, YML_FILENAME))
+        module = parent_module(module)
+    return tuple(filenames)
+
+
+def defaults_for_file(filename, *, stamp):
+    cached = _file_cache.get(filename)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    if stamp is None:
+        defaults = {}
+    else:
+        log = logger_for_module(__name__)
+        defaults = yaml.load(contents_of_file(filename), Loader=YAML_LOADER) or {}
+        log.debug("Configuration from %s: %s", filename, defaults)
+        validate_defaults(defaults, filename=filename)
+    _file_cache[filename] = (stamp, defaults)
+    return defaults
 
 
-def defaults_for_module(module):
-    log = logger_for_module(__name__)
-    filename = module_filename(module, YML_FILENAME)
-    defaults = yaml.load(contents_of_file(filename), Loader=yaml.Loader) or {}
-    log.debug("Configuration from %s: %s" % (filename, defaults))
+def parsed_files():
+    """
+    Return {filename: (stamp, defaults)} for each configuration file that
+      has been parsed and still existed at the time
+    """
+    return {filename: entry for filename, entry in _file_cache.items() if entry[0] is not None}
+
+
+def remember_file(filename, *, stamp, defaults):
+    """
+    Accept defaults that were parsed elsewhere (e.g. by a parent process).
+    They will be used for as long as the file's stamp matches.
+    """
     validate_defaults(defaults, filename=filename)
-    parent = parent_module(module)
-    if parent:
-        defaults = inherit_missing_defaults(defaults=defaults, parent_module=parent)
+    _file_cache[filename] = (stamp, defaults)
+
+
+def defaults_for_module(module):
+    """
+    Return the module's defaults, inheriting any that are missing from
+      its ancestors.  Each file is parsed only once and re-parsed only
+      when its modification time or size changes.
+    """
+    stamps = tuple((filename, file_stamp(filename)) for filename in config_filenames(module))
+    cached = _module_cache.get(module.__name__)
+    if cached and cached[0] == stamps:
+        return cached[1]
+    defaults = {}
+    # Start with the most distant ancestor so each descendant overrides it
+    for filename, stamp in reversed(stamps):
+        defaults = dict(defaults, **defaults_for_file(filename, stamp=stamp))
+    _module_cache[module.__name__] = (stamps, defaults)
     return defaults
 
 
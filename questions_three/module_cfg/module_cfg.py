@@ -4,6 +4,7 @@ from twin_sister import dependency
 
 from questions_three.exceptions import InvalidConfiguration
 
+from .environment_index import index_environment
 from .transform_type import transform_type
 
 
@@ -14,8 +15,7 @@ class ModuleCfg:
         self._module_name = module_name
 
     def _from_env(self, name):
-        lc_name = name.lower()
-        matches = [v for k, v in self._env.items() if lc_name == k.lower()]
+        matches = index_environment(self._env).values_for(name)
         count = len(matches)
         if 0 == count:
             return None
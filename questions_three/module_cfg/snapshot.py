@@ -0,0 +1,85 @@
+from importlib.util import find_spec
+import json
+import os
+import pkgutil
+
+from twin_sister import dependency
+
+import questions_three
+
+from . import loader
+
+# A parent process (e.g. run_all) sets this variable to a snapshot of the
+#  configuration it has already parsed.  Child processes load the snapshot
+#  instead of parsing the same files again.
+SNAPSHOT_ENV_VAR = "QUESTIONS_THREE_CONFIG_SNAPSHOT"
+# Optional packages (e.g. questions_three_aws) are named with this prefix
+OPTIONAL_PACKAGE_PREFIX = "questions_three_"
+
+
+def _os():
+    return dependency(os) if loader.UNIT_TEST_MODE else os
+
+
+def _config_files_beneath(top_dir):
+    found = []
+    for path, _, files in _os().walk(top_dir):
+        if loader.YML_FILENAME in files:
+            found.append(_os().path.join(path, loader.YML_FILENAME))
+    return found
+
+
+def _package_dirs():
+    """
+    Return the directories of the questions_three package and each
+      installed optional package.  Optional packages are found without
+      being imported.
+    """
+    dirs = [os.path.dirname(questions_three.__file__)]
+    for module in dependency(pkgutil).iter_modules():
+        if module.ispkg and module.name.startswith(OPTIONAL_PACKAGE_PREFIX):
+            spec = dependency(find_spec)(module.name)
+            if spec is not None and spec.submodule_search_locations:
+                dirs += list(spec.submodule_search_locations)
+    return dirs
+
+
+def create_snapshot(extra_dirs=()):
+    """
+    Parse every configuration file in the questions_three package, the
+      installed optional packages, and extra_dirs (plus any already parsed
+      from elsewhere) and return the results as a JSON string suitable
+      for load_snapshot.
+    Configuration files anywhere else (such as in a package the suites
+      import from outside extra_dirs) are still parsed by each suite.
+
+    extra_dirs -- (iterable of str) More directories to search,
+      such as the one that holds the suites
+    """
+    dirs = _package_dirs() + [_os().path.abspath(d) for d in extra_dirs]
+    for top_dir in dirs:
+        for filename in _config_files_beneath(top_dir):
+            loader.defaults_for_file(filename, stamp=loader.file_stamp(filename))
+    return json.dumps(
+        {
+            filename: {"stamp": stamp, "defaults": defaults}
+            for filename, (stamp, defaults) in loader.parsed_files().items()
+        },
+        separators=(",", ":"),
+    )
+
+
+def load_snapshot(snapshot):
+    """
+    Seed the configuration cache from a string created by create_snapshot.
+    A file that has changed since the snapshot was taken will be parsed
+      again as usual.
+    """
+    for filename, entry in json.loads(snapshot).items():
+        loader.remember_file(filename, stamp=tuple(entry["stamp"]), defaults=entry["defaults"])
+
+
+def load_snapshot_from_environment():
+    snapshot = dependency(os).environ.get(SNAPSHOT_ENV_VAR)
+    if snapshot:
+        load_snapshot(snapshot)
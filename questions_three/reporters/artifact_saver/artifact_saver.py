@@ -33,6 +33,10 @@ def sanitize_filename(ugly):
 
 
 class ArtifactSaver:
+
+    event_handlers_are_critical = False
+    event_handlers_stream_artifacts = True
+
     def __init__(self):
         self._suite_name = "suiteless"
 
@@ -47,7 +51,11 @@ class ArtifactSaver:
         full_path = os.path.join(self.reports_path(), path)
         dependency(os).makedirs(full_path, exist_ok=True)
         with dependency(open)(os.path.join(full_path, filename), mode) as f:
-            f.write(artifact)
+            if hasattr(artifact, "write_to"):
+                # Streams itself rather than becoming one big string
+                artifact.write_to(f)
+            else:
+                f.write(artifact)
 
     def path_for_artifact(self, suite_name, test_name):
         if suite_name is None:
@@ -0,0 +1,2 @@
+from .event_journal import EventJournal, read_journal  # noqa: F401
+from .replay import replay_journal  # noqa: F401
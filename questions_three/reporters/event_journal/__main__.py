@@ -0,0 +1,19 @@
+import sys
+
+from questions_three.scaffolds.common.activate_reporters import configured_reporters, custom_reporters
+from questions_three.scaffolds.common.configure_logging import configure_log_queue
+
+from .event_journal import EventJournal
+from .replay import replay_journal
+
+filenames = sys.argv[1:]
+if not filenames:
+    sys.stderr.write("Please specify one or more event journals to replay\n")
+    sys.exit(1)
+configure_log_queue()
+# Keep strong references so the subscribers stay alive
+reporters = [cls() for cls in configured_reporters() + custom_reporters() if cls is not EventJournal]
+for reporter in reporters:
+    reporter.activate()
+for filename in filenames:
+    replay_journal(filename)
@@ -0,0 +1,87 @@
+import atexit
+from datetime import datetime
+import os
+import struct
+from threading import Lock
+
+from twin_sister import dependency
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.event_broker.event_serialization import pack_event, unpack_event
+from questions_three.module_cfg import config_for_module
+from questions_three.vanilla import path_to_entry_script
+
+# Each record is its length followed by the packed event
+FRAME_HEADER = struct.Struct(">I")
+
+# Reporters create these from other events, so replaying them would
+#  produce everything twice
+NOT_JOURNALED = frozenset((TestEvent.suite_results_compiled, TestEvent.report_created))
+
+
+def journal_filename():
+    config = config_for_module(__name__)
+    started = dependency(datetime).now().strftime("%Y%m%dT%H%M%S")
+    return os.path.join(config.reports_path, "event_journals", "%s-%d.journal" % (started, dependency(os).getpid()))
+
+
+class EventJournal:
+    """
+    Appends every test event to a journal file, so reports can be
+      regenerated later by replaying it
+    """
+
+    def __init__(self):
+        self._file = None
+        self._lock = Lock()
+        self._entry_script = dependency(path_to_entry_script)()
+        self.filename = None
+
+    def activate(self):
+        EventBroker.subscribe(events=[e for e in TestEvent if e not in NOT_JOURNALED], func=self.record)
+        atexit.register(self.close)
+
+    def _open(self):
+        config = config_for_module(__name__)
+        self.filename = journal_filename()
+        dependency(os).makedirs(os.path.dirname(self.filename), exist_ok=True)
+        self._file = dependency(open)(self.filename, "ab", buffering=int(config.event_journal_buffer_size))
+
+    def record(self, *, event, event_time=None, **kwargs):
+        if TestEvent.suite_started == event:
+            # Lets a replay tell where the suite came from
+            kwargs.setdefault("entry_script", self._entry_script)
+        packed = pack_event(event=event, event_time=event_time, properties=kwargs)
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.write(FRAME_HEADER.pack(len(packed)))
+            self._file.write(packed)
+            if TestEvent.suite_ended == event:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_journal(filename):
+    """
+    Yield (event, event_time, properties) for each event in a journal.
+    Stop quietly at a record cut short by a crash.
+    A property of a type a journal may not hold is None (see
+      event_serialization.JOURNAL_GLOBALS).
+    """
+    with dependency(open)(filename, "rb") as f:
+        while True:
+            header = f.read(FRAME_HEADER.size)
+            if len(header) < FRAME_HEADER.size:
+                return
+            (length,) = FRAME_HEADER.unpack(header)
+            packed = f.read(length)
+            if len(packed) < length:
+                return
+            yield unpack_event(packed, restricted=True)
@@ -0,0 +1,12 @@
+from questions_three.event_broker import EventBroker
+
+from .event_journal import read_journal
+
+
+def replay_journal(filename):
+    """
+    Publish every event in a journal, as it was originally published
+    """
+    for event, event_time, properties in read_journal(filename):
+        run_id = properties.pop("run_id", None)
+        EventBroker.publish(event=event, event_time=event_time, run_id=run_id, **properties)
@@ -12,6 +12,12 @@ class EventLogger:
     def activate(self):
         subscribe_event_handlers(self)
 
+    def on_load_measured(self, test_name, request_count, throughput_per_second, error_rate, latency_seconds, **kwargs):
+        self._log.info(
+            f"{test_name}: {request_count} calls at {throughput_per_second:.1f}/s, "
+            f"{error_rate:.2%} errors, p95 latency {latency_seconds['p95']} seconds"
+        )
+
     def on_sample_measured(self, test_name, sample_parameters, sample_execution_seconds, **kwargs):
         self._log.info(f"{test_name} completed in {sample_execution_seconds} seconds")
 
@@ -0,0 +1 @@
+from .http_latency_reporter import HttpLatencyReporter, url_template  # noqa: F401
@@ -0,0 +1,80 @@
+import json
+import re
+from threading import Lock
+from urllib.parse import urlsplit, urlunsplit
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker, subscribe_event_handlers
+from questions_three.vanilla import LatencyHistogram
+
+# Path segments that identify a thing rather than a kind of thing:
+#  numbers, UUIDs, and long hexadecimal strings
+ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}|[0-9a-f]{16,})$", re.IGNORECASE)
+
+
+def url_template(url):
+    """
+    Return the URL without its query or fragment and with each path
+      segment that looks like an ID replaced by "{id}", so that requests
+      for different things of the same kind are counted together
+    """
+    parts = urlsplit(url)
+    path = "/".join("{id}" if ID_SEGMENT.match(segment) else segment for segment in parts.path.split("/"))
+    return urlunsplit((parts.scheme, parts.netloc, path, "", ""))
+
+
+class HttpLatencyReporter:
+    """
+    Builds a histogram of the total time HTTP requests take for each method
+      and URL template.  When a suite ends, publishes them with their
+      percentiles as a JSON artifact.
+    """
+
+    event_handlers_are_critical = False
+
+    def __init__(self):
+        # suite name -> (method, URL template) -> LatencyHistogram
+        self._histograms = {}
+        self._lock = Lock()
+
+    def activate(self):
+        subscribe_event_handlers(self)
+
+    def on_http_response_received(
+        self, request_timings=None, http_method=None, request_url=None, suite_name=None, **kwargs
+    ):
+        # Responses from the cache have no timings
+        if request_timings is None or request_url is None:
+            return
+        key = (http_method, url_template(request_url))
+        with self._lock:
+            histograms = self._histograms.setdefault(suite_name, {})
+            if key not in histograms:
+                histograms[key] = LatencyHistogram()
+            histograms[key].add(request_timings["total"])
+
+    def on_suite_ended(self, suite_name=None, **kwargs):
+        with self._lock:
+            histograms = self._histograms.pop(suite_name, {})
+            # Requests made outside any suite are attributed to this one
+            for key, histogram in self._histograms.pop(None, {}).items():
+                if key in histograms:
+                    histograms[key].merge(histogram)
+                else:
+                    histograms[key] = histogram
+        if not histograms:
+            return
+        report = {
+            "suite_name": suite_name,
+            "requests": [
+                dict(method=method, url=url, **histograms[(method, url)].summary())
+                for method, url in sorted(histograms, key=lambda key: (key[1], key[0] or ""))
+            ],
+        }
+        EventBroker.publish(
+            event=TestEvent.artifact_created,
+            artifact=json.dumps(report, indent=2),
+            artifact_mime_type="application/json",
+            artifact_type="http_latency",
+            suite_name=suite_name,
+        )
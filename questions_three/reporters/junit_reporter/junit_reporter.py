@@ -26,7 +26,8 @@ def current_time():
 
 def exception_str(e):
     if e:
-        return "(%s) %s" % (type(e), e)
+        # An exception from another process stands in for one we may not know
+        return "(%s) %s" % (getattr(e, "original_type", type(e)), e)
     return ""
 
 
@@ -69,12 +70,13 @@ def ci_workspace_path():
     return None
 
 
-def infer_package_name():
+def infer_package_name(script=None):
     """
     Use the path to the test script to infer a "package" name
     for the Junit report.
     """
-    script = dependency(path_to_entry_script)()
+    if script is None:
+        script = dependency(path_to_entry_script)()
     if not script:
         return ""
     script_path, _ = os.path.split(script)
@@ -93,25 +95,36 @@ def infer_package_name():
 class JunitReporter:
 
     REPORTS_DIRECTORY = "reports"
+    event_handlers_are_critical = False
 
     def __init__(self):
-        self._dummy_test_case = None
+        # suite name -> entry script, for suites run by other processes
+        self._entry_scripts = {}
+        # suite name -> test case standing in for a suite error
+        self._dummy_test_cases = {}
 
     def activate(self):
         subscribe_event_handlers(self)
 
+    def on_suite_started(self, suite_name, entry_script=None, **kwargs):
+        if entry_script is not None:
+            self._entry_scripts[suite_name] = entry_script
+
     def on_suite_erred(self, suite_name, exception=None, **kwargs):
-        self._dummy_test_case = TestCase(name=suite_name, status="error")
+        dummy = TestCase(name=suite_name, status="error")
         if exception:
-            self._dummy_test_case.add_error_info(message=exception_str(exception), output=format_exception(exception))
+            dummy.add_error_info(message=exception_str(exception), output=format_exception(exception))
+        self._dummy_test_cases[suite_name] = dummy
 
     def on_suite_results_compiled(self, suite_results, **kwargs):
+        dummy = self._dummy_test_cases.pop(suite_results.suite_name, None)
+        package_name = infer_package_name(self._entry_scripts.pop(suite_results.suite_name, None))
         suite_name = suite_results.suite_name or "NamelessSuite"
         test_cases = convert_tests(suite_results.tests)
-        if self._dummy_test_case:
-            test_cases.append(self._dummy_test_case)
+        if dummy:
+            test_cases.append(dummy)
         suite = dependency(TestSuite)(
-            name=infer_package_name() + suite_name, timestamp=current_time().isoformat(), test_cases=test_cases
+            name=package_name + suite_name, timestamp=current_time().isoformat(), test_cases=test_cases
         )
         xml_report = ElementTree.tostring(suite.build_xml_doc(), encoding="utf-8").decode(encoding="utf-8")
         EventBroker.publish(
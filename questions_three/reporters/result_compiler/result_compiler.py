@@ -1,4 +1,5 @@
 from datetime import datetime
+from threading import Lock
 
 from questions_three.constants import TestEvent, TestStatus
 from questions_three.event_broker import EventBroker, subscribe_event_handlers
@@ -14,58 +15,82 @@ def current_time():
 
 class ResultCompiler:
     def __init__(self):
+        # Results for the suite most recently started.
+        # Events that do not name a suite we know are attributed to it.
         self.results = SuiteResults()
-
-    def _find_or_create_test(self, test_name):
-        for candidate in self.results.tests:
-            if candidate.name == test_name:
-                return candidate
-        test = TestResult(test_name=test_name)
-        test.start_time = current_time()
-        test.status = TestStatus.running
-        self.results.tests.append(test)
-        return test
+        # Suites can run at the same time when events arrive from several
+        #  processes, so keep each one's results separately
+        self._results_by_suite = {}
+        # Tests may run in parallel threads, so two events for the same
+        #  new test must not both create it
+        self._tests_lock = Lock()
+
+    def _results_for(self, suite_name):
+        return self._results_by_suite.get(suite_name, self.results)
+
+    def _find_or_create_test(self, test_name, suite_name=None, event_time=None):
+        results = self._results_for(suite_name)
+        with self._tests_lock:
+            for candidate in results.tests:
+                if candidate.name == test_name:
+                    return candidate
+            test = TestResult(test_name=test_name)
+            test.start_time = event_time or current_time()
+            test.status = TestStatus.running
+            results.tests.append(test)
+            return test
 
     def activate(self):
         subscribe_event_handlers(self)
 
-    def on_artifact_created(self, artifact, test_name=None, **kwargs):
+    def on_artifact_created(self, artifact, test_name=None, suite_name=None, **kwargs):
         if test_name:
-            self._find_or_create_test(test_name).artifacts.append(artifact)
+            self._find_or_create_test(test_name, suite_name).artifacts.append(artifact)
         else:
-            self.results.artifacts.append(artifact)
-
-    def on_suite_started(self, suite_name, **kwargs):
-        self.results.suite_start_time = current_time()
-        self.results.suite_name = suite_name
-
-    def on_suite_ended(self, **kwargs):
-        self.results.suite_end_time = current_time()
-        EventBroker.publish(event=TestEvent.suite_results_compiled, suite_results=self.results)
-
-    def on_suite_erred(self, exception=None, **kwargs):
-        self.results.suite_exception = exception or Exception("Suite erred.  No exception was provided.")
-
-    def on_test_ended(self, test_name, **kwargs):
-        test = self._find_or_create_test(test_name)
-        test.end_time = current_time()
+            self._results_for(suite_name).artifacts.append(artifact)
+
+    def on_suite_started(self, suite_name, event_time=None, **kwargs):
+        results = self._results_by_suite.get(suite_name)
+        if results is None:
+            if self.results.suite_name in (None, suite_name):
+                results = self.results
+            else:
+                results = SuiteResults()
+            self._results_by_suite[suite_name] = results
+        results.suite_start_time = event_time or current_time()
+        results.suite_name = suite_name
+        self.results = results
+
+    def on_suite_ended(self, suite_name=None, event_time=None, **kwargs):
+        results = self._results_for(suite_name)
+        results.suite_end_time = event_time or current_time()
+        self._results_by_suite.pop(suite_name, None)
+        EventBroker.publish(event=TestEvent.suite_results_compiled, suite_results=results)
+
+    def on_suite_erred(self, exception=None, suite_name=None, **kwargs):
+        results = self._results_for(suite_name)
+        results.suite_exception = exception or Exception("Suite erred.  No exception was provided.")
+
+    def on_test_ended(self, test_name, suite_name=None, event_time=None, **kwargs):
+        test = self._find_or_create_test(test_name, suite_name, event_time)
+        test.end_time = event_time or current_time()
         if TestStatus.running == test.status:
             test.status = TestStatus.passed
 
-    def on_test_erred(self, test_name, exception=None, **kwargs):
-        test = self._find_or_create_test(test_name)
+    def on_test_erred(self, test_name, exception=None, suite_name=None, **kwargs):
+        test = self._find_or_create_test(test_name, suite_name)
         test.status = TestStatus.erred
         test.exception = exception
 
-    def on_test_failed(self, test_name, exception=None, **kwargs):
-        test = self._find_or_create_test(test_name)
+    def on_test_failed(self, test_name, exception=None, suite_name=None, **kwargs):
+        test = self._find_or_create_test(test_name, suite_name)
         test.status = TestStatus.failed
         test.exception = exception
 
-    def on_test_skipped(self, test_name, exception=None, **kwargs):
-        test = self._find_or_create_test(test_name)
+    def on_test_skipped(self, test_name, exception=None, suite_name=None, **kwargs):
+        test = self._find_or_create_test(test_name, suite_name)
         test.status = TestStatus.skipped
         test.exception = exception
 
-    def on_test_started(self, test_name, **kwargs):
-        self._find_or_create_test(test_name)
+    def on_test_started(self, test_name, suite_name=None, event_time=None, **kwargs):
+        self._find_or_create_test(test_name, suite_name, event_time)
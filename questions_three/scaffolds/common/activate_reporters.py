@@ -3,16 +3,24 @@ import re
 
 from twin_sister import dependency
 
+from questions_three.event_broker.event_bus import forwarder_from_environment
 from questions_three.exceptions import InvalidConfiguration
 from questions_three.module_cfg import config_for_module
 from questions_three.reporters.artifact_saver import ArtifactSaver
+from questions_three.reporters.event_journal import EventJournal
 from questions_three.reporters.event_logger import EventLogger
+from questions_three.reporters.http_latency_reporter import HttpLatencyReporter
 from questions_three.reporters.junit_reporter import JunitReporter
 from questions_three.reporters.result_compiler import ResultCompiler
 
+from .configure_logging import configure_log_queue
+
 
 BUILT_IN_REPORTERS = (ArtifactSaver, EventLogger, JunitReporter, ResultCompiler)
 
+# Available by name in event_reporters but not active by default
+OPTIONAL_REPORTERS = (EventJournal, HttpLatencyReporter)
+
 _active_reporters = []
 
 enabled = True
@@ -46,7 +54,7 @@ def import_class(full_name):
 def configured_reporters():
     conf = config_for_module(__name__)
     configured_names = conf.event_reporters.split(",")
-    return [cls for cls in BUILT_IN_REPORTERS if cls.__name__ in configured_names]
+    return [cls for cls in BUILT_IN_REPORTERS + OPTIONAL_REPORTERS if cls.__name__ in configured_names]
 
 
 def custom_reporters():
@@ -54,8 +62,15 @@ def custom_reporters():
 
 
 def activate_reporters():
+    configure_log_queue()
     if not enabled:
         return
+    forwarder = forwarder_from_environment()
+    if forwarder:
+        # The process that launched us will do the reporting
+        forwarder.activate()
+        _active_reporters.append(forwarder)
+        return
     for cls in configured_reporters() + custom_reporters():
         reporter = cls()
         reporter.activate()
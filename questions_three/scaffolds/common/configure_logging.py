@@ -2,7 +2,40 @@ import logging
 
 from twin_sister import dependency
 
+from questions_three.event_broker import subscribe_event_handlers
+from questions_three.logging import enable_log_queue, flush_log_queue
 from questions_three.logging.constants import MESSAGE_FORMAT as LOG_MESSAGE_FORMAT
+from questions_three.module_cfg import config_for_module
+
+
+class LogQueueFlusher:
+    """
+    Ensure that queued log messages have been written by the time
+      each suite ends
+    """
+
+    def on_suite_ended(self, **kwargs):
+        flush_log_queue()
+
+
+# Strong reference to keep the flusher subscribed.
+# Replacing it lets the previous one expire, so it never receives twice.
+_flusher = None
+
+
+def configure_log_queue():
+    """
+    Start the log queue if LOG_QUEUE_ENABLED is set.
+    activate_reporters calls this, so it applies under every scaffold.
+    """
+    global _flusher
+    config = config_for_module(__name__)
+    if config.log_queue_enabled:
+        enable_log_queue(max_size=int(config.log_queue_size))
+        _flusher = LogQueueFlusher()
+        subscribe_event_handlers(_flusher)
+    else:
+        _flusher = None
 
 
 def configure_logging():
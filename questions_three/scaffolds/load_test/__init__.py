@@ -0,0 +1,5 @@
+from questions_three.scaffolds.common import precondition, skip  # noqa: F401
+from questions_three.scaffolds.common.activate_reporters import activate_reporters
+from .generate_load import generate_load  # noqa: F401
+
+activate_reporters()
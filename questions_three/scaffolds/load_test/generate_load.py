@@ -0,0 +1,199 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter, sleep
+
+from twin_sister import dependency
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker, current_event_context, propagate_event_context
+from questions_three.vanilla import LatencyHistogram
+
+
+class _Schedule:
+    """
+    Hands out the times at which virtual users make their calls.
+    With a target rate, the calls are evenly spaced no matter how long
+      each takes, so a slow server does not slow the arrivals.
+    """
+
+    def __init__(self, *, clock, duration_seconds, iterations, requests_per_second):
+        self._clock = clock
+        self._started = clock()
+        self._deadline = None if duration_seconds is None else self._started + duration_seconds
+        self._iterations = iterations
+        self._interval = 1 / requests_per_second if requests_per_second else None
+        self._issued = 0
+        self._lock = Lock()
+
+    def next_call(self):
+        """
+        Return the time at which to make the next call or None if there are
+          no more calls to make
+        """
+        with self._lock:
+            if self._iterations is not None and self._issued >= self._iterations:
+                return None
+            n = self._issued
+            self._issued += 1
+        at = self._clock() if self._interval is None else self._started + n * self._interval
+        if self._deadline is not None and at >= self._deadline:
+            return None
+        return at
+
+
+class _Results:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = {}  # exception class name -> count
+        self._lock = Lock()
+
+    def add(self, seconds, exception=None):
+        with self._lock:
+            self.latency.add(seconds)
+            if exception is not None:
+                name = type(exception).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def _virtual_user(*, func, schedule, results, clock, wait):
+    while True:
+        at = schedule.next_call()
+        if at is None:
+            return
+        delay = at - clock()
+        if delay > 0:
+            wait(delay)
+        started = clock()
+        try:
+            func()
+        except Exception as e:
+            results.add(clock() - started, e)
+        else:
+            results.add(clock() - started)
+
+
+def _validate(*, virtual_users, duration_seconds, iterations, requests_per_second):
+    if duration_seconds is None and iterations is None:
+        raise TypeError("Specify duration_seconds, iterations, or both")
+    if int(virtual_users) != virtual_users or virtual_users < 1:
+        raise TypeError(f'virtual_users "{virtual_users}" must be a positive integer')
+    if requests_per_second is not None and requests_per_second <= 0:
+        raise TypeError(f'requests_per_second "{requests_per_second}" must be positive')
+
+
+def _measure(*, func, virtual_users, duration_seconds, iterations, requests_per_second):
+    # Resolved here because the virtual users' threads do not see
+    #  dependencies injected in this one
+    clock = dependency(perf_counter)
+    wait = dependency(sleep)
+    schedule = _Schedule(
+        clock=clock, duration_seconds=duration_seconds, iterations=iterations, requests_per_second=requests_per_second
+    )
+    results = _Results()
+    started = clock()
+    with ThreadPoolExecutor(max_workers=virtual_users) as executor:
+        users = [
+            executor.submit(
+                propagate_event_context(_virtual_user),
+                func=func,
+                schedule=schedule,
+                results=results,
+                clock=clock,
+                wait=wait,
+            )
+            for _ in range(virtual_users)
+        ]
+        for user in users:
+            user.result()
+    elapsed = clock() - started
+    count = results.latency.count
+    error_count = sum(results.errors.values())
+    return {
+        "load_parameters": {
+            "virtual_users": virtual_users,
+            "duration_seconds": duration_seconds,
+            "iterations": iterations,
+            "requests_per_second": requests_per_second,
+        },
+        "load_elapsed_seconds": elapsed,
+        "request_count": count,
+        "error_count": error_count,
+        "error_rate": error_count / count if count else 0.0,
+        "error_types": results.errors,
+        "throughput_per_second": count / elapsed if elapsed else 0.0,
+        "latency_seconds": results.latency.statistics(),
+    }
+
+
+def generate_load(
+    *,
+    func,
+    virtual_users=1,
+    duration_seconds=None,
+    iterations=None,
+    requests_per_second=None,
+    max_error_rate=None,
+    suite_name=None,
+    test_name=None,
+):
+    """
+    Call func over and over from virtual_users threads at once, then
+      publish LOAD_MEASURED with the throughput, error rate and latency
+      percentiles, and return the same measurements in a dict.
+    Any exception func raises counts as an error.
+
+    func -- (callable) Takes no arguments.  Typically sends a request
+      or a few with an HttpClient.
+    virtual_users -- (int) Number of calls in progress at once
+    duration_seconds -- (number) Stop starting calls after this long
+    iterations -- (int) Stop after this number of calls in all
+    requests_per_second -- (number) Start calls at this steady rate
+      instead of as soon as each virtual user is free.  If the virtual
+      users cannot keep up, the calls start late.
+    max_error_rate -- (number) Fail the test if more than this
+      proportion of calls (0 to 1) raise exceptions
+    suite_name -- (str) Default is the name of func.  Ignored inside a
+      suite that is already in progress (such as a test_script
+      test_suite), which the load test joins as one of its tests.
+    test_name -- (str) Default is "<func> under load"
+    """
+    _validate(
+        virtual_users=virtual_users,
+        duration_seconds=duration_seconds,
+        iterations=iterations,
+        requests_per_second=requests_per_second,
+    )
+    name = getattr(func, "__name__", type(func).__name__)
+    surrounding_suite = current_event_context().get("suite_name")
+    if surrounding_suite is not None:
+        suite_name = surrounding_suite
+    elif suite_name is None:
+        suite_name = name
+    if test_name is None:
+        test_name = f"{name} under load"
+    event_kwargs = {"test_name": test_name, "suite_name": suite_name}
+    if surrounding_suite is None:
+        EventBroker.publish(event=TestEvent.suite_started, suite_name=suite_name)
+    EventBroker.publish(event=TestEvent.test_started, **event_kwargs)
+    measurements = None
+    try:
+        measurements = _measure(
+            func=func,
+            virtual_users=virtual_users,
+            duration_seconds=duration_seconds,
+            iterations=iterations,
+            requests_per_second=requests_per_second,
+        )
+        EventBroker.publish(event=TestEvent.load_measured, **measurements, **event_kwargs)
+        if max_error_rate is not None and measurements["error_rate"] > max_error_rate:
+            raise AssertionError(
+                f"Error rate {measurements['error_rate']:.2%} exceeded the maximum of {max_error_rate:.2%}"
+            )
+    except AssertionError as e:
+        EventBroker.publish(event=TestEvent.test_failed, exception=e, **event_kwargs)
+    except Exception as e:
+        EventBroker.publish(event=TestEvent.test_erred, exception=e, **event_kwargs)
+    EventBroker.publish(event=TestEvent.test_ended, **event_kwargs)
+    if surrounding_suite is None:
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name=suite_name)
+    return measurements
@@ -1,6 +1,7 @@
 from .b16encode_str import b16encode_str  # noqa: F401
 from .call_with_exception_tolerance import call_with_exception_tolerance  # noqa
 from .format_exception import format_exception  # noqa: F401
+from .latency_histogram import LatencyHistogram  # noqa: F401
 from .module_filename import module_filename  # noqa: F401
 from .mutable_object import MutableObject  # noqa: F401
 from .path_to_entry_script import path_to_entry_script  # noqa: F401
@@ -12,6 +12,10 @@ def format_exception(e):
     """
     Convert an exception to a human-readable message and stacktrace
     """
+    already_formatted = getattr(e, "formatted_exception", None)
+    if already_formatted is not None:
+        # Stands in for an exception from another process
+        return already_formatted
     tb = TracebackException.from_exception(e)
     stack = []
     for raw in tb.format():
@@ -0,0 +1,85 @@
+from math import ceil, log
+
+# Each bucket is this much wider than the one before, so a value reported
+#  from the middle of a bucket is within about 4.4% of the true value
+BUCKET_GROWTH = 2 ** (1 / 8)
+
+# The first bucket holds everything up to this many seconds
+SMALLEST_BUCKET = 1e-5
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """
+    Counts latencies (in seconds) in buckets of exponentially growing
+      width, which takes little memory no matter how many there are
+    """
+
+    def __init__(self):
+        self.buckets = {}  # index -> count
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def bucket_for(seconds):
+        if seconds <= SMALLEST_BUCKET:
+            return 0
+        return ceil(log(seconds / SMALLEST_BUCKET, BUCKET_GROWTH))
+
+    @staticmethod
+    def upper_bound(bucket):
+        return SMALLEST_BUCKET * BUCKET_GROWTH**bucket
+
+    def add(self, seconds):
+        bucket = self.bucket_for(seconds)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other):
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent):
+        """
+        Return the latency that percent of the samples did not exceed
+        """
+        if not self.count:
+            return None
+        rank = max(1, ceil(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                middle = SMALLEST_BUCKET * BUCKET_GROWTH ** (bucket - 0.5) if bucket else SMALLEST_BUCKET
+                return min(self.max, max(self.min, middle))
+        return self.max
+
+    def statistics(self):
+        """
+        Return a dict of the minimum, mean, percentiles, and maximum in seconds
+        """
+        seconds = {"min": self.min, "mean": self.total / self.count if self.count else None}
+        seconds.update({"p%d" % percent: self.percentile(percent) for percent in PERCENTILES})
+        seconds["max"] = self.max
+        return seconds
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "seconds": self.statistics(),
+            "histogram": [
+                {"le": self.upper_bound(bucket), "count": self.buckets[bucket]} for bucket in sorted(self.buckets)
+            ],
+        }
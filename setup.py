@@ -58,7 +58,7 @@ setup(
         "questions_three": ["module_cfg.yml"],
         "questions_three.webdriver_tools.dom_dumper": ["dump_dom.js"],
     },
-    packages=find_packages(exclude=("tests.*", "tests")),
+    packages=find_packages(exclude=("benchmarks", "tests.*", "tests")),
     url="https://github.com/CyberGRX/questions-three",
     version="%d.%d.%d.%d" % (MAJOR_VERSION, MINOR_VERSION, PATCH_VERSION, build_number()),
 )
@@ -11,6 +11,8 @@ from expects import expect, be_empty, contain, equal, have_length
 from twin_sister import open_dependency_context
 
 from questions_three.ci import run_all
+from questions_three.event_broker.event_bus import EVENT_BUS_ADDRESS_ENV_VAR, EventBusServer
+from questions_three.module_cfg.snapshot import SNAPSHOT_ENV_VAR
 from twin_sister.expects_matchers import contain_key_with_value
 
 
@@ -83,6 +85,21 @@ class FakePopenClass:
         return [c["args"][1] for c in self.opened]
 
 
+class FakeEventBusServer:
+    address = "/tmp/bus"
+    last_created = None
+
+    def __init__(self):
+        self.closed = False
+        FakeEventBusServer.last_created = self
+
+    def environment(self):
+        return {EVENT_BUS_ADDRESS_ENV_VAR: self.address}
+
+    def close(self):
+        self.closed = True
+
+
 class TestRunAll(TestCase):
     def setUp(self):
         self.context = open_dependency_context(supply_fs=True, supply_env=True, supply_logging=True)
@@ -241,6 +258,50 @@ class TestRunAll(TestCase):
         expect(opened).to(have_length(1))
         expect(opened[0]["kwargs"]).to(contain_key_with_value("stderr", STDOUT))
 
+    def test_hands_config_snapshot_to_suite(self):
+        path = "things"
+        self.fake_file(os.path.join(path, "thing.py"))
+        run_all(path)
+        env = self.popen_class.opened[0]["kwargs"]["env"]
+        expect(env.keys()).to(contain(SNAPSHOT_ENV_VAR))
+
+    def test_suite_inherits_other_environment_variables(self):
+        self.context.set_env(SPAM="eggs")
+        path = "things"
+        self.fake_file(os.path.join(path, "thing.py"))
+        run_all(path)
+        expect(self.popen_class.opened[0]["kwargs"]["env"]).to(contain_key_with_value("SPAM", "eggs"))
+
+    def test_does_not_hand_snapshot_to_suite_when_disabled(self):
+        self.context.set_env(SHARE_CONFIG_SNAPSHOT_WITH_SUITES="false")
+        path = "things"
+        self.fake_file(os.path.join(path, "thing.py"))
+        run_all(path)
+        expect(self.popen_class.opened[0]["kwargs"]["env"]).to(equal(None))
+
+    def test_does_not_start_event_bus_by_default(self):
+        path = "things"
+        self.fake_file(os.path.join(path, "thing.py"))
+        run_all(path)
+        expect(self.popen_class.opened[0]["kwargs"]["env"].keys()).not_to(contain(EVENT_BUS_ADDRESS_ENV_VAR))
+
+    def test_hands_event_bus_address_to_suite(self):
+        self.context.set_env(FORWARD_SUITE_EVENTS="true")
+        self.context.inject(EventBusServer, FakeEventBusServer)
+        path = "things"
+        self.fake_file(os.path.join(path, "thing.py"))
+        run_all(path)
+        env = self.popen_class.opened[0]["kwargs"]["env"]
+        expect(env).to(contain_key_with_value(EVENT_BUS_ADDRESS_ENV_VAR, FakeEventBusServer.address))
+
+    def test_closes_event_bus_after_suites_finish(self):
+        self.context.set_env(FORWARD_SUITE_EVENTS="true")
+        self.context.inject(EventBusServer, FakeEventBusServer)
+        path = "things"
+        self.fake_file(os.path.join(path, "thing.py"))
+        run_all(path)
+        expect(FakeEventBusServer.last_created.closed).to(equal(True))
+
     def test_outputs_captured_stdout_on_proc_exit(self):
         expected = "Our chief weapons are suprise, blah blah\n"
         unexpected = "wrong!\n"
@@ -0,0 +1,129 @@
+import asyncio
+from unittest import TestCase, main
+
+from expects import expect, contain, equal
+from twin_sister import open_dependency_context
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker, subscribe_event_handlers
+from questions_three.vanilla import format_exception
+
+EVENT = TestEvent.artifact_created
+
+
+class TestApublish(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+        self.received = []
+
+    def tearDown(self):
+        self.context.close()
+        EventBroker.reset()
+
+    def test_calls_plain_subscriber(self):
+        def subscriber(**kwargs):
+            self.received.append(kwargs["artifact"])
+
+        EventBroker.subscribe(event=EVENT, func=subscriber)
+        asyncio.run(EventBroker.apublish(event=EVENT, artifact="spam"))
+        expect(self.received).to(equal(["spam"]))
+
+    def test_awaits_coroutine_subscriber(self):
+        async def subscriber(**kwargs):
+            await asyncio.sleep(0)
+            self.received.append(kwargs["artifact"])
+
+        EventBroker.subscribe(event=EVENT, func=subscriber)
+        asyncio.run(EventBroker.apublish(event=EVENT, artifact="spam"))
+        expect(self.received).to(equal(["spam"]))
+
+    def test_awaits_coroutine_subscribers_concurrently(self):
+        second_started = asyncio.Event()
+
+        async def first(**kwargs):
+            # Would time out if the second subscriber had to wait for us
+            await asyncio.wait_for(second_started.wait(), timeout=1)
+            self.received.append("first")
+
+        async def second(**kwargs):
+            second_started.set()
+            self.received.append("second")
+
+        EventBroker.subscribe(event=EVENT, func=first)
+        EventBroker.subscribe(event=EVENT, func=second)
+        asyncio.run(EventBroker.apublish(event=EVENT))
+        expect(self.received).to(equal(["second", "first"]))
+
+    def test_logs_exception_from_coroutine_subscriber(self):
+        e = RuntimeError("I tried to think but nothing happened")
+
+        async def subscriber(**kwargs):
+            raise e
+
+        EventBroker.subscribe(event=EVENT, func=subscriber)
+        asyncio.run(EventBroker.apublish(event=EVENT))
+        errors = [rec.msg for rec in self.context.logging.stored_records if rec.levelname == "ERROR"]
+        expect(errors).to(contain(format_exception(e)))
+
+    def test_subscriber_sees_suite_name(self):
+        async def subscriber(**kwargs):
+            self.received.append(kwargs.get("suite_name"))
+
+        async def run_suite():
+            await EventBroker.apublish(event=TestEvent.suite_started, suite_name="Spam")
+            await EventBroker.apublish(event=EVENT)
+
+        EventBroker.subscribe(event=EVENT, func=subscriber)
+        asyncio.run(run_suite())
+        expect(self.received).to(equal(["Spam"]))
+
+    def test_publish_runs_coroutine_subscriber_to_completion(self):
+        async def subscriber(**kwargs):
+            await asyncio.sleep(0)
+            self.received.append(kwargs["artifact"])
+
+        EventBroker.subscribe(event=EVENT, func=subscriber)
+        EventBroker.publish(event=EVENT, artifact="spam")
+        expect(self.received).to(equal(["spam"]))
+
+    def test_publish_from_running_loop_schedules_coroutine_subscriber(self):
+        async def subscriber(**kwargs):
+            self.received.append(kwargs["artifact"])
+
+        async def publish():
+            EventBroker.publish(event=EVENT, artifact="spam")
+            await asyncio.sleep(0)
+
+        EventBroker.subscribe(event=EVENT, func=subscriber)
+        asyncio.run(publish())
+        expect(self.received).to(equal(["spam"]))
+
+    def test_runs_non_critical_coroutine_subscriber_on_dispatch_thread(self):
+        self.context.set_env(EVENT_DISPATCH_ASYNC="true")
+
+        async def subscriber(**kwargs):
+            await asyncio.sleep(0)
+            self.received.append(kwargs["artifact"])
+
+        EventBroker.subscribe(event=EVENT, func=subscriber, critical=False)
+        EventBroker.publish(event=EVENT, artifact="spam")
+        EventBroker.flush()
+        expect(self.received).to(equal(["spam"]))
+
+    def test_subscribes_coroutine_event_handlers(self):
+        received = self.received
+
+        class Reporter:
+            async def on_artifact_created(self, artifact, **kwargs):
+                await asyncio.sleep(0)
+                received.append(artifact)
+
+        reporter = Reporter()
+        subscribe_event_handlers(reporter)
+        asyncio.run(EventBroker.apublish(event=EVENT, artifact="spam"))
+        expect(received).to(equal(["spam"]))
+
+
+if "__main__" == __name__:
+    main()
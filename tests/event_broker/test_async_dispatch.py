@@ -0,0 +1,150 @@
+from threading import Event, current_thread
+from unittest import TestCase, main
+
+from expects import expect, be, be_true, equal, have_length
+from twin_sister import open_dependency_context
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker, subscribe_event_handlers
+
+EVENT = "spam"
+
+
+class TestAsyncDispatch(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+        self.context.set_env(EVENT_DISPATCH_ASYNC="true")
+
+    def tearDown(self):
+        EventBroker.reset()
+        self.context.close()
+
+    def test_calls_critical_subscriber_in_publishing_thread(self):
+        threads = []
+
+        def subscriber(**kwargs):
+            threads.append(current_thread())
+
+        EventBroker.subscribe(event=EVENT, func=subscriber)
+        EventBroker.publish(event=EVENT)
+        expect(threads).to(equal([current_thread()]))
+
+    def test_publish_does_not_wait_for_non_critical_subscriber(self):
+        release = Event()
+        finished = Event()
+
+        def subscriber(**kwargs):
+            release.wait(timeout=5)
+            finished.set()
+
+        EventBroker.subscribe(event=EVENT, func=subscriber, critical=False)
+        EventBroker.publish(event=EVENT)
+        expect(finished.is_set()).to(be(False))
+        release.set()
+        EventBroker.flush()
+        expect(finished.is_set()).to(be_true)
+
+    def test_calls_non_critical_subscriber_from_another_thread(self):
+        threads = []
+
+        def subscriber(**kwargs):
+            threads.append(current_thread())
+
+        EventBroker.subscribe(event=EVENT, func=subscriber, critical=False)
+        EventBroker.publish(event=EVENT)
+        EventBroker.flush()
+        expect(threads).to(have_length(1))
+        expect(threads[0]).not_to(be(current_thread()))
+
+    def test_preserves_order_for_each_subscriber(self):
+        received = []
+
+        def subscriber(n, **kwargs):
+            received.append(n)
+
+        EventBroker.subscribe(event=EVENT, func=subscriber, critical=False)
+        for n in range(50):
+            EventBroker.publish(event=EVENT, n=n)
+        EventBroker.flush()
+        expect(received).to(equal(list(range(50))))
+
+    def test_suite_ended_waits_for_earlier_events(self):
+        release = Event()
+        received = []
+
+        def slow(**kwargs):
+            release.wait(timeout=5)
+            received.append(EVENT)
+
+        def on_suite_ended(**kwargs):
+            received.append(TestEvent.suite_ended)
+
+        EventBroker.subscribe(event=EVENT, func=slow, critical=False)
+        EventBroker.subscribe(event=TestEvent.suite_ended, func=on_suite_ended, critical=False)
+        EventBroker.publish(event=EVENT)
+        release.set()
+        EventBroker.publish(event=TestEvent.suite_ended)
+        expect(received).to(equal([EVENT, TestEvent.suite_ended]))
+
+    def test_suite_results_compiled_waits_for_events_it_causes(self):
+        received = []
+
+        def reporter(**kwargs):
+            EventBroker.publish(event=TestEvent.report_created)
+
+        def saver(**kwargs):
+            received.append(TestEvent.report_created)
+
+        EventBroker.subscribe(event=TestEvent.suite_results_compiled, func=reporter, critical=False)
+        EventBroker.subscribe(event=TestEvent.report_created, func=saver, critical=False)
+        EventBroker.publish(event=TestEvent.suite_results_compiled)
+        expect(received).to(equal([TestEvent.report_created]))
+
+    def test_publishing_from_a_subscriber_does_not_wait_on_a_full_queue(self):
+        self.context.set_env(EVENT_DISPATCH_ASYNC="true", EVENT_DISPATCH_QUEUE_SIZE="1")
+        received = []
+
+        def publisher(**kwargs):
+            for n in range(3):
+                EventBroker.publish(event="eggs", n=n)
+
+        def subscriber(n, **kwargs):
+            received.append(n)
+
+        EventBroker.subscribe(event=EVENT, func=publisher, critical=False)
+        EventBroker.subscribe(event="eggs", func=subscriber, critical=False)
+        EventBroker.publish(event=EVENT)
+        EventBroker.flush()
+        expect(received).to(equal([0, 1, 2]))
+
+    def test_calls_non_critical_subscriber_in_publishing_thread_when_disabled(self):
+        self.context.set_env(EVENT_DISPATCH_ASYNC="false")
+        threads = []
+
+        def subscriber(**kwargs):
+            threads.append(current_thread())
+
+        EventBroker.subscribe(event=EVENT, func=subscriber, critical=False)
+        EventBroker.publish(event=EVENT)
+        expect(threads).to(equal([current_thread()]))
+
+    def test_handler_detection_honors_critical_marker(self):
+        threads = []
+
+        class Reporter:
+            event_handlers_are_critical = False
+
+            def on_suite_started(self, **kwargs):
+                threads.append(current_thread())
+
+        reporter = Reporter()
+        subscribe_event_handlers(reporter)
+        EventBroker.publish(event=TestEvent.suite_started)
+        EventBroker.flush()
+        expect(threads).to(have_length(1))
+        expect(threads[0]).not_to(be(current_thread()))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,66 @@
+import gc
+from unittest import TestCase, main
+
+from expects import expect, equal, have_key, have_length
+from twin_sister import open_dependency_context
+
+from questions_three.event_broker import EventBroker
+
+EVENT = "spam"
+
+
+class Subscriber:
+    def __init__(self):
+        self.received = 0
+        EventBroker.subscribe(event=EVENT, func=self.receive)
+
+    def receive(self, **kwargs):
+        self.received += 1
+
+
+class TestDispatchTable(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+
+    def tearDown(self):
+        self.context.close()
+
+    def test_drops_dead_subscriber_when_found(self):
+        survivor = Subscriber()
+        Subscriber()
+        gc.collect()
+        EventBroker.publish(event=EVENT)
+        expect(EventBroker._subscribers[EVENT]).to(have_length(1))
+        expect(survivor.received).to(equal(1))
+
+    def test_forgets_event_when_all_subscribers_are_dead(self):
+        Subscriber()
+        gc.collect()
+        EventBroker.publish(event=EVENT)
+        expect(EventBroker._subscribers).not_to(have_key(EVENT))
+
+    def test_delivers_to_subscriber_added_after_pruning(self):
+        Subscriber()
+        gc.collect()
+        EventBroker.publish(event=EVENT)
+        late = Subscriber()
+        EventBroker.publish(event=EVENT)
+        expect(late.received).to(equal(1))
+
+    def test_picks_up_run_id_change_after_earlier_publish(self):
+        received = []
+
+        def spy(run_id, **kwargs):
+            received.append(run_id)
+
+        EventBroker.subscribe(event=EVENT, func=spy)
+        self.context.set_env(TEST_RUN_ID="first")
+        EventBroker.publish(event=EVENT)
+        self.context.set_env(TEST_RUN_ID="second")
+        EventBroker.publish(event=EVENT)
+        expect(received).to(equal(["first", "second"]))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,104 @@
+from unittest import TestCase, main
+
+from expects import expect, be_a, be_none, contain, equal, have_key
+from twin_sister import open_dependency_context
+from twin_sister.expects_matchers import contain_key_with_value
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.event_broker.event_bus import (
+    EVENT_BUS_ADDRESS_ENV_VAR,
+    EventBusServer,
+    EventForwarder,
+    forwarder_from_environment,
+)
+from questions_three.event_broker.event_serialization import ForwardedException
+from questions_three.vanilla import format_exception
+
+
+class Recorder:
+    def __init__(self, event):
+        self.received = []
+        EventBroker.subscribe(event=event, func=self.receive)
+
+    def receive(self, **kwargs):
+        self.received.append(kwargs)
+
+
+class TestEventBus(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+        self.server = EventBusServer()
+        env = self.server.environment()
+        self.forwarder = EventForwarder(
+            address=env[EVENT_BUS_ADDRESS_ENV_VAR], authkey=bytes.fromhex(env["QUESTIONS_THREE_EVENT_BUS_KEY"])
+        )
+
+    def tearDown(self):
+        EventBroker.reset()
+
+    def deliver(self, event, **kwargs):
+        recorder = Recorder(event)
+        self.forwarder.forward(event=event, **kwargs)
+        self.forwarder.close()
+        self.server.close()
+        return recorder.received
+
+    def test_publishes_forwarded_event(self):
+        received = self.deliver(TestEvent.test_started, test_name="spam", suite_name="eggs")
+        expect(received[0]).to(contain_key_with_value("test_name", "spam"))
+        expect(received[0]).to(contain_key_with_value("suite_name", "eggs"))
+
+    def test_keeps_event_time(self):
+        received = self.deliver(TestEvent.test_started, test_name="spam", event_time="then")
+        expect(received[0]["event_time"]).to(equal("then"))
+
+    def test_uses_own_run_id(self):
+        received = self.deliver(TestEvent.test_started, test_name="spam", run_id="theirs")
+        expect(received[0]["run_id"]).to(equal(EventBroker._run_id))
+
+    def test_adds_entry_script_to_suite_started(self):
+        received = self.deliver(TestEvent.suite_started, suite_name="spam")
+        expect(received[0]).to(have_key("entry_script"))
+
+    def test_stands_in_for_exception(self):
+        class Unimportable(RuntimeError):
+            pass
+
+        try:
+            raise Unimportable("whoops")
+        except Unimportable as e:
+            original = e
+        received = self.deliver(TestEvent.test_erred, test_name="spam", exception=original)
+        forwarded = received[0]["exception"]
+        expect(forwarded).to(be_a(ForwardedException))
+        expect(str(forwarded)).to(equal("whoops"))
+        expect(forwarded.original_type).to(equal(str(Unimportable)))
+        expect(format_exception(forwarded)).to(equal(format_exception(original)))
+
+    def test_sends_representation_of_unpicklable_property(self):
+        received = self.deliver(TestEvent.artifact_created, artifact=lambda: None)
+        expect(received[0]["artifact"]).to(contain("lambda"))
+
+    def test_delivers_events_in_order(self):
+        recorder = Recorder(TestEvent.sample_measured)
+        for n in range(100):
+            self.forwarder.forward(event=TestEvent.sample_measured, n=n)
+        self.forwarder.close()
+        self.server.close()
+        expect([r["n"] for r in recorder.received]).to(equal(list(range(100))))
+
+
+class TestForwarderFromEnvironment(TestCase):
+    def setUp(self):
+        self.context = open_dependency_context(supply_env=True)
+
+    def tearDown(self):
+        self.context.close()
+
+    def test_returns_none_when_no_bus_is_listening(self):
+        expect(forwarder_from_environment()).to(be_none)
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,104 @@
+from threading import Thread
+from unittest import TestCase, main
+
+from expects import expect, equal, have_key, have_length
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker, current_event_context, propagate_event_context
+
+EVENT = "spam"
+
+
+class Recorder:
+    def __init__(self):
+        self.received = []
+        EventBroker.subscribe(event=EVENT, func=self.receive)
+
+    def receive(self, **kwargs):
+        self.received.append(kwargs)
+
+
+class TestEventContext(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+        self.recorder = Recorder()
+
+    def tearDown(self):
+        EventBroker.reset()
+
+    def test_adds_suite_name_after_suite_started(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="Bruce")
+        EventBroker.publish(event=EVENT)
+        expect(self.recorder.received[0]["suite_name"]).to(equal("Bruce"))
+
+    def test_adds_test_name_after_test_started(self):
+        EventBroker.publish(event=TestEvent.test_started, test_name="Sheila")
+        EventBroker.publish(event=EVENT)
+        expect(self.recorder.received[0]["test_name"]).to(equal("Sheila"))
+
+    def test_forgets_test_name_after_test_ended(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="Bruce")
+        EventBroker.publish(event=TestEvent.test_started, test_name="Sheila")
+        EventBroker.publish(event=TestEvent.test_ended, test_name="Sheila")
+        EventBroker.publish(event=EVENT)
+        expect(self.recorder.received[0]).not_to(have_key("test_name"))
+        expect(current_event_context()).to(equal({"suite_name": "Bruce"}))
+
+    def test_forgets_suite_name_after_suite_ended(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="Bruce")
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="Bruce")
+        EventBroker.publish(event=EVENT)
+        expect(self.recorder.received[0]).not_to(have_key("suite_name"))
+
+    def test_explicit_name_takes_precedence(self):
+        EventBroker.publish(event=TestEvent.test_started, test_name="Sheila")
+        EventBroker.publish(event=EVENT, test_name="Michael")
+        expect(self.recorder.received[0]["test_name"]).to(equal("Michael"))
+
+    def test_propagated_function_carries_names_to_worker_thread(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="Bruce")
+        EventBroker.publish(event=TestEvent.test_started, test_name="Sheila")
+        worker = Thread(target=propagate_event_context(lambda: EventBroker.publish(event=EVENT)))
+        worker.start()
+        worker.join()
+        expect(self.recorder.received[0]["suite_name"]).to(equal("Bruce"))
+        expect(self.recorder.received[0]["test_name"]).to(equal("Sheila"))
+
+    def test_worker_thread_test_does_not_leak_into_caller(self):
+        def run_test():
+            EventBroker.publish(event=TestEvent.test_started, test_name="Sheila")
+
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="Bruce")
+        worker = Thread(target=propagate_event_context(run_test))
+        worker.start()
+        worker.join()
+        expect(current_event_context()).to(equal({"suite_name": "Bruce"}))
+
+    def test_reset_clears_names(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="Bruce")
+        EventBroker.reset()
+        expect(current_event_context()).to(equal({}))
+
+
+class TestConcurrentSubscription(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+
+    def test_keeps_every_subscriber_added_in_parallel(self):
+        received = []
+        subscribers = [lambda n=n, **kwargs: received.append(n) for n in range(200)]
+
+        def subscribe(subscriber):
+            EventBroker.subscribe(event=EVENT, func=subscriber)
+
+        threads = [Thread(target=subscribe, args=(s,)) for s in subscribers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        EventBroker.publish(event=EVENT)
+        expect(received).to(have_length(len(subscribers)))
+
+
+if "__main__" == __name__:
+    main()
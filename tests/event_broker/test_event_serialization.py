@@ -0,0 +1,49 @@
+from io import BytesIO
+from unittest import TestCase, main
+
+from expects import expect, be_false, equal
+import requests
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker.event_serialization import pack_event, unpack_event
+
+
+def streamed_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "text/plain"
+    response.raw = BytesIO(body)
+    return response
+
+
+def round_trip(**properties):
+    _, _, unpacked = unpack_event(
+        pack_event(event=TestEvent.http_response_received, event_time=None, properties=properties)
+    )
+    return unpacked
+
+
+class TestEventSerialization(TestCase):
+    def test_leaves_streamed_body_unread(self):
+        response = streamed_response(b"spam" * 1000)
+        round_trip(response=response)
+        expect(response._content_consumed).to(be_false)
+        expect(response.raw.tell()).to(equal(0))
+
+    def test_packs_status_and_headers_of_streamed_response(self):
+        unpacked = round_trip(response=streamed_response(b"spam"))["response"]
+        expect((unpacked.status_code, unpacked.headers["Content-Type"])).to(equal((200, "text/plain")))
+
+    def test_packs_body_that_was_read(self):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"spam"
+        expect(round_trip(response=response)["response"].content).to(equal(b"spam"))
+
+    def test_packs_exception_as_stand_in(self):
+        unpacked = round_trip(exception=RuntimeError("spam"))["exception"]
+        expect(str(unpacked)).to(equal("spam"))
+
+
+if "__main__" == __name__:
+    main()
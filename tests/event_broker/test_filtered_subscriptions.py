@@ -0,0 +1,88 @@
+from unittest import TestCase, main
+
+from expects import expect, be_empty, equal, have_length
+from twin_sister.fakes import FunctionSpy
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+
+EVENT = TestEvent.artifact_created
+
+
+class TestFilteredSubscriptions(TestCase):
+    def tearDown(self):
+        EventBroker.reset()
+
+    def test_calls_subscriber_when_property_matches(self):
+        spy = FunctionSpy()
+        EventBroker.subscribe(event=EVENT, func=spy, where={"artifact_type": "screenshot"})
+        EventBroker.publish(event=EVENT, artifact_type="screenshot")
+        spy.assert_was_called()
+
+    def test_skips_subscriber_when_property_differs(self):
+        spy = FunctionSpy()
+        EventBroker.subscribe(event=EVENT, func=spy, where={"artifact_type": "screenshot"})
+        EventBroker.publish(event=EVENT, artifact_type="http_transcript")
+        expect(spy.call_history).to(be_empty)
+
+    def test_skips_subscriber_when_property_is_absent(self):
+        spy = FunctionSpy()
+        EventBroker.subscribe(event=EVENT, func=spy, where={"artifact_type": "screenshot"})
+        EventBroker.publish(event=EVENT)
+        expect(spy.call_history).to(be_empty)
+
+    def test_requires_every_property_to_match(self):
+        spy = FunctionSpy()
+        EventBroker.subscribe(event=EVENT, func=spy, where={"artifact_type": "screenshot", "suite_name": "Spam"})
+        EventBroker.publish(event=EVENT, artifact_type="screenshot", suite_name="Eggs")
+        expect(spy.call_history).to(be_empty)
+
+    def test_set_matches_any_member(self):
+        spy = FunctionSpy()
+        EventBroker.subscribe(event=EVENT, func=spy, where={"suite_name": {"Spam", "Eggs"}})
+        for name in ("Spam", "Eggs", "Sausage"):
+            EventBroker.publish(event=EVENT, suite_name=name)
+        expect([kwargs["suite_name"] for args, kwargs in spy.call_history]).to(equal(["Spam", "Eggs"]))
+
+    def test_skips_subscriber_when_unhashable_value_is_not_in_set(self):
+        spy = FunctionSpy()
+        EventBroker.subscribe(event=EVENT, func=spy, where={"artifact_type": {"screenshot", "http_transcript"}})
+        EventBroker.publish(event=EVENT, artifact_type=["screenshot"])
+        expect(spy.call_history).to(be_empty)
+
+    def test_unhashable_value_does_not_stop_later_subscribers(self):
+        filtered = FunctionSpy()
+        unfiltered = FunctionSpy()
+        EventBroker.subscribe(event=EVENT, func=filtered, where={"artifact_type": {"screenshot"}})
+        EventBroker.subscribe(event=EVENT, func=unfiltered)
+        EventBroker.publish(event=EVENT, artifact_type={"spam": "eggs"})
+        unfiltered.assert_was_called()
+
+    def test_matches_suite_name_from_event_context(self):
+        spy = FunctionSpy()
+        EventBroker.subscribe(event=EVENT, func=spy, where={"suite_name": "Spam"})
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="Spam")
+        EventBroker.publish(event=EVENT)
+        spy.assert_was_called()
+
+    def test_filter_applies_to_each_of_several_events(self):
+        spy = FunctionSpy()
+        EventBroker.subscribe(
+            events=(TestEvent.test_started, TestEvent.test_ended), func=spy, where={"test_name": "spam"}
+        )
+        for event in (TestEvent.test_started, TestEvent.test_ended):
+            EventBroker.publish(event=event, test_name="spam")
+            EventBroker.publish(event=event, test_name="eggs")
+        expect(spy.call_history).to(have_length(2))
+
+    def test_unfiltered_subscribers_still_receive_everything(self):
+        filtered = FunctionSpy()
+        unfiltered = FunctionSpy()
+        EventBroker.subscribe(event=EVENT, func=filtered, where={"artifact_type": "screenshot"})
+        EventBroker.subscribe(event=EVENT, func=unfiltered)
+        EventBroker.publish(event=EVENT, artifact_type="http_transcript")
+        unfiltered.assert_was_called()
+
+
+if "__main__" == __name__:
+    main()
@@ -42,6 +42,19 @@ class TestRunId(TestCase):
         EventBroker.publish(event=event)
         expect(retrieved).to(equal(conf.test_run_id))
 
+    def test_uses_run_id_given_to_publish(self):
+        event = "spamorama"
+        self.context.set_env(TEST_RUN_ID="configured")
+        retrieved = None
+
+        def spy(*, run_id, **kwargs):
+            nonlocal retrieved
+            retrieved = run_id
+
+        EventBroker.subscribe(event=event, func=spy)
+        EventBroker.publish(event=event, run_id="given")
+        expect(retrieved).to(equal("given"))
+
 
 if "__main__" == __name__:
     main()
@@ -1,10 +1,11 @@
 from unittest import TestCase, main, skip
 
-from expects import expect, raise_error
+from expects import expect, be, equal, have_length, raise_error
 
 from questions_three.constants import TestEvent
 from questions_three.exceptions import UndefinedEvent
 from questions_three.event_broker import EventBroker, subscribe_event_handlers
+from questions_three.event_broker.handler_detection import handler_map_for_class
 
 
 class TestSubscribEventHandlers(TestCase):
@@ -56,6 +57,80 @@ class TestSubscribEventHandlers(TestCase):
         EventBroker.publish(event=TestEvent.test_skipped)
         assert not thing.was_called, "Handler was detected inapproprately"
 
+    def test_subscribes_handler_attached_to_instance(self):
+        class Thing:
+            pass
+
+        calls = []
+        thing = Thing()
+        thing.on_test_skipped = lambda **kwargs: calls.append(kwargs)
+        subscribe_event_handlers(thing)
+        EventBroker.publish(event=TestEvent.test_skipped)
+        expect(calls).to(have_length(1))
+
+    def test_subscribes_each_instance_of_a_class(self):
+        class Thing:
+            def __init__(self):
+                self.was_called = False
+
+            def on_test_skipped(self, **kwargs):
+                self.was_called = True
+
+        things = [Thing(), Thing()]
+        for thing in things:
+            subscribe_event_handlers(thing)
+        EventBroker.publish(event=TestEvent.test_skipped)
+        assert all(thing.was_called for thing in things), "A subscriber was not called"
+
+    def test_works_out_handlers_once_per_class(self):
+        class Thing:
+            def on_test_skipped(self, **kwargs):
+                pass
+
+        subscribe_event_handlers(Thing())
+        expect(handler_map_for_class(Thing)).to(be(handler_map_for_class(Thing)))
+        expect(handler_map_for_class(Thing)).to(equal((("on_test_skipped", TestEvent.test_skipped),)))
+
+    def test_complains_about_unrecognized_handler_for_every_instance(self):
+        class Thing:
+            def on_spam_slung_sluggishly(self, **kwargs):
+                pass
+
+        for _ in range(2):
+            expect(lambda: subscribe_event_handlers(Thing())).to(raise_error(UndefinedEvent))
+
+    def test_hands_streamed_artifact_as_string_by_default(self):
+        thing = ArtifactCollector()
+        subscribe_event_handlers(thing)
+        EventBroker.publish(event=TestEvent.artifact_created, artifact=StreamedArtifact())
+        expect(thing.received).to(equal(["spam and eggs"]))
+
+    def test_hands_streamed_artifact_as_is_to_class_that_opts_in(self):
+        class Streamer(ArtifactCollector):
+            event_handlers_stream_artifacts = True
+
+        thing = Streamer()
+        subscribe_event_handlers(thing)
+        artifact = StreamedArtifact()
+        EventBroker.publish(event=TestEvent.artifact_created, artifact=artifact)
+        expect(thing.received[0]).to(be(artifact))
+
+
+class StreamedArtifact:
+    def write_to(self, f):
+        f.write("spam and eggs")
+
+    def __str__(self):
+        return "spam and eggs"
+
+
+class ArtifactCollector:
+    def __init__(self):
+        self.received = []
+
+    def on_artifact_created(self, artifact, **kwargs):
+        self.received.append(artifact)
+
 
 if "__main__" == __name__:
     main()
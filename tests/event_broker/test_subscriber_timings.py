@@ -0,0 +1,120 @@
+from datetime import datetime
+import json
+from time import sleep
+from unittest import TestCase, main
+
+from expects import expect, be_above, equal, have_length
+from twin_sister import open_dependency_context
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+
+EVENT = "spam"
+
+
+class Subscriber:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        EventBroker.subscribe(event=EVENT, func=self.receive)
+
+    def receive(self, **kwargs):
+        sleep(self.delay)
+
+
+class ArtifactRecorder:
+    def __init__(self):
+        self.received = []
+        EventBroker.subscribe(event=TestEvent.artifact_created, func=self.on_artifact_created)
+
+    def on_artifact_created(self, **kwargs):
+        self.received.append(kwargs)
+
+
+class TestSubscriberTimings(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+        self.context.set_env(EVENT_SUBSCRIBER_TIMING="true")
+
+    def tearDown(self):
+        self.context.close()
+        EventBroker.reset()
+
+    def test_records_nothing_when_disabled(self):
+        self.context.set_env(EVENT_SUBSCRIBER_TIMING="false")
+        subscriber = Subscriber()  # noqa: F841
+        EventBroker.publish(event=EVENT)
+        expect(EventBroker.subscriber_timings()).to(equal([]))
+
+    def test_counts_calls(self):
+        subscriber = Subscriber()  # noqa: F841
+        for _ in range(3):
+            EventBroker.publish(event=EVENT)
+        expect(EventBroker.subscriber_timings()[0]["calls"]).to(equal(3))
+
+    def test_identifies_subscriber_and_event(self):
+        subscriber = Subscriber()  # noqa: F841
+        EventBroker.publish(event=EVENT)
+        timing = EventBroker.subscriber_timings()[0]
+        expect(timing["subscriber"]).to(equal("%s.Subscriber.receive" % __name__))
+        expect(timing["event"]).to(equal(EVENT))
+
+    def test_records_total_and_longest_time(self):
+        subscriber = Subscriber(delay=0.01)
+        EventBroker.publish(event=EVENT)
+        subscriber.delay = 0.03
+        EventBroker.publish(event=EVENT)
+        timing = EventBroker.subscriber_timings()[0]
+        expect(timing["max_seconds"]).to(be_above(0.03))
+        expect(timing["total_seconds"]).to(be_above(0.04))
+
+    def test_puts_most_time_consuming_first(self):
+        fast = Subscriber()  # noqa: F841
+        slow = Subscriber(delay=0.02)  # noqa: F841
+        EventBroker.publish(event=EVENT)
+        expect(EventBroker.subscriber_timings()[0]["max_seconds"]).to(be_above(0.02))
+
+    def test_keeps_timings_when_environment_changes(self):
+        subscriber = Subscriber()  # noqa: F841
+        EventBroker.publish(event=EVENT)
+        self.context.os.environ["SPAM"] = "eggs"
+        EventBroker.publish(event=EVENT)
+        expect(EventBroker.subscriber_timings()[0]["calls"]).to(equal(2))
+
+    def test_publishes_summary_artifact_when_suite_ends(self):
+        subscriber = Subscriber()  # noqa: F841
+        recorder = ArtifactRecorder()
+        EventBroker.publish(event=EVENT)
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="Bruce", event_time=datetime.now())
+        expect(recorder.received).to(have_length(1))
+        artifact = recorder.received[0]
+        expect(artifact["artifact_type"]).to(equal("subscriber_timings"))
+        expect(artifact["suite_name"]).to(equal("Bruce"))
+        expect([t["subscriber"] for t in json.loads(artifact["artifact"])]).to(
+            equal(["%s.Subscriber.receive" % __name__])
+        )
+
+    def test_each_suite_artifact_describes_only_that_suite(self):
+        subscriber = Subscriber()  # noqa: F841
+        recorder = ArtifactRecorder()
+        for suite_name in ("spam", "eggs"):
+            EventBroker.publish(event=EVENT)
+            EventBroker.publish(event=TestEvent.suite_ended, suite_name=suite_name)
+        calls = [[t["calls"] for t in json.loads(a["artifact"]) if t["event"] == EVENT] for a in recorder.received]
+        expect(calls).to(equal([[1], [1]]))
+
+    def test_delivers_artifact_to_async_subscriber_before_suite_ended_returns(self):
+        self.context.set_env(EVENT_DISPATCH_ASYNC="true")
+        received = []
+
+        def on_artifact_created(**kwargs):
+            sleep(0.02)
+            received.append(kwargs["artifact_type"])
+
+        EventBroker.subscribe(event=TestEvent.artifact_created, func=on_artifact_created, critical=False)
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="spam")
+        expect(received).to(equal(["subscriber_timings"]))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,93 @@
+"""
+A stand-in for the session that HttpClient sends requests through,
+  for tests that need more from it than a fake requests module offers
+"""
+
+from threading import Lock, current_thread
+from time import sleep
+from unittest import TestCase
+
+import requests
+from twin_sister import open_dependency_context
+from twin_sister.fakes import EndlessFake
+
+from questions_three.event_broker import EventBroker
+from questions_three.http_client.connection_pool import pooled_session
+
+
+def build_response(status_code=200, text="", headers={}):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = text.encode("utf-8")
+    response.headers.update(headers)
+    return response
+
+
+class FakeTransport:
+    """
+    Records each request and answers it with the next of self.responses,
+      the response in self.responses_by_url for its URL or, failing
+      those, a response whose text is the method and URL
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.in_flight = 0
+        self.most_in_flight = 0
+        # (method, url, kwargs) for each request, in the order sent
+        self.requests = []
+        # The thread that sent each request
+        self.threads = []
+        # Responses to send, in order
+        self.responses = []
+        # URL -> response to send for every request to it
+        self.responses_by_url = {}
+        # Seconds to wait before answering, unless self.delays names the URL
+        self.delay = 0
+        # URL -> seconds to wait before answering
+        self.delays = {}
+        # URL -> status code to answer with (default 200)
+        self.status_codes = {}
+        # If set, each request waits here before it is answered
+        self.barrier = None
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            self.requests.append((method, url, kwargs))
+            self.threads.append(current_thread())
+            self.in_flight += 1
+            self.most_in_flight = max(self.in_flight, self.most_in_flight)
+        if self.barrier is not None:
+            self.barrier.wait(timeout=2)
+        sleep(self.delays.get(url, self.delay))
+        with self.lock:
+            self.in_flight -= 1
+            if self.responses:
+                return self.responses.pop(0)
+        if url in self.responses_by_url:
+            return self.responses_by_url[url]
+        return build_response(self.status_codes.get(url, 200), text="%s %s" % (method, url))
+
+    def get(self, url, **kwargs):
+        return self.request("get", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("post", url, **kwargs)
+
+
+class FakeTransportTestCase(TestCase):
+    """
+    Sends the requests of every HttpClient to self.transport
+    """
+
+    def setUp(self):
+        EventBroker.reset()
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+        self.transport = FakeTransport()
+        self.context.inject(pooled_session, lambda **kwargs: self.transport)
+        # Nothing should reach the network, even without the pool
+        self.context.inject(requests, EndlessFake(pattern_obj=requests))
+
+    def tearDown(self):
+        self.context.close()
+        EventBroker.reset()
@@ -0,0 +1,95 @@
+import asyncio
+from threading import Barrier, current_thread
+from unittest import main
+
+from expects import expect, be_a, contain, equal, raise_error
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.exceptions.http_error import HttpNotFound
+from questions_three.http_client import AsyncHttpClient, HttpClient
+
+from .fake_transport import FakeTransportTestCase, build_response
+
+
+class TestAsyncHttpClient(FakeTransportTestCase):
+    def test_is_an_http_client(self):
+        expect(AsyncHttpClient()).to(be_a(HttpClient))
+
+    def test_returns_response(self):
+        planted = build_response(200, text="spam")
+        self.transport.responses_by_url["http://spam"] = planted
+        expect(asyncio.run(AsyncHttpClient().get("http://spam"))).to(equal(planted))
+
+    def test_sends_request_from_another_thread(self):
+        asyncio.run(AsyncHttpClient().get("http://spam"))
+        expect(self.transport.threads[0]).not_to(equal(current_thread()))
+
+    def test_sends_requests_concurrently(self):
+        # Each request waits until all three have been sent
+        self.transport.barrier = Barrier(3)
+        client = AsyncHttpClient()
+
+        async def fan_out():
+            return await asyncio.gather(*[client.get("http://spam/%d" % n) for n in range(3)])
+
+        responses = asyncio.run(fan_out())
+        expect([r.status_code for r in responses]).to(equal([200, 200, 200]))
+
+    def test_sends_persistent_headers(self):
+        client = AsyncHttpClient()
+        client.set_persistent_headers(spam="eggs")
+        asyncio.run(client.get("http://spam"))
+        method, url, kwargs = self.transport.requests[-1]
+        expect(kwargs["headers"]).to(equal({"spam": "eggs"}))
+
+    def test_follows_redirect(self):
+        self.transport.responses_by_url["http://spam"] = build_response(302, headers={"Location": "http://eggs"})
+        asyncio.run(AsyncHttpClient().get("http://spam"))
+        expect([url for method, url, kwargs in self.transport.requests]).to(equal(["http://spam", "http://eggs"]))
+
+    def test_raises_exception_matching_status_code(self):
+        self.transport.responses_by_url["http://spam"] = build_response(404)
+        expect(lambda: asyncio.run(AsyncHttpClient().get("http://spam"))).to(raise_error(HttpNotFound))
+
+    def test_returns_response_from_callback(self):
+        self.transport.responses_by_url["http://spam"] = build_response(404)
+        planted = build_response(200)
+        client = AsyncHttpClient()
+        client.set_exceptional_response_callback(exception_class=HttpNotFound, callback=lambda exception: planted)
+        expect(asyncio.run(client.get("http://spam"))).to(equal(planted))
+
+    def test_awaits_coroutine_callback(self):
+        self.transport.responses_by_url["http://spam"] = build_response(404)
+        planted = build_response(200)
+
+        async def callback(exception):
+            return planted
+
+        client = AsyncHttpClient()
+        client.set_exceptional_response_callback(exception_class=HttpNotFound, callback=callback)
+        expect(asyncio.run(client.get("http://spam"))).to(equal(planted))
+
+    def test_records_transcript(self):
+        self.transport.responses_by_url["http://spam"] = build_response(200, text="eggs")
+        client = AsyncHttpClient()
+        asyncio.run(client.get("http://spam"))
+        expect(str(client._transcript)).to(contain("GET http://spam"))
+        expect(str(client._transcript)).to(contain("eggs"))
+
+    def test_publishes_request_and_response_events(self):
+        received = []
+
+        async def subscriber(event, **kwargs):
+            received.append((event, kwargs["request_uuid"]))
+
+        EventBroker.subscribe(events=(TestEvent.http_request_sent, TestEvent.http_response_received), func=subscriber)
+        asyncio.run(AsyncHttpClient().get("http://spam"))
+        expect([event for event, uuid in received]).to(
+            equal([TestEvent.http_request_sent, TestEvent.http_response_received])
+        )
+        expect(received[0][1]).to(equal(received[1][1]))
+
+
+if "__main__" == __name__:
+    main()
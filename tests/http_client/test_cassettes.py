@@ -0,0 +1,184 @@
+import os
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import main
+
+from expects import expect, contain, equal, have_length, raise_error
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.exceptions import InvalidConfiguration, UnrecordedRequest
+from questions_three.exceptions.http_error import HttpNotFound
+from questions_three.http_client import HttpClient
+from questions_three.http_client.cassette import CassetteRecorder
+
+from .fake_transport import FakeTransportTestCase, build_response
+
+
+class TestCassettes(FakeTransportTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = mkdtemp()
+        self.addCleanup(rmtree, directory)
+        self.path = os.path.join(directory, "traffic.cassette")
+        self.recorders = []
+
+    def recording_client(self):
+        client = HttpClient()
+        client.record_to(self.path)
+        self.recorders.append(client._recorder)
+        return client
+
+    def record(self, *calls):
+        """
+        Make each call (a function that takes a client) with a recording client
+        """
+        client = self.recording_client()
+        for call in calls:
+            try:
+                call(client)
+            except HttpNotFound:
+                pass
+        for recorder in self.recorders:
+            recorder.close()
+
+    def replaying_client(self):
+        client = HttpClient()
+        client.replay_from(self.path)
+        return client
+
+    def test_replays_recorded_response(self):
+        planted = build_response(text="eggs", headers={"X-Spam": "eggs"})
+        planted.reason = "Spam"
+        self.transport.responses.append(planted)
+        self.record(lambda client: client.get("http://spam"))
+        resp = self.replaying_client().get("http://spam")
+        expect((resp.status_code, resp.reason, resp.text, resp.headers["X-Spam"])).to(
+            equal((200, "Spam", "eggs", "eggs"))
+        )
+
+    def test_recording_returns_response(self):
+        self.transport.responses.append(build_response(text="eggs"))
+        client = self.recording_client()
+        expect(client.get("http://spam").text).to(equal("eggs"))
+        client._recorder.close()
+
+    def test_replay_does_not_send_requests(self):
+        self.record(lambda client: client.get("http://spam"))
+        sent = len(self.transport.requests)
+        self.replaying_client().get("http://spam")
+        expect(self.transport.requests).to(have_length(sent))
+
+    def test_distinguishes_requests_by_method(self):
+        self.record(lambda client: client.get("http://spam"), lambda client: client.post("http://spam"))
+        expect(self.replaying_client().post("http://spam").text).to(equal("post http://spam"))
+
+    def test_distinguishes_requests_by_params(self):
+        self.record(
+            lambda client: client.get("http://spam", params={"n": 1}),
+            lambda client: client.get("http://spam", params={"n": 2}),
+        )
+        resp = self.replaying_client().get("http://spam", params={"n": 2})
+        expect(self.transport.requests[1][2]["params"]).to(equal({"n": 2}))
+        expect(resp.text).to(equal("get http://spam"))
+
+    def test_distinguishes_requests_by_body(self):
+        self.transport.responses.extend([build_response(text="first"), build_response(text="second")])
+        self.record(
+            lambda client: client.post("http://spam", data="one"),
+            lambda client: client.post("http://spam", data="two"),
+        )
+        expect(self.replaying_client().post("http://spam", data="two").text).to(equal("second"))
+
+    def test_replays_repeated_request_in_order_then_repeats_last(self):
+        self.transport.responses.extend([build_response(text="first"), build_response(text="second")])
+        self.record(lambda client: client.get("http://spam"), lambda client: client.get("http://spam"))
+        client = self.replaying_client()
+        expect([client.get("http://spam").text for _ in range(3)]).to(equal(["first", "second", "second"]))
+
+    def test_complains_about_unrecorded_request(self):
+        self.record(lambda client: client.get("http://spam"))
+        client = self.replaying_client()
+        expect(lambda: client.get("http://eggs")).to(raise_error(UnrecordedRequest))
+
+    def test_replayed_error_status_raises_mapped_exception(self):
+        self.transport.responses.append(build_response(status_code=404, text="nope"))
+        self.record(lambda client: client.get("http://spam"))
+        client = self.replaying_client()
+        expect(lambda: client.get("http://spam")).to(raise_error(HttpNotFound, "nope"))
+
+    def test_replay_publishes_events(self):
+        self.record(lambda client: client.get("http://spam"))
+        published = []
+
+        def subscriber(event, **kwargs):
+            published.append(event)
+
+        EventBroker.subscribe(events=[TestEvent.http_request_sent, TestEvent.http_response_received], func=subscriber)
+        self.replaying_client().get("http://spam")
+        expect(published).to(equal([TestEvent.http_request_sent, TestEvent.http_response_received]))
+
+    def test_replay_keeps_transcript(self):
+        self.record(lambda client: client.get("http://spam"))
+        client = self.replaying_client()
+        client.get("http://spam")
+        expect(str(client._transcript)).to(contain("get http://spam"))
+
+    def test_replays_streamed_body(self):
+        self.transport.responses.append(build_response(text="abcdef"))
+        self.record(lambda client: client.get("http://spam"))
+        chunks = list(self.replaying_client().stream("http://spam", chunk_size=4))
+        expect(chunks).to(equal([b"abcd", b"ef"]))
+
+    def test_sends_streamed_request_without_recording_it(self):
+        self.record(lambda client: client.stream("http://spam"))
+        expect(self.transport.requests).to(have_length(1))
+        client = self.replaying_client()
+        expect(lambda: client.get("http://spam")).to(raise_error(UnrecordedRequest))
+
+    def test_streams_when_recording_is_configured(self):
+        self.context.set_env(HTTP_RECORD_CASSETTE=self.path)
+        client = HttpClient()
+        client.stream("http://spam")
+        client._recorder.close()
+        expect(self.transport.requests).to(have_length(1))
+
+    def test_adds_to_existing_cassette(self):
+        # As another process recording to the same file would
+        earlier = CassetteRecorder(self.path)
+        earlier.record("get", "http://eggs", response=build_response(text="eggs"))
+        earlier.close()
+        self.record(lambda client: client.get("http://spam"))
+        client = self.replaying_client()
+        expect((client.get("http://eggs").text, client.get("http://spam").text)).to(equal(("eggs", "get http://spam")))
+
+    def test_clients_share_a_recording(self):
+        first = self.recording_client()
+        second = self.recording_client()
+        first.get("http://spam")
+        second.get("http://eggs")
+        first._recorder.close()
+        client = self.replaying_client()
+        expect(client.get("http://eggs").text).to(equal("get http://eggs"))
+
+    def test_records_when_configured(self):
+        self.context.set_env(HTTP_RECORD_CASSETTE=self.path)
+        client = HttpClient()
+        client.get("http://spam")
+        client._recorder.close()
+        expect(self.replaying_client().get("http://spam").text).to(equal("get http://spam"))
+
+    def test_replays_when_configured(self):
+        self.record(lambda client: client.get("http://spam"))
+        self.context.set_env(HTTP_REPLAY_CASSETTE=self.path)
+        sent = len(self.transport.requests)
+        HttpClient().get("http://spam")
+        expect(self.transport.requests).to(have_length(sent))
+
+    def test_refuses_to_record_and_replay_at_once(self):
+        self.context.set_env(HTTP_RECORD_CASSETTE=self.path, HTTP_REPLAY_CASSETTE=self.path)
+        expect(HttpClient).to(raise_error(InvalidConfiguration))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,89 @@
+from http.client import HTTPMessage
+from unittest import TestCase, main
+
+from expects import expect, be, be_empty, equal
+import requests
+from requests.cookies import MockRequest, MockResponse
+from twin_sister import open_dependency_context
+from twin_sister.fakes import EndlessFake, FunctionSpy
+
+from questions_three.http_client import HttpClient
+from questions_three.http_client.connection_pool import pooled_session
+
+
+class TestHttpClientKeepAlive(TestCase):
+    def setUp(self):
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+        self.pool_spy = FunctionSpy(return_value=EndlessFake())
+        self.context.inject(pooled_session, self.pool_spy)
+        self.requests_stub = EndlessFake(pattern_obj=requests)
+        self.context.inject(requests, self.requests_stub)
+
+    def tearDown(self):
+        self.context.close()
+
+    def test_sends_plain_request_through_pooled_session_by_default(self):
+        session = EndlessFake()
+        session.get = FunctionSpy(return_value=EndlessFake())
+        self.context.inject(pooled_session, lambda **kwargs: session)
+        HttpClient().get("http://spam")
+        session.get.assert_was_called()
+
+    def test_asks_for_configured_number_of_hosts(self):
+        self.context.set_env(HTTP_CLIENT_POOL_HOSTS="3")
+        HttpClient().get("http://spam")
+        expect(self.pool_spy["hosts"]).to(equal(3))
+
+    def test_asks_for_configured_connections_per_host(self):
+        self.context.set_env(HTTP_CLIENT_POOL_CONNECTIONS_PER_HOST="7")
+        HttpClient().get("http://spam")
+        expect(self.pool_spy["connections_per_host"]).to(equal(7))
+
+    def test_opens_new_connection_for_each_request_when_keep_alive_disabled(self):
+        self.context.set_env(HTTP_CLIENT_KEEP_ALIVE="false")
+        get_spy = FunctionSpy(return_value=EndlessFake())
+        self.requests_stub.get = get_spy
+        HttpClient().get("http://spam")
+        get_spy.assert_was_called()
+        expect(self.pool_spy.call_history).to(be_empty)
+
+    def test_does_not_use_pool_when_cookies_enabled(self):
+        self.requests_stub.Session = lambda: EndlessFake()
+        client = HttpClient()
+        client.enable_cookies()
+        client.get("http://spam")
+        expect(self.pool_spy.call_history).to(be_empty)
+
+
+class TestPooledSession(TestCase):
+    def test_returns_same_session_for_same_pool_size(self):
+        expect(pooled_session(hosts=2, connections_per_host=4)).to(be(pooled_session(hosts=2, connections_per_host=4)))
+
+    def test_returns_different_session_for_different_pool_size(self):
+        expect(pooled_session(hosts=2, connections_per_host=4)).not_to(
+            be(pooled_session(hosts=2, connections_per_host=5))
+        )
+
+    def test_keeps_configured_number_of_connections_per_host(self):
+        session = pooled_session(hosts=2, connections_per_host=6)
+        for url in ("http://spam", "https://spam"):
+            expect(session.get_adapter(url).poolmanager.connection_pool_kw["maxsize"]).to(equal(6))
+
+    def test_sends_through_stand_in_for_requests(self):
+        requests_stub = EndlessFake()
+        context = open_dependency_context()
+        self.addCleanup(context.close)
+        context.inject(requests, requests_stub)
+        expect(pooled_session(hosts=2, connections_per_host=4)).to(be(requests_stub))
+
+    def test_does_not_store_cookies(self):
+        session = pooled_session(hosts=2, connections_per_host=3)
+        headers = HTTPMessage()
+        headers["Set-Cookie"] = "spam=eggs"
+        request = requests.Request("GET", "http://spam.example.com/").prepare()
+        session.cookies.extract_cookies(MockResponse(headers), MockRequest(request))
+        expect(list(session.cookies)).to(be_empty)
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,63 @@
+from logging import StreamHandler
+from unittest import TestCase, main
+
+from expects import expect, contain, equal
+import requests
+from twin_sister import open_dependency_context
+from twin_sister.fakes import EndlessFake
+
+from questions_three.http_client import HttpClient
+
+
+class FakeResponse(EndlessFake):
+    def __init__(self):
+        super().__init__()
+        self.status_code = 200
+        self.headers = {"Content-type": "text/plain"}
+        self.text_reads = 0
+
+    @property
+    def text(self):
+        self.text_reads += 1
+        return "Lovely spam!  Wonderful spam!"
+
+
+class SpyHandler(StreamHandler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+class TestDebugLogging(TestCase):
+    def setUp(self):
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+        self.spy = SpyHandler()
+        self.context.logging.StreamHandler = lambda *args, **kwargs: self.spy
+        self.response = FakeResponse()
+        requests_stub = EndlessFake()
+        requests_stub.get = lambda *args, **kwargs: self.response
+        self.context.inject(requests, requests_stub)
+
+    def tearDown(self):
+        self.context.close()
+
+    def test_does_not_decode_body_when_debug_disabled(self):
+        HttpClient().get("http://spam.io")
+        expect(self.response.text_reads).to(equal(0))
+
+    def test_logs_body_when_debug_enabled(self):
+        self.context.set_env(QUESTIONS_THREE_HTTP_CLIENT_LOG_LEVEL="DEBUG")
+        HttpClient().get("http://spam.io")
+        expect("\n".join(self.spy.messages)).to(contain("Wonderful spam!"))
+
+    def test_logs_response_headers_when_debug_enabled(self):
+        self.context.set_env(QUESTIONS_THREE_HTTP_CLIENT_LOG_LEVEL="DEBUG")
+        HttpClient().get("http://spam.io")
+        expect("\n".join(self.spy.messages)).to(contain("Content-type"))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,111 @@
+from time import sleep
+from unittest import TestCase, main
+from uuid import uuid4
+
+from expects import expect, be, be_a, be_above, be_below, be_none, contain, equal
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.http_client import HttpClient
+from questions_three.http_client.host_throttle import HostThrottle, TokenBucket, host_throttle
+
+from .fake_transport import FakeTransportTestCase
+
+
+class TestTokenBucket(TestCase):
+    def test_allows_burst_without_waiting(self):
+        bucket = TokenBucket(rate=1, burst=3)
+        expect([bucket.reserve() for _ in range(3)]).to(equal([0.0, 0.0, 0.0]))
+
+    def test_spaces_requests_beyond_burst_evenly(self):
+        bucket = TokenBucket(rate=10, burst=1)
+        bucket.reserve()
+        delays = [bucket.reserve() for _ in range(3)]
+        for n, delay in enumerate(delays, start=1):
+            expect(delay).to(be_above(n / 10 - 0.01))
+            expect(delay).to(be_below(n / 10 + 0.001))
+
+    def test_refills_over_time(self):
+        bucket = TokenBucket(rate=100, burst=1)
+        bucket.reserve()
+        sleep(0.02)
+        expect(bucket.reserve()).to(equal(0.0))
+
+
+class TestHostThrottleFunction(TestCase):
+    def test_returns_none_without_limits(self):
+        expect(host_throttle("http://spam")).to(be_none)
+
+    def test_shares_throttle_for_same_host(self):
+        expect(host_throttle("http://spam/1", max_concurrent=2)).to(
+            be(host_throttle("HTTP://SPAM/2", max_concurrent=2))
+        )
+
+    def test_separates_hosts(self):
+        expect(host_throttle("http://spam", max_concurrent=2)).not_to(
+            be(host_throttle("http://eggs", max_concurrent=2))
+        )
+
+    def test_builds_throttle(self):
+        expect(host_throttle("http://spam", requests_per_second=5)).to(be_a(HostThrottle))
+
+
+class TestHttpClientThrottling(FakeTransportTestCase):
+    def setUp(self):
+        super().setUp()
+        self.published = []
+        EventBroker.subscribe(event=TestEvent.http_response_received, func=self.subscriber)
+        # Throttles are shared by host, so give each test its own
+        self.url = "http://%s" % uuid4()
+
+    def subscriber(self, **kwargs):
+        self.published.append(kwargs)
+
+    def test_throttle_timing_is_none_without_limits(self):
+        HttpClient().get(self.url)
+        expect(self.published[0]["request_timings"]["throttle"]).to(be_none)
+
+    def test_paces_requests_to_rate(self):
+        self.context.set_env(HTTP_CLIENT_REQUESTS_PER_SECOND_PER_HOST="50")
+        client = HttpClient()
+        for _ in range(3):
+            client.get(self.url)
+        waits = [p["request_timings"]["throttle"] for p in self.published]
+        expect(waits[0]).to(be_below(0.01))
+        expect(waits[2]).to(be_above(0.015))
+
+    def test_limits_apply_per_host(self):
+        self.context.set_env(HTTP_CLIENT_REQUESTS_PER_SECOND_PER_HOST="1")
+        client = HttpClient()
+        client.get(self.url + "/spam")
+        client.get("http://%s" % uuid4())
+        expect(self.published[1]["request_timings"]["throttle"]).to(be_below(0.01))
+
+    def test_allows_burst(self):
+        self.context.set_env(HTTP_CLIENT_REQUESTS_PER_SECOND_PER_HOST="1", HTTP_CLIENT_BURST_PER_HOST="3")
+        client = HttpClient()
+        for _ in range(3):
+            client.get(self.url)
+        expect(max(p["request_timings"]["throttle"] for p in self.published)).to(be_below(0.01))
+
+    def test_caps_requests_in_flight(self):
+        self.context.set_env(HTTP_CLIENT_MAX_CONCURRENT_REQUESTS_PER_HOST="2")
+        self.transport.delay = 0.02
+        HttpClient().map(["%s/%d" % (self.url, n) for n in range(6)], max_workers=6)
+        expect(self.transport.most_in_flight).to(equal(2))
+
+    def test_reports_time_waiting_for_a_slot(self):
+        self.context.set_env(HTTP_CLIENT_MAX_CONCURRENT_REQUESTS_PER_HOST="1")
+        self.transport.delay = 0.02
+        HttpClient().map([self.url, self.url], max_workers=2)
+        expect(max(p["request_timings"]["throttle"] for p in self.published)).to(be_above(0.015))
+
+    def test_transcript_shows_throttle_time(self):
+        self.context.set_env(HTTP_CLIENT_MAX_CONCURRENT_REQUESTS_PER_HOST="1")
+        client = HttpClient()
+        client.get(self.url)
+        expect(str(client._transcript)).to(contain("throttle "))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,104 @@
+from threading import Barrier
+from unittest import main
+
+from expects import expect, be_a, contain, equal, have_length, raise_error
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.exceptions.http_error import HttpNotFound
+from questions_three.http_client import HttpClient
+
+from .fake_transport import FakeTransportTestCase
+
+
+class TestMap(FakeTransportTestCase):
+    def test_returns_responses_in_input_order(self):
+        urls = ["http://spam/%d" % n for n in range(4)]
+        # The first request finishes last
+        for n, url in enumerate(urls):
+            self.transport.delays[url] = 0.04 - 0.01 * n
+        responses = HttpClient().map(urls, max_workers=4)
+        expect([r.text for r in responses]).to(equal(["get " + url for url in urls]))
+
+    def test_gets_url(self):
+        HttpClient().map(["http://spam"])
+        method, url, kwargs = self.transport.requests[0]
+        expect((method, url)).to(equal(("get", "http://spam")))
+
+    def test_sends_request_described_by_dict(self):
+        HttpClient().map([{"method": "post", "url": "http://spam", "data": "eggs"}])
+        method, url, kwargs = self.transport.requests[0]
+        expect((method, url, kwargs["data"])).to(equal(("post", "http://spam", "eggs")))
+
+    def test_accepts_method_in_upper_case(self):
+        results = HttpClient().map([{"method": "POST", "url": "http://spam"}], return_exceptions=True)
+        expect(results[0].text).to(equal("post http://spam"))
+        method, url, kwargs = self.transport.requests[0]
+        expect(method).to(equal("post"))
+
+    def test_sends_requests_concurrently(self):
+        # Each request waits until all three have been sent
+        self.transport.barrier = Barrier(3)
+        responses = HttpClient().map(["http://spam/%d" % n for n in range(3)], max_workers=3)
+        expect([r.status_code for r in responses]).to(equal([200, 200, 200]))
+
+    def test_waits_for_at_most_max_workers_responses_at_once(self):
+        for n in range(6):
+            self.transport.delays["http://spam/%d" % n] = 0.01
+        HttpClient().map(["http://spam/%d" % n for n in range(6)], max_workers=2)
+        expect(self.transport.most_in_flight).to(equal(2))
+
+    def test_raises_exception_matching_status_code(self):
+        self.transport.status_codes["http://spam/1"] = 404
+        expect(lambda: HttpClient().map(["http://spam/0", "http://spam/1"])).to(raise_error(HttpNotFound))
+
+    def test_finishes_every_request_before_raising(self):
+        self.transport.status_codes["http://spam/0"] = 404
+        try:
+            HttpClient().map(["http://spam/%d" % n for n in range(3)])
+        except HttpNotFound:
+            pass
+        expect(self.transport.requests).to(have_length(3))
+
+    def test_puts_exception_in_place_of_response_when_asked(self):
+        self.transport.status_codes["http://spam/1"] = 404
+        results = HttpClient().map(["http://spam/%d" % n for n in range(3)], return_exceptions=True)
+        expect(results[1]).to(be_a(HttpNotFound))
+        expect([results[0].text, results[2].text]).to(equal(["get http://spam/0", "get http://spam/2"]))
+
+    def test_publishes_events_for_each_request(self):
+        sent = {}
+        received = {}
+
+        def on_sent(request_uuid, request_url, **kwargs):
+            sent[request_uuid] = "get " + request_url
+
+        def on_received(request_uuid, response, **kwargs):
+            received[request_uuid] = response.text
+
+        EventBroker.subscribe(event=TestEvent.http_request_sent, func=on_sent)
+        EventBroker.subscribe(event=TestEvent.http_response_received, func=on_received)
+        HttpClient().map(["http://spam/%d" % n for n in range(3)])
+        expect(received).to(equal(sent))
+
+    def test_events_carry_test_name(self):
+        names = []
+
+        def on_sent(test_name=None, **kwargs):
+            names.append(test_name)
+
+        EventBroker.subscribe(event=TestEvent.http_request_sent, func=on_sent)
+        EventBroker.publish(event=TestEvent.test_started, test_name="spam")
+        HttpClient().map(["http://spam/%d" % n for n in range(2)])
+        expect(names).to(equal(["spam", "spam"]))
+
+    def test_transcript_names_request_for_each_response(self):
+        client = HttpClient()
+        client.map(["http://spam/%d" % n for n in range(2)])
+        transcript = str(client._transcript)
+        for n in range(2):
+            expect(transcript).to(contain("to GET http://spam/%d in " % n))
+
+
+if "__main__" == __name__:
+    main()
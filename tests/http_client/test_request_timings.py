@@ -0,0 +1,124 @@
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest import TestCase, main
+
+from expects import expect, be_above, be_below, be_none, contain, equal
+import requests
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.http_client import HttpClient
+from questions_three.http_client.request_timings import TimedHTTPAdapter, describe_timings, send_timed
+
+from .fake_transport import FakeTransportTestCase, build_response
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRequestTimings(FakeTransportTestCase):
+    def setUp(self):
+        super().setUp()
+        self.published = []
+        EventBroker.subscribe(event=TestEvent.http_response_received, func=self.subscriber)
+
+    def serve_after(self, first_byte):
+        response = build_response()
+        response.elapsed = first_byte
+        self.transport.responses.append(response)
+
+    def subscriber(self, **kwargs):
+        self.published.append(kwargs)
+
+    def test_publishes_total_time(self):
+        self.transport.delay = 0.02
+        HttpClient().get("http://spam")
+        expect(self.published[0]["request_timings"]["total"]).to(be_above(0.019))
+
+    def test_publishes_time_to_first_byte_from_response(self):
+        self.serve_after(timedelta(milliseconds=12))
+        HttpClient().get("http://spam")
+        expect(self.published[0]["request_timings"]["first_byte"]).to(equal(0.012))
+
+    def test_connect_time_is_unknown_without_timed_adapter(self):
+        HttpClient().get("http://spam")
+        expect(self.published[0]["request_timings"]["connect"]).to(be_none)
+
+    def test_publishes_time_spent_waiting_for_a_worker(self):
+        self.transport.delay = 0.02
+        HttpClient().map(["http://spam/1", "http://spam/2"], max_workers=1)
+        queued = max(p["request_timings"]["queue"] for p in self.published)
+        expect(queued).to(be_above(0.019))
+
+    def test_publishes_method_and_url(self):
+        HttpClient().get("http://spam")
+        expect((self.published[0]["http_method"], self.published[0]["request_url"])).to(equal(("GET", "http://spam")))
+
+    def test_cache_hit_has_no_timings(self):
+        self.transport.responses_by_url["http://spam"] = build_response(headers={"Cache-Control": "max-age=60"})
+        client = HttpClient()
+        client.enable_cache()
+        client.get("http://spam")
+        client.get("http://spam")
+        expect(self.published[1].keys()).not_to(contain("request_timings"))
+
+    def test_transcript_shows_timings(self):
+        self.serve_after(timedelta(milliseconds=12))
+        client = HttpClient()
+        client.get("http://spam")
+        expect(str(client._transcript)).to(contain("first byte 12.0 ms)"))
+
+
+class TestTimedHTTPAdapter(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+        self.url = "http://127.0.0.1:%d/" % self.server.server_address[1]
+        self.session = requests.Session()
+        self.session.mount("http://", TimedHTTPAdapter())
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def send(self):
+        resp, timings = send_timed(lambda: self.session.get(self.url), queued_at=0)
+        return timings
+
+    def test_measures_new_connection(self):
+        expect(self.send()["connect"]).to(be_above(0))
+
+    def test_reports_no_connect_time_for_reused_connection(self):
+        self.send()
+        expect(self.send()["connect"]).to(equal(0))
+
+    def test_connect_time_is_part_of_total(self):
+        timings = self.send()
+        expect(timings["connect"]).to(be_below(timings["total"]))
+
+
+class TestDescribeTimings(TestCase):
+    def test_shows_throttle_time(self):
+        expect(
+            describe_timings({"queue": 0.0, "throttle": 0.1, "connect": None, "first_byte": 0.02, "total": 0.025})
+        ).to(equal("in 25.0 ms (queue 0.0 ms, throttle 100.0 ms, first byte 20.0 ms)"))
+
+    def test_omits_unknown_timings(self):
+        expect(describe_timings({"queue": 0.001, "connect": None, "first_byte": 0.02, "total": 0.025})).to(
+            equal("in 25.0 ms (queue 1.0 ms, first byte 20.0 ms)")
+        )
+
+
+if "__main__" == __name__:
+    main()
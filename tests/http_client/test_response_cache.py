@@ -0,0 +1,318 @@
+from datetime import datetime, timedelta
+import json
+import os
+import pickle
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase, main
+
+from expects import expect, contain, equal, have_length
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.http_client import HttpClient
+from questions_three.http_client.response_cache import ResponseCache
+
+from .fake_transport import FakeTransportTestCase, build_response
+
+
+class FakeClock:
+    def __init__(self):
+        self.current = datetime(2020, 1, 1)
+
+    def now(self):
+        return self.current
+
+    def advance(self, seconds):
+        self.current += timedelta(seconds=seconds)
+
+
+class TestResponseCache(FakeTransportTestCase):
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeClock()
+        self.context.inject(datetime, self.clock)
+
+    def build_client(self):
+        client = HttpClient()
+        client.enable_cache()
+        return client
+
+    def serve(self, *responses):
+        self.transport.responses.extend(responses)
+
+    def sent_headers(self, n):
+        method, url, kwargs = self.transport.requests[n]
+        return kwargs["headers"]
+
+    def test_caching_is_disabled_by_default(self):
+        self.serve(build_response(text="a", headers={"Cache-Control": "max-age=60"}))
+        client = HttpClient()
+        client.get("http://spam")
+        client.get("http://spam")
+        expect(self.transport.requests).to(have_length(2))
+
+    def test_reuses_fresh_response_without_sending_request(self):
+        self.serve(build_response(text="spam", headers={"Cache-Control": "max-age=60"}))
+        client = self.build_client()
+        client.get("http://spam")
+        self.clock.advance(59)
+        resp = client.get("http://spam")
+        expect(self.transport.requests).to(have_length(1))
+        expect(resp.text).to(equal("spam"))
+
+    def test_sends_request_after_max_age(self):
+        self.serve(build_response(headers={"Cache-Control": "max-age=60"}))
+        client = self.build_client()
+        client.get("http://spam")
+        self.clock.advance(60)
+        client.get("http://spam")
+        expect(self.transport.requests).to(have_length(2))
+
+    def test_honors_expires(self):
+        self.serve(
+            build_response(
+                headers={"Date": "Wed, 01 Jan 2020 00:00:00 GMT", "Expires": "Wed, 01 Jan 2020 00:00:30 GMT"}
+            )
+        )
+        client = self.build_client()
+        client.get("http://spam")
+        self.clock.advance(29)
+        client.get("http://spam")
+        expect(self.transport.requests).to(have_length(1))
+
+    def test_revalidates_with_etag(self):
+        self.serve(build_response(headers={"ETag": '"v1"'}))
+        client = self.build_client()
+        client.get("http://spam")
+        client.get("http://spam")
+        expect(self.sent_headers(1)["If-None-Match"]).to(equal('"v1"'))
+
+    def test_revalidates_with_last_modified(self):
+        modified = "Tue, 31 Dec 2019 00:00:00 GMT"
+        self.serve(build_response(headers={"Last-Modified": modified}))
+        client = self.build_client()
+        client.get("http://spam")
+        client.get("http://spam")
+        expect(self.sent_headers(1)["If-Modified-Since"]).to(equal(modified))
+
+    def test_returns_cached_body_when_not_modified(self):
+        self.serve(build_response(text="spam", headers={"ETag": '"v1"'}), build_response(status_code=304))
+        client = self.build_client()
+        client.get("http://spam")
+        resp = client.get("http://spam")
+        expect((resp.status_code, resp.text)).to(equal((200, "spam")))
+
+    def test_not_modified_response_refreshes_freshness(self):
+        self.serve(
+            build_response(headers={"ETag": '"v1"', "Cache-Control": "max-age=10"}),
+            build_response(status_code=304, headers={"Cache-Control": "max-age=60"}),
+        )
+        client = self.build_client()
+        client.get("http://spam")
+        self.clock.advance(10)
+        client.get("http://spam")
+        self.clock.advance(30)
+        client.get("http://spam")
+        expect(self.transport.requests).to(have_length(2))
+
+    def test_replaces_cached_response_when_modified(self):
+        self.serve(build_response(text="old", headers={"ETag": '"v1"'}), build_response(text="new"))
+        client = self.build_client()
+        client.get("http://spam")
+        expect(client.get("http://spam").text).to(equal("new"))
+
+    def test_does_not_add_validators_to_callers_own_conditions(self):
+        self.serve(build_response(headers={"ETag": '"v1"'}))
+        client = self.build_client()
+        client.get("http://spam")
+        client.get("http://spam", headers={"If-None-Match": '"v0"'})
+        expect(self.sent_headers(1)["If-None-Match"]).to(equal('"v0"'))
+
+    def test_does_not_store_no_store_response(self):
+        self.serve(build_response(headers={"Cache-Control": "no-store, max-age=60"}))
+        client = self.build_client()
+        client.get("http://spam")
+        client.get("http://spam")
+        expect(self.transport.requests).to(have_length(2))
+
+    def test_does_not_store_response_without_freshness_or_validators(self):
+        client = self.build_client()
+        client.get("http://spam")
+        client.get("http://spam")
+        expect(self.transport.requests).to(have_length(2))
+
+    def test_does_not_store_error_response(self):
+        self.serve(build_response(status_code=404, headers={"Cache-Control": "max-age=60"}))
+        client = self.build_client()
+        try:
+            client.get("http://spam")
+        except Exception:
+            pass
+        client.get("http://spam")
+        expect(self.transport.requests).to(have_length(2))
+
+    def test_keeps_responses_apart_by_params(self):
+        self.serve(
+            build_response(text="1", headers={"Cache-Control": "max-age=60"}),
+            build_response(text="2", headers={"Cache-Control": "max-age=60"}),
+        )
+        client = self.build_client()
+        client.get("http://spam", params={"n": 1})
+        expect(client.get("http://spam", params={"n": 2}).text).to(equal("2"))
+
+    def test_honors_vary(self):
+        for n in range(2):
+            self.serve(build_response(headers={"Cache-Control": "max-age=60", "Vary": "Accept"}))
+        client = self.build_client()
+        client.get("http://spam", headers={"Accept": "text/html"})
+        client.get("http://spam", headers={"Accept": "application/json"})
+        client.get("http://spam", headers={"Accept": "application/json"})
+        expect(self.transport.requests).to(have_length(2))
+
+    def test_discards_least_recently_used_response_beyond_budget(self):
+        self.context.set_env(HTTP_CACHE_MAX_BYTES="10")
+        for n in range(3):
+            self.serve(build_response(text="%04d" % n, headers={"Cache-Control": "max-age=60"}))
+        client = self.build_client()
+        for n in range(3):
+            client.get("http://spam/%d" % n)
+        client.get("http://spam/0")
+        expect(self.transport.requests).to(have_length(4))
+        client.get("http://spam/2")
+        expect(self.transport.requests).to(have_length(4))
+
+    def test_does_not_cache_post(self):
+        self.serve(build_response(headers={"Cache-Control": "max-age=60"}))
+        client = self.build_client()
+        client.post("http://spam")
+        client.post("http://spam")
+        expect(self.transport.requests).to(have_length(2))
+
+    def test_shares_responses_through_directory(self):
+        directory = mkdtemp()
+        self.addCleanup(rmtree, directory)
+        self.context.set_env(HTTP_CACHE_DIRECTORY=directory)
+        self.serve(build_response(text="spam", headers={"Cache-Control": "max-age=60"}))
+        self.build_client().get("http://spam")
+        resp = self.build_client().get("http://spam")
+        expect(self.transport.requests).to(have_length(1))
+        expect(resp.text).to(equal("spam"))
+
+    def use_directory(self):
+        directory = mkdtemp()
+        self.addCleanup(rmtree, directory)
+        self.context.set_env(HTTP_CACHE_DIRECTORY=directory)
+        return directory
+
+    def test_keeps_users_apart(self):
+        self.use_directory()
+        self.serve(
+            build_response(text="secret for alice", headers={"Cache-Control": "max-age=60"}),
+            build_response(text="secret for bob", headers={"Cache-Control": "max-age=60"}),
+        )
+        alice = self.build_client()
+        alice.set_persistent_headers(Authorization="alice")
+        alice.get("http://spam")
+        bob = self.build_client()
+        bob.set_persistent_headers(Authorization="bob")
+        expect(bob.get("http://spam").text).to(equal("secret for bob"))
+
+    def test_does_not_cache_request_with_cookie_header(self):
+        self.serve(build_response(headers={"Cache-Control": "max-age=60"}))
+        client = self.build_client()
+        client.get("http://spam", headers={"Cookie": "spam=eggs"})
+        client.get("http://spam", headers={"Cookie": "spam=eggs"})
+        expect(self.transport.requests).to(have_length(2))
+
+    def test_does_not_cache_when_cookies_are_enabled(self):
+        sent = []
+
+        def send(request, **kwargs):
+            sent.append(request)
+            return build_response(headers={"Cache-Control": "max-age=60"})
+
+        client = self.build_client()
+        client.enable_cookies()
+        client._session.send = send
+        client.get("http://spam")
+        client.get("http://spam")
+        expect(sent).to(have_length(2))
+
+    def test_does_not_share_private_response_through_directory(self):
+        directory = self.use_directory()
+        self.serve(build_response(headers={"Cache-Control": "private, max-age=60"}))
+        client = self.build_client()
+        client.get("http://spam")
+        client.get("http://spam")
+        expect(self.transport.requests).to(have_length(1))
+        expect(os.listdir(directory)).to(equal([]))
+
+    def test_writes_directory_entries_as_json(self):
+        directory = self.use_directory()
+        self.serve(build_response(text="spam", headers={"Cache-Control": "max-age=60"}))
+        self.build_client().get("http://spam")
+        (filename,) = os.listdir(directory)
+        with open(os.path.join(directory, filename), "r") as f:
+            expect(json.load(f)["key"]).to(equal("http://spam"))
+
+    def test_ignores_pickled_directory_entry(self):
+        directory = self.use_directory()
+        self.serve(build_response(text="spam", headers={"Cache-Control": "max-age=60"}))
+        self.build_client().get("http://spam")
+        (filename,) = os.listdir(directory)
+        with open(os.path.join(directory, filename), "wb") as f:
+            pickle.dump(("http://spam", build_response(text="eggs"), datetime(2020, 1, 1), {}), f)
+        self.build_client().get("http://spam")
+        expect(self.transport.requests).to(have_length(2))
+
+    def test_publishes_cache_status(self):
+        statuses = []
+
+        def subscriber(cache_status=None, **kwargs):
+            statuses.append(cache_status)
+
+        EventBroker.subscribe(event=TestEvent.http_response_received, func=subscriber)
+        self.serve(
+            build_response(headers={"ETag": '"v1"', "Cache-Control": "max-age=60"}), build_response(status_code=304)
+        )
+        client = self.build_client()
+        client.get("http://spam")
+        client.get("http://spam")
+        self.clock.advance(60)
+        client.get("http://spam")
+        expect(statuses).to(equal(["miss", "hit", "revalidated"]))
+
+    def test_omits_cache_status_when_cache_disabled(self):
+        published = {}
+
+        def subscriber(**kwargs):
+            published.update(kwargs)
+
+        EventBroker.subscribe(event=TestEvent.http_response_received, func=subscriber)
+        HttpClient().get("http://spam")
+        expect(published.keys()).not_to(contain("cache_status"))
+
+    def test_marks_cache_hit_in_transcript(self):
+        self.serve(build_response(headers={"Cache-Control": "max-age=60"}))
+        client = self.build_client()
+        client.get("http://spam")
+        client.get("http://spam")
+        expect(str(client._transcript)).to(contain("to GET http://spam (from cache)"))
+
+
+class TestKeys(TestCase):
+    def test_refuses_request_with_credentials(self):
+        expect(ResponseCache.key_for("http://spam", {"auth": ("a", "b")})).to(equal(None))
+
+    def test_refuses_request_with_authorization_header(self):
+        expect(ResponseCache.key_for("http://spam", {}, {"authorization": "Bearer spam"})).to(equal(None))
+
+    def test_orders_params(self):
+        expect(ResponseCache.key_for("http://spam?x=1", {"params": {"b": 2, "a": 1}})).to(
+            equal("http://spam?x=1&a=1&b=2")
+        )
+
+
+if __name__ == "__main__":
+    main()
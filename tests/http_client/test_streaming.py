@@ -0,0 +1,202 @@
+import asyncio
+from io import BytesIO
+import os
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import main
+
+from expects import expect, be_false, be_true, contain, equal, raise_error
+import requests
+
+from questions_three.exceptions.http_error import HttpNotFound
+from questions_three.http_client import AsyncHttpClient, HttpClient
+
+from .fake_transport import FakeTransportTestCase
+
+
+class FakeRaw(BytesIO):
+    def __init__(self, body):
+        super().__init__(body)
+        self.bytes_read = 0
+        self.released = False
+
+    def release_conn(self):
+        self.released = True
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def build_streamed_response(status_code=200, body=b"", headers={}):
+    response = requests.Response()
+    response.status_code = status_code
+    response.encoding = "utf-8"
+    response.headers.update(headers)
+    response.raw = FakeRaw(body)
+    return response
+
+
+class TestStreaming(FakeTransportTestCase):
+    def serve(self, url, **kwargs):
+        response = build_streamed_response(**kwargs)
+        self.transport.responses_by_url[url] = response
+        return response
+
+    def test_asks_transport_to_stream(self):
+        HttpClient().stream("http://spam")
+        method, url, kwargs = self.transport.requests[0]
+        expect(kwargs["stream"]).to(be_true)
+
+    def test_accepts_method_in_upper_case(self):
+        self.serve("http://spam", body=b"eggs")
+        expect(b"".join(HttpClient().stream("http://spam", method="GET"))).to(equal(b"eggs"))
+
+    def test_does_not_read_body_before_asked(self):
+        planted = self.serve("http://spam", body=b"x" * 1000)
+        HttpClient().stream("http://spam")
+        expect(planted.raw.bytes_read).to(equal(0))
+
+    def test_yields_body_in_chunks(self):
+        self.serve("http://spam", body=b"abcdefghij")
+        chunks = list(HttpClient().stream("http://spam", chunk_size=4))
+        expect(chunks).to(equal([b"abcd", b"efgh", b"ij"]))
+
+    def test_exposes_response(self):
+        self.serve("http://spam", body=b"eggs", headers={"X-Spam": "eggs"})
+        body = HttpClient().stream("http://spam")
+        expect(body.response.headers["X-Spam"]).to(equal("eggs"))
+
+    def test_releases_connection_when_body_runs_out(self):
+        planted = self.serve("http://spam", body=b"eggs")
+        list(HttpClient().stream("http://spam"))
+        expect(planted.raw.released).to(be_true)
+
+    def test_closes_response_on_leaving_with_block(self):
+        planted = self.serve("http://spam", body=b"x" * 1000)
+        with HttpClient().stream("http://spam", chunk_size=10) as body:
+            next(body)
+        expect(planted.raw.closed).to(be_true)
+
+    def test_transcript_shows_headers_before_body_is_read(self):
+        planted = self.serve("http://spam", body=b"eggs", headers={"X-Spam": "eggs"})
+        client = HttpClient()
+        client.stream("http://spam")
+        expect(str(client._transcript)).to(contain("X-Spam: eggs"))
+        expect(planted.raw.bytes_read).to(equal(0))
+
+    def test_transcript_keeps_bounded_prefix_of_body(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_BODY_SIZE="5")
+        self.serve("http://spam", body=b"abcdefghij")
+        client = HttpClient()
+        list(client.stream("http://spam", chunk_size=3))
+        transcript = str(client._transcript)
+        expect(transcript).to(contain("abcde\n[5 more bytes streamed]"))
+        expect(transcript).not_to(contain("abcdef"))
+
+    def test_transcript_record_keeps_no_more_than_prefix(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_BODY_SIZE="5")
+        self.serve("http://spam", body=b"x" * 1000)
+        client = HttpClient()
+        list(client.stream("http://spam", chunk_size=100))
+        expect(len(client._transcript.records[-1].prefix)).to(equal(5))
+
+    def test_raises_mapped_exception_for_error_status(self):
+        self.serve("http://spam", status_code=404, body=b"nope")
+        expect(lambda: HttpClient().stream("http://spam")).to(raise_error(HttpNotFound, "nope"))
+
+    def test_reads_at_most_max_body_size_of_error_body(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_BODY_SIZE="100")
+        planted = self.serve("http://spam", status_code=404, body=b"x" * 1000000)
+        try:
+            HttpClient().stream("http://spam")
+        except HttpNotFound as e:
+            expect(len(str(e))).to(equal(100))
+        expect(planted.raw.bytes_read < 1000000).to(be_true)
+
+    def test_follows_redirect(self):
+        redirect = self.serve("http://spam", status_code=302, headers={"Location": "http://eggs"})
+        self.serve("http://eggs", body=b"eggs")
+        expect(b"".join(HttpClient().stream("http://spam"))).to(equal(b"eggs"))
+        expect(redirect.raw.closed).to(be_true)
+
+    def test_does_not_read_body_for_debug_logging(self):
+        self.context.set_env(QUESTIONS_THREE_LOG_LEVEL="DEBUG")
+        planted = self.serve("http://spam", body=b"eggs")
+        HttpClient().stream("http://spam")
+        expect(planted.raw.bytes_read).to(equal(0))
+
+    def test_get_with_stream_keeps_body_for_caller(self):
+        self.serve("http://spam", body=b"eggs")
+        client = HttpClient()
+        resp = client.get("http://spam", stream=True)
+        str(client._transcript)
+        expect(resp.raw.bytes_read).to(equal(0))
+
+    def test_download_writes_body_to_file(self):
+        directory = mkdtemp()
+        self.addCleanup(rmtree, directory)
+        path = os.path.join(directory, "export.bin")
+        self.serve("http://spam", body=b"\x00\x01" * 100000)
+        HttpClient().download("http://spam", path, chunk_size=1000)
+        with open(path, "rb") as f:
+            expect(f.read()).to(equal(b"\x00\x01" * 100000))
+
+    def test_download_returns_response(self):
+        directory = mkdtemp()
+        self.addCleanup(rmtree, directory)
+        planted = self.serve("http://spam", body=b"eggs")
+        resp = HttpClient().download("http://spam", os.path.join(directory, "eggs"))
+        expect(resp).to(equal(planted))
+
+    def test_download_accepts_method_in_upper_case(self):
+        directory = mkdtemp()
+        self.addCleanup(rmtree, directory)
+        path = os.path.join(directory, "eggs")
+        self.serve("http://spam", body=b"eggs")
+        HttpClient().download("http://spam", path, method="GET")
+        with open(path, "rb") as f:
+            expect(f.read()).to(equal(b"eggs"))
+
+    def test_download_does_not_create_file_for_error_status(self):
+        directory = mkdtemp()
+        self.addCleanup(rmtree, directory)
+        path = os.path.join(directory, "eggs")
+        self.serve("http://spam", status_code=404)
+        try:
+            HttpClient().download("http://spam", path)
+        except HttpNotFound:
+            pass
+        expect(os.path.exists(path)).to(be_false)
+
+    def test_async_stream_yields_body_with_async_for(self):
+        self.serve("http://spam", body=b"abcdefghij")
+
+        async def read():
+            body = await AsyncHttpClient().stream("http://spam", chunk_size=4)
+            return [chunk async for chunk in body]
+
+        expect(asyncio.run(read())).to(equal([b"abcd", b"efgh", b"ij"]))
+
+    def test_async_stream_accepts_method_in_upper_case(self):
+        self.serve("http://spam", body=b"eggs")
+
+        async def read():
+            body = await AsyncHttpClient().stream("http://spam", method="GET")
+            return [chunk async for chunk in body]
+
+        expect(asyncio.run(read())).to(equal([b"eggs"]))
+
+    def test_async_download_writes_body_to_file(self):
+        directory = mkdtemp()
+        self.addCleanup(rmtree, directory)
+        path = os.path.join(directory, "eggs")
+        self.serve("http://spam", body=b"eggs" * 1000)
+        asyncio.run(AsyncHttpClient().download("http://spam", path, chunk_size=100))
+        with open(path, "rb") as f:
+            expect(f.read()).to(equal(b"eggs" * 1000))
+
+
+if __name__ == "__main__":
+    main()
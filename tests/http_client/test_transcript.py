@@ -86,7 +86,7 @@ class TestTranscript(TestCase):
         t = datetime.fromtimestamp(1519328797.125686)
         self.context.inject(datetime.utcnow, lambda: t)
         self.trigger_transcript()
-        expect(self.published["artifact"]).to(contain("Request at %s" % t.isoformat()))
+        expect(str(self.published["artifact"])).to(contain("Request at %s" % t.isoformat()))
 
     def test_request_method_and_url(self):
         method = "HEAD"
@@ -94,14 +94,14 @@ class TestTranscript(TestCase):
         url = "http://i.love2spam.net/spam"
         getattr(sut, method.lower())(url)
         EventBroker.publish(event=TestEvent.test_failed, exception=RuntimeError())
-        expect(self.published["artifact"]).to(contain("\n%s %s" % (method, url)))
+        expect(str(self.published["artifact"])).to(contain("\n%s %s" % (method, url)))
 
     def test_request_headers(self):
         headers = {"X-yz": "yogurt humphrey", "Content-length": "infinite"}
         sut = HttpClient()
         sut.get("http://something", headers=headers)
         EventBroker.publish(event=TestEvent.test_failed, exception=RuntimeError())
-        expect(self.published["artifact"]).to(contain("\n".join(["%s: %s" % (k, v) for k, v in headers.items()])))
+        expect(str(self.published["artifact"])).to(contain("\n".join(["%s: %s" % (k, v) for k, v in headers.items()])))
 
     def test_request_payload(self):
         payload = """
@@ -120,7 +120,7 @@ class TestTranscript(TestCase):
         sut = HttpClient()
         sut.put("http://python.net/philosophers.txt", data=payload)
         EventBroker.publish(event=TestEvent.test_failed, exception=RuntimeError())
-        expect(self.published["artifact"]).to(contain(payload))
+        expect(str(self.published["artifact"])).to(contain(payload))
 
     def test_does_not_choke_on_binary_payload(self):
         def attempt():
@@ -138,13 +138,13 @@ class TestTranscript(TestCase):
         t = datetime.fromtimestamp(1519328797.125686)
         self.context.inject(datetime.utcnow, lambda: t)
         self.trigger_transcript()
-        expect(self.published["artifact"]).to(contain("Response at %s" % t.isoformat()))
+        expect(str(self.published["artifact"])).to(contain("Response at %s" % t.isoformat()))
 
     def test_response_status_code(self):
         code = 242
         self.fake_requests.response.status_code = code
         self.trigger_transcript()
-        expect(self.published["artifact"]).to(contain("\n%d\n" % code))
+        expect(str(self.published["artifact"])).to(contain("\n%d\n" % code))
 
     def test_response_headers(self):
         headers = {"X-yz": "Sam the spammer", "Content-length": "2"}
@@ -152,13 +152,13 @@ class TestTranscript(TestCase):
         sut = HttpClient()
         sut.get("http://something")
         EventBroker.publish(event=TestEvent.test_failed, exception=RuntimeError())
-        expect(self.published["artifact"]).to(contain("\n".join(["%s: %s" % (k, v) for k, v in headers.items()])))
+        expect(str(self.published["artifact"])).to(contain("\n".join(["%s: %s" % (k, v) for k, v in headers.items()])))
 
     def test_response_payload(self):
         payload = "What a heap"
         self.fake_requests.response.text = payload
         self.trigger_transcript()
-        expect(self.published["artifact"]).to(contain(payload))
+        expect(str(self.published["artifact"])).to(contain(payload))
 
 
 if "__main__" == __name__:
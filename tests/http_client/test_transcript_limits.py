@@ -0,0 +1,117 @@
+from io import StringIO
+import pickle
+from unittest import TestCase, main
+
+from expects import expect, contain, equal, have_length
+import requests
+from twin_sister import open_dependency_context
+
+from questions_three.http_client.transcript import Transcript
+
+
+def build_response(body=b""):
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response._content = body
+    return response
+
+
+class TestTranscriptLimits(TestCase):
+    def setUp(self):
+        self.context = open_dependency_context(supply_env=True)
+
+    def tearDown(self):
+        self.context.close()
+
+    def add_requests(self, transcript, count):
+        for n in range(count):
+            transcript.add_request("get", "http://spam/%d" % n)
+
+    def test_keeps_at_most_max_records_in_memory(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_RECORDS="3")
+        transcript = Transcript()
+        self.add_requests(transcript, 10)
+        expect(transcript.records).to(have_length(3))
+
+    def test_keeps_records_within_max_memory(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_MEMORY="1000")
+        transcript = Transcript()
+        for _ in range(5):
+            transcript.add_response(build_response(b"x" * 400))
+        expect(transcript.records).to(have_length(2))
+
+    def test_always_keeps_latest_record(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_MEMORY="10")
+        transcript = Transcript()
+        transcript.add_response(build_response(b"x" * 400))
+        expect(transcript.records).to(have_length(1))
+
+    def test_spilled_records_appear_in_order(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_RECORDS="2")
+        transcript = Transcript()
+        self.add_requests(transcript, 5)
+        text = str(transcript)
+        positions = [text.index("GET http://spam/%d\n" % n) for n in range(5)]
+        expect(positions).to(equal(sorted(positions)))
+
+    def test_spilled_transcript_matches_unbounded_transcript(self):
+        unbounded = Transcript()
+        self.add_requests(unbounded, 5)
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_RECORDS="2")
+        bounded = Transcript()
+        for record in unbounded.records:
+            bounded._add(record)
+        expect(str(bounded)).to(equal(str(unbounded)))
+
+    def test_discards_oldest_records_when_spilling_disabled(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_RECORDS="2", HTTP_TRANSCRIPT_SPILL_TO_DISK="false")
+        transcript = Transcript()
+        self.add_requests(transcript, 5)
+        text = str(transcript)
+        expect(text).to(contain("3 earlier records discarded"))
+        expect(text).not_to(contain("http://spam/2\n"))
+        expect(text).to(contain("http://spam/4\n"))
+
+    def test_truncates_long_response_body(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_BODY_SIZE="10")
+        transcript = Transcript()
+        transcript.add_response(build_response(b"0123456789abcdef"))
+        text = str(transcript)
+        expect(text).to(contain("0123456789\n[6 more bytes not shown]"))
+        expect(text).not_to(contain("abcdef"))
+
+    def test_truncates_spilled_response_body(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_BODY_SIZE="10", HTTP_TRANSCRIPT_MAX_RECORDS="1")
+        transcript = Transcript()
+        transcript.add_response(build_response(b"0123456789abcdef"))
+        transcript.add_request("get", "http://spam")
+        expect(str(transcript)).to(contain("0123456789\n[6 more bytes not shown]"))
+
+    def test_artifact_writes_itself_to_file(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_RECORDS="2")
+        transcript = Transcript()
+        self.add_requests(transcript, 5)
+        artifact = transcript.artifact()
+        f = StringIO()
+        artifact.write_to(f)
+        expect(f.getvalue()).to(equal(str(artifact)))
+
+    def test_artifact_ignores_later_records(self):
+        self.context.set_env(HTTP_TRANSCRIPT_MAX_RECORDS="2")
+        transcript = Transcript()
+        self.add_requests(transcript, 3)
+        artifact = transcript.artifact()
+        before = str(artifact)
+        transcript.add_request("get", "http://eggs")
+        expect(str(artifact)).to(equal(before))
+
+    def test_artifact_pickles_as_string(self):
+        transcript = Transcript()
+        self.add_requests(transcript, 2)
+        artifact = transcript.artifact()
+        expect(pickle.loads(pickle.dumps(artifact))).to(equal(str(artifact)))
+
+
+if "__main__" == __name__:
+    main()
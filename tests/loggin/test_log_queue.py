@@ -0,0 +1,136 @@
+from logging import StreamHandler
+from logging.handlers import QueueHandler
+from threading import Event
+from time import sleep
+from unittest import TestCase, main
+
+from expects import expect, be_a, be_empty, contain, equal, have_length
+from twin_sister import open_dependency_context
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.logging import (
+    disable_log_queue,
+    enable_log_queue,
+    flush_log_queue,
+    log_queue_is_enabled,
+    logger_for_module,
+)
+from questions_three.scaffolds.common.configure_logging import configure_log_queue
+
+
+class SlowSpyHandler(StreamHandler):
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+        self.messages = []
+
+    def emit(self, record):
+        sleep(self.delay)
+        self.messages.append(self.format(record))
+
+
+class TestLogQueue(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+        self.spy = SlowSpyHandler()
+        self.context.logging.StreamHandler = lambda *args, **kwargs: self.spy
+
+    def tearDown(self):
+        disable_log_queue()
+        self.context.close()
+
+    def test_logger_hands_records_to_queue(self):
+        enable_log_queue(max_size=10)
+        expect(logger_for_module("spam.eggs").handlers[0]).to(be_a(QueueHandler))
+
+    def test_existing_logger_hands_records_to_queue(self):
+        logger = logger_for_module("spam.eggs")
+        enable_log_queue(max_size=10)
+        expect(logger.handlers).to(have_length(1))
+        expect(logger.handlers[0]).to(be_a(QueueHandler))
+
+    def test_flush_writes_every_queued_message(self):
+        self.spy.delay = 0.01
+        enable_log_queue(max_size=100)
+        logger = logger_for_module("spam.eggs")
+        for n in range(10):
+            logger.info("message %d" % n)
+        flush_log_queue()
+        expect(self.spy.messages).to(have_length(10))
+
+    def test_queued_message_keeps_its_format(self):
+        enable_log_queue(max_size=10)
+        logger_for_module("spam.eggs").warning("Hello")
+        flush_log_queue()
+        expect(self.spy.messages[-1]).to(contain("WARNING from spam.eggs: Hello"))
+
+    def test_logging_does_not_wait_for_writer(self):
+        release = Event()
+
+        class BlockedHandler(SlowSpyHandler):
+            def emit(self, record):
+                release.wait()
+                super().emit(record)
+
+        self.spy = BlockedHandler()
+        enable_log_queue(max_size=10)
+        logger_for_module("spam.eggs").info("Hello")
+        try:
+            expect(self.spy.messages).to(be_empty)
+        finally:
+            release.set()
+        flush_log_queue()
+        expect(self.spy.messages).to(have_length(1))
+
+    def test_full_queue_waits_rather_than_discards(self):
+        self.spy.delay = 0.005
+        enable_log_queue(max_size=2)
+        logger = logger_for_module("spam.eggs")
+        for n in range(10):
+            logger.info("message %d" % n)
+        flush_log_queue()
+        expect(self.spy.messages).to(have_length(10))
+
+    def test_disable_writes_queued_messages(self):
+        self.spy.delay = 0.01
+        enable_log_queue(max_size=100)
+        logger = logger_for_module("spam.eggs")
+        for n in range(5):
+            logger.info("message %d" % n)
+        disable_log_queue()
+        expect(self.spy.messages).to(have_length(5))
+
+    def test_disable_restores_direct_handler(self):
+        enable_log_queue(max_size=10)
+        logger = logger_for_module("spam.eggs")
+        disable_log_queue()
+        expect(logger.handlers).to(equal([self.spy]))
+
+    def test_disabled_by_default_config(self):
+        configure_log_queue()
+        assert not log_queue_is_enabled(), "Log queue was enabled"
+
+    def test_does_not_subscribe_flusher_when_disabled(self):
+        configure_log_queue()
+        expect(EventBroker.get_subscribers()).to(equal(set()))
+
+    def test_enabled_by_config(self):
+        self.context.set_env(LOG_QUEUE_ENABLED="true")
+        configure_log_queue()
+        assert log_queue_is_enabled(), "Log queue was not enabled"
+
+    def test_flushes_on_suite_ended(self):
+        self.spy.delay = 0.01
+        self.context.set_env(LOG_QUEUE_ENABLED="true")
+        configure_log_queue()
+        logger = logger_for_module("spam.eggs")
+        for n in range(10):
+            logger.info("message %d" % n)
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="spam")
+        expect(self.spy.messages).to(have_length(10))
+
+
+if "__main__" == __name__:
+    main()
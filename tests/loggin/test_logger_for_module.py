@@ -3,7 +3,7 @@ import logging
 from logging import Logger, StreamHandler
 from unittest import TestCase, main
 
-from expects import expect, be_a, contain, end_with, equal, start_with
+from expects import expect, be, be_a, contain, end_with, equal, have_length, start_with
 from twin_sister import open_dependency_context
 
 from twin_sister.expects_matchers import raise_ex
@@ -109,6 +109,28 @@ class TestModuleLogger(TestCase):
         logger = logger_for_module(module_name="apples")
         expect(logger.level).to(equal(logging.INFO))
 
+    def test_returns_same_logger_for_same_module(self):
+        expect(logger_for_module("spam.eggs")).to(be(logger_for_module("spam.eggs")))
+
+    def test_returns_different_logger_for_different_module(self):
+        expect(logger_for_module("spam.eggs")).not_to(be(logger_for_module("spam.beans")))
+
+    def test_does_not_accumulate_handlers(self):
+        logger_for_module("spam.eggs")
+        logger = logger_for_module("spam.eggs")
+        expect(logger.handlers).to(have_length(1))
+
+    def test_recalculates_level_when_environment_changes(self):
+        logger_for_module("spam.eggs")
+        self.context.set_env(SPAM_LOG_LEVEL="ERROR")
+        expect(logger_for_module("spam.eggs").level).to(equal(logging.ERROR))
+
+    def test_recalculates_level_when_variable_is_removed(self):
+        self.context.set_env(SPAM_EGGS_LOG_LEVEL="ERROR")
+        logger_for_module("spam.eggs")
+        self.context.unset_env("SPAM_EGGS_LOG_LEVEL")
+        expect(logger_for_module("spam.eggs").level).to(equal(logging.INFO))
+
 
 if "__main__" == __name__:
     main()
@@ -0,0 +1,105 @@
+from copy import copy
+import sys
+from unittest import TestCase, main
+
+from expects import expect, equal, have_length
+import yaml
+from twin_sister import open_dependency_context
+
+import questions_three.module_cfg.loader as loader
+from twin_sister.fakes import EmptyFake, Wrapper
+from questions_three.vanilla import module_filename
+
+YML_FILENAME = loader.YML_FILENAME
+config_for_module = loader.config_for_module
+
+
+class FakeModule(EmptyFake):
+    def __init__(self, *, context, name):
+        self.__name__ = name
+        self.__file__ = context.os.path.join("fake", "modules", name, "__init__.py")
+        self._context = context
+        context.create_file(self.__file__)
+
+    def __bool__(self):
+        return True
+
+    def config_filename(self):
+        return module_filename(self, YML_FILENAME)
+
+    def add_config(self, values):
+        filename = self.config_filename()
+        if self._context.os.path.exists(filename):
+            self._context.os.remove(filename)
+        self._context.create_file(filename, text=yaml.dump(values))
+
+
+class TestCaching(TestCase):
+    def setUp(self):
+        loader.UNIT_TEST_MODE = True
+        self.context = open_dependency_context(supply_env=True, supply_fs=True)
+        self.fake_sys = Wrapper(sys)
+        self.fake_sys.modules = copy(sys.modules)
+        self.context.inject(sys, self.fake_sys)
+        self.opened = []
+        real_open = self.context.get(open)
+
+        def spy_open(filename, *args, **kwargs):
+            self.opened.append(filename)
+            return real_open(filename, *args, **kwargs)
+
+        self.context.inject(open, spy_open)
+
+    def tearDown(self):
+        self.context.close()
+        loader.UNIT_TEST_MODE = False
+
+    def add_module(self, name, values):
+        module = FakeModule(context=self.context, name=name)
+        module.add_config(values)
+        self.fake_sys.modules[module.__name__] = module
+        return module
+
+    def test_reads_unchanged_file_only_once(self):
+        module = self.add_module("cached", {"spam": "eggs"})
+        config_for_module("cached")
+        config_for_module("cached")
+        expect([f for f in self.opened if f == module.config_filename()]).to(have_length(1))
+
+    def test_reads_parent_file_only_once_for_several_children(self):
+        parent = self.add_module("cached_parent", {"spam": "eggs"})
+        self.add_module("cached_parent.one", {})
+        self.add_module("cached_parent.two", {})
+        config_for_module("cached_parent.one")
+        config_for_module("cached_parent.two")
+        expect([f for f in self.opened if f == parent.config_filename()]).to(have_length(1))
+
+    def test_rereads_file_after_it_changes(self):
+        module = self.add_module("changeable", {"spam": "eggs"})
+        config_for_module("changeable")
+        module.add_config({"spam": "sausage and spam"})
+        expect(config_for_module("changeable").spam).to(equal("sausage and spam"))
+
+    def test_child_sees_change_to_parent_file(self):
+        parent = self.add_module("changeable_parent", {"spam": "eggs"})
+        self.add_module("changeable_parent.child", {})
+        config_for_module("changeable_parent.child")
+        parent.add_config({"spam": "beans and spam"})
+        expect(config_for_module("changeable_parent.child").spam).to(equal("beans and spam"))
+
+    def test_environment_change_overrides_cached_value(self):
+        self.add_module("overridable", {"spam": "eggs"})
+        config_for_module("overridable")
+        self.context.set_env(SPAM="baked beans")
+        expect(config_for_module("overridable").spam).to(equal("baked beans"))
+
+    def test_clear_cache_forces_reread(self):
+        module = self.add_module("clearable", {"spam": "eggs"})
+        config_for_module("clearable")
+        loader.clear_cache()
+        config_for_module("clearable")
+        expect([f for f in self.opened if f == module.config_filename()]).to(have_length(2))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,64 @@
+from unittest import TestCase, main
+
+from expects import expect, be, be_empty, equal
+from twin_sister import open_dependency_context
+
+from questions_three.module_cfg.environment_index import index_environment
+from questions_three.module_cfg.module_cfg import ModuleCfg
+
+
+class TestEnvironmentIndex(TestCase):
+    def setUp(self):
+        self.context = open_dependency_context(supply_env=True)
+
+    def tearDown(self):
+        self.context.close()
+
+    def test_finds_value_case_insensitive(self):
+        environ = {"sPaM": "eggs"}
+        expect(index_environment(environ).values_for("SpAm")).to(equal(["eggs"]))
+
+    def test_finds_nothing_for_absent_variable(self):
+        expect(index_environment({"spam": "eggs"}).values_for("beans")).to(be_empty)
+
+    def test_finds_every_ambiguous_match(self):
+        environ = {"spam": "eggs", "SPAM": "sausage"}
+        expect(sorted(index_environment(environ).values_for("spam"))).to(equal(["eggs", "sausage"]))
+
+    def test_reuses_index_while_environment_is_unchanged(self):
+        environ = {"spam": "eggs"}
+        first = index_environment(environ)
+        expect(index_environment(environ)).to(be(first))
+
+    def test_reuses_index_for_equal_environment(self):
+        first = index_environment({"spam": "eggs"})
+        expect(index_environment({"spam": "eggs"})).to(be(first))
+
+    def test_rebuilds_index_after_variable_is_added(self):
+        environ = {"spam": "eggs"}
+        index_environment(environ)
+        environ["beans"] = "off"
+        expect(index_environment(environ).values_for("BEANS")).to(equal(["off"]))
+
+    def test_rebuilds_index_after_value_changes(self):
+        environ = {"spam": "eggs"}
+        index_environment(environ)
+        environ["spam"] = "sausage"
+        expect(index_environment(environ).values_for("spam")).to(equal(["sausage"]))
+
+    def test_rebuilds_index_after_variable_is_removed(self):
+        environ = {"spam": "eggs", "beans": "off"}
+        index_environment(environ)
+        del environ["beans"]
+        expect(index_environment(environ).values_for("beans")).to(be_empty)
+
+    def test_config_sees_changed_value_after_earlier_read(self):
+        cfg = ModuleCfg(defaults={"thing": "default"})
+        self.context.os.environ["THING"] = "first"
+        expect(cfg.thing).to(equal("first"))
+        self.context.os.environ["THING"] = "second"
+        expect(cfg.thing).to(equal("second"))
+
+
+if "__main__" == __name__:
+    main()
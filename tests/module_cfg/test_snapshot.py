@@ -0,0 +1,143 @@
+from copy import copy
+from importlib.util import find_spec
+import json
+import pkgutil
+from pkgutil import ModuleInfo
+import sys
+from unittest import TestCase, main
+
+from expects import expect, be_empty, contain, equal
+import yaml
+from twin_sister import open_dependency_context
+
+import questions_three.module_cfg.loader as loader
+from questions_three.module_cfg.snapshot import (
+    SNAPSHOT_ENV_VAR,
+    create_snapshot,
+    load_snapshot,
+    load_snapshot_from_environment,
+)
+from twin_sister.fakes import EmptyFake, Wrapper
+from questions_three.vanilla import module_filename
+
+config_for_module = loader.config_for_module
+
+
+class FakeModule(EmptyFake):
+    def __init__(self, *, context, name):
+        self.__name__ = name
+        self.__file__ = context.os.path.join("fake", "modules", name, "__init__.py")
+        self._context = context
+        context.create_file(self.__file__)
+
+    def __bool__(self):
+        return True
+
+    def config_filename(self):
+        return module_filename(self, loader.YML_FILENAME)
+
+    def add_config(self, values):
+        filename = self.config_filename()
+        if self._context.os.path.exists(filename):
+            self._context.os.remove(filename)
+        self._context.create_file(filename, text=yaml.dump(values))
+
+
+class TestSnapshot(TestCase):
+    def setUp(self):
+        loader.UNIT_TEST_MODE = True
+        loader.clear_cache()
+        self.context = open_dependency_context(supply_env=True, supply_fs=True)
+        self.fake_sys = Wrapper(sys)
+        self.fake_sys.modules = copy(sys.modules)
+        self.context.inject(sys, self.fake_sys)
+        self.opened = []
+        real_open = self.context.get(open)
+
+        def spy_open(filename, *args, **kwargs):
+            self.opened.append(filename)
+            return real_open(filename, *args, **kwargs)
+
+        self.context.inject(open, spy_open)
+
+    def tearDown(self):
+        self.context.close()
+        loader.clear_cache()
+        loader.UNIT_TEST_MODE = False
+
+    def add_module(self, name, values):
+        module = FakeModule(context=self.context, name=name)
+        module.add_config(values)
+        self.fake_sys.modules[module.__name__] = module
+        return module
+
+    def test_snapshot_contains_parsed_defaults(self):
+        module = self.add_module("snappy", {"spam": "eggs"})
+        config_for_module("snappy")
+        snapshot = json.loads(create_snapshot())
+        expect(snapshot[module.config_filename()]["defaults"]).to(equal({"spam": "eggs"}))
+
+    def test_loaded_snapshot_spares_parsing(self):
+        module = self.add_module("snappy", {"spam": "eggs"})
+        config_for_module("snappy")
+        snapshot = create_snapshot()
+        loader.clear_cache()
+        self.opened = []
+        load_snapshot(snapshot)
+        expect(config_for_module("snappy").spam).to(equal("eggs"))
+        expect(self.opened).not_to(contain(module.config_filename()))
+
+    def test_file_changed_after_snapshot_gets_parsed(self):
+        module = self.add_module("snappy", {"spam": "eggs"})
+        config_for_module("snappy")
+        snapshot = create_snapshot()
+        loader.clear_cache()
+        module.add_config({"spam": "sausage and spam"})
+        load_snapshot(snapshot)
+        expect(config_for_module("snappy").spam).to(equal("sausage and spam"))
+
+    def test_loads_snapshot_from_environment(self):
+        self.add_module("snappy", {"spam": "eggs"})
+        config_for_module("snappy")
+        self.context.set_env(**{SNAPSHOT_ENV_VAR: create_snapshot()})
+        loader.clear_cache()
+        load_snapshot_from_environment()
+        expect(loader.parsed_files()).not_to(be_empty)
+
+    def test_snapshot_includes_files_beneath_extra_dirs(self):
+        filename = self.context.os.path.abspath(self.context.os.path.join("suites", "module_cfg.yml"))
+        self.context.create_file(filename, text=yaml.dump({"spam": "eggs"}))
+        snapshot = json.loads(create_snapshot(extra_dirs=["suites"]))
+        expect(snapshot[filename]["defaults"]).to(equal({"spam": "eggs"}))
+
+    def test_snapshot_includes_optional_packages(self):
+        package_dir = self.context.os.path.abspath("questions_three_spam")
+        filename = self.context.os.path.join(package_dir, "module_cfg.yml")
+        self.context.create_file(filename, text=yaml.dump({"spam": "eggs"}))
+        fake_pkgutil = EmptyFake()
+        fake_pkgutil.iter_modules = lambda: [
+            ModuleInfo(None, "questions_three_spam", True),
+            ModuleInfo(None, "questions_three_eggs", False),
+            ModuleInfo(None, "sausage", True),
+        ]
+        self.context.inject(pkgutil, fake_pkgutil)
+        searched = []
+
+        def fake_find_spec(name):
+            searched.append(name)
+            spec = EmptyFake()
+            spec.submodule_search_locations = [package_dir]
+            return spec
+
+        self.context.inject(find_spec, fake_find_spec)
+        snapshot = json.loads(create_snapshot())
+        expect(searched).to(equal(["questions_three_spam"]))
+        expect(snapshot[filename]["defaults"]).to(equal({"spam": "eggs"}))
+
+    def test_ignores_absent_environment_variable(self):
+        load_snapshot_from_environment()
+        expect(loader.parsed_files()).to(be_empty)
+
+
+if "__main__" == __name__:
+    main()
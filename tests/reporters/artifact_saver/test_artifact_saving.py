@@ -151,6 +151,14 @@ class TestArtifactSaving(TestCase):
         publish(artifact_mime_type="mystery/spam")
         expect(self.fake_file.filename).to(end_with(".bin"))
 
+    def test_lets_artifact_with_write_to_write_itself(self):
+        class StreamingArtifact:
+            def write_to(self, f):
+                f.write("streamed")
+
+        publish(artifact=StreamingArtifact())
+        expect(self.fake_file.written).to(equal("streamed"))
+
 
 if "__main__" == __name__:
     main()
@@ -0,0 +1,164 @@
+from datetime import datetime
+import os
+import pickle
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from expects import expect, be_a, be_false, be_none, contain, equal, have_length, raise_error
+import requests
+from twin_sister import open_dependency_context
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.event_broker.event_serialization import ForwardedException
+from questions_three.reporters.event_journal import EventJournal, read_journal, replay_journal
+from questions_three.reporters.event_journal.event_journal import FRAME_HEADER
+
+
+ran = []
+
+
+def run_code():
+    ran.append(True)
+
+
+class RunsCode:
+    def __reduce__(self):
+        return (run_code, ())
+
+
+class Recorder:
+    def __init__(self, *events):
+        self.received = []
+        EventBroker.subscribe(events=events, func=self.receive)
+
+    def receive(self, **kwargs):
+        self.received.append(kwargs)
+
+
+class TestEventJournal(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+        self.reports = TemporaryDirectory()
+        self.context.set_env(REPORTS_PATH=self.reports.name, TEST_RUN_ID="journaled run")
+        self.sut = EventJournal()
+        self.sut.activate()
+
+    def tearDown(self):
+        self.sut.close()
+        self.reports.cleanup()
+        self.context.close()
+        EventBroker.reset()
+
+    def read(self):
+        self.sut.close()
+        return list(read_journal(self.sut.filename))
+
+    def test_writes_journal_under_reports_path(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        expect(self.sut.filename).to(contain(os.path.join(self.reports.name, "event_journals")))
+
+    def test_records_events_in_order(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        EventBroker.publish(event=TestEvent.test_started, test_name="eggs")
+        EventBroker.publish(event=TestEvent.test_ended, test_name="eggs")
+        expect([event for event, _, _ in self.read()]).to(
+            equal([TestEvent.suite_started, TestEvent.test_started, TestEvent.test_ended])
+        )
+
+    def test_records_event_time(self):
+        published = datetime.fromtimestamp(1516896985.203114)
+        EventBroker.publish(event=TestEvent.test_started, test_name="eggs", event_time=published)
+        _, event_time, _ = self.read()[0]
+        expect(event_time).to(equal(published))
+
+    def test_records_run_id_and_properties(self):
+        EventBroker.publish(event=TestEvent.artifact_created, artifact=b"\x00\x01", test_name="eggs")
+        _, _, properties = self.read()[0]
+        expect(properties["run_id"]).to(equal("journaled run"))
+        expect(properties["artifact"]).to(equal(b"\x00\x01"))
+        expect(properties["test_name"]).to(equal("eggs"))
+
+    def test_records_exception_as_stand_in(self):
+        EventBroker.publish(event=TestEvent.test_failed, test_name="eggs", exception=AssertionError("nope"))
+        _, _, properties = self.read()[0]
+        expect(properties["exception"]).to(be_a(ForwardedException))
+
+    def test_records_http_response(self):
+        response = requests.Response()
+        response.status_code = 418
+        response.headers["X-Spam"] = "eggs"
+        response._content = b"teapot"
+        EventBroker.publish(event=TestEvent.http_response_received, response=response)
+        _, _, properties = self.read()[0]
+        unpacked = properties["response"]
+        expect((unpacked.status_code, unpacked.headers["X-Spam"], unpacked.content)).to(
+            equal((418, "eggs", b"teapot"))
+        )
+
+    def write_frame(self, packed):
+        self.sut.close()
+        with open(self.sut.filename, "ab") as f:
+            f.write(FRAME_HEADER.pack(len(packed)))
+            f.write(packed)
+
+    def test_does_not_run_code_from_property(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        del ran[:]
+        properties = {"spam": pickle.dumps(RunsCode())}
+        self.write_frame(pickle.dumps((TestEvent.test_started.name, None, properties)))
+        _, _, unpacked = self.read()[1]
+        expect(unpacked["spam"]).to(be_none)
+        expect(bool(ran)).to(be_false)
+
+    def test_does_not_run_code_from_record(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        del ran[:]
+        self.write_frame(pickle.dumps(RunsCode()))
+        expect(self.read).to(raise_error(pickle.UnpicklingError))
+        expect(bool(ran)).to(be_false)
+
+    def test_does_not_record_events_that_reporters_derive(self):
+        EventBroker.publish(event=TestEvent.suite_results_compiled, suite_results=None)
+        EventBroker.publish(event=TestEvent.report_created, report_filename="x", report_content="y")
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="spam")
+        expect([event for event, _, _ in self.read()]).to(equal([TestEvent.suite_ended]))
+
+    def test_flushes_when_suite_ends(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="spam")
+        expect(list(read_journal(self.sut.filename))).to(have_length(2))
+
+    def test_stops_reading_at_record_cut_short(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="spam")
+        self.sut.close()
+        with open(self.sut.filename, "r+b") as f:
+            f.truncate(os.path.getsize(self.sut.filename) - 1)
+        expect(list(read_journal(self.sut.filename))).to(have_length(1))
+
+    def test_replay_publishes_recorded_events(self):
+        published = datetime.fromtimestamp(1516896985.203114)
+        EventBroker.publish(event=TestEvent.test_started, test_name="eggs", event_time=published)
+        self.sut.close()
+        EventBroker.reset()
+        self.context.set_env(REPORTS_PATH=self.reports.name)
+        recorder = Recorder(TestEvent.test_started)
+        replay_journal(self.sut.filename)
+        expect(recorder.received).to(have_length(1))
+        expect(recorder.received[0]["test_name"]).to(equal("eggs"))
+        expect(recorder.received[0]["event_time"]).to(equal(published))
+        expect(recorder.received[0]["run_id"]).to(equal("journaled run"))
+
+    def test_replay_leaves_environment_alone(self):
+        EventBroker.publish(event=TestEvent.test_started, test_name="eggs")
+        self.sut.close()
+        EventBroker.reset()
+        self.context.set_env(REPORTS_PATH=self.reports.name, TEST_RUN_ID="replaying run")
+        replay_journal(self.sut.filename)
+        expect(self.context.os.environ["TEST_RUN_ID"]).to(equal("replaying run"))
+
+
+if "__main__" == __name__:
+    main()
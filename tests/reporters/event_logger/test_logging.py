@@ -150,6 +150,18 @@ class TestLogging(TestCase):
         level, msg = self.logged()
         expect(msg).to(equal(f"{name} completed in {seconds} seconds"))
 
+    def test_load_measured_message(self):
+        EventBroker.publish(
+            event=TestEvent.load_measured,
+            test_name="spam",
+            request_count=100,
+            throughput_per_second=25.0,
+            error_rate=0.03,
+            latency_seconds={"p95": 0.25},
+        )
+        level, msg = self.logged()
+        expect((level, msg)).to(equal(("info", "spam: 100 calls at 25.0/s, 3.00% errors, p95 latency 0.25 seconds")))
+
 
 if "__main__" == __name__:
     main()
@@ -0,0 +1,127 @@
+import json
+from unittest import TestCase, main
+
+from expects import expect, be_within, equal, have_length
+from twin_sister import open_dependency_context
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.reporters.http_latency_reporter import HttpLatencyReporter, url_template
+
+
+class Recorder:
+    def __init__(self, *events):
+        self.received = []
+        EventBroker.subscribe(events=events, func=self.receive)
+
+    def receive(self, **kwargs):
+        self.received.append(kwargs)
+
+
+def publish_response(url, total, method="GET", **kwargs):
+    EventBroker.publish(
+        event=TestEvent.http_response_received,
+        http_method=method,
+        request_url=url,
+        request_timings={"queue": 0.0, "connect": 0.0, "first_byte": total, "total": total},
+        **kwargs,
+    )
+
+
+class TestUrlTemplate(TestCase):
+    def test_replaces_numeric_segments(self):
+        expect(url_template("http://spam/users/42/orders/7")).to(equal("http://spam/users/{id}/orders/{id}"))
+
+    def test_replaces_uuid_segments(self):
+        expect(url_template("http://spam/things/0b0e5a8e-6a4e-4c4a-9d7c-2f1f3ad2b6a1")).to(
+            equal("http://spam/things/{id}")
+        )
+
+    def test_replaces_long_hex_segments(self):
+        expect(url_template("http://spam/blobs/deadbeef0123456789")).to(equal("http://spam/blobs/{id}"))
+
+    def test_keeps_words(self):
+        expect(url_template("http://spam/users/me")).to(equal("http://spam/users/me"))
+
+    def test_drops_query_and_fragment(self):
+        expect(url_template("http://spam/search?q=eggs#top")).to(equal("http://spam/search"))
+
+
+class TestHttpLatencyReporter(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+        self.artifacts = Recorder(TestEvent.artifact_created)
+        self.sut = HttpLatencyReporter()
+        self.sut.activate()
+
+    def tearDown(self):
+        self.context.close()
+        EventBroker.reset()
+
+    def published_report(self):
+        expect(self.artifacts.received).to(have_length(1))
+        return json.loads(self.artifacts.received[0]["artifact"])
+
+    def test_publishes_json_artifact_when_suite_ends(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        publish_response("http://spam/1", 0.1)
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="spam")
+        published = self.artifacts.received[0]
+        expect((published["artifact_mime_type"], published["artifact_type"], published["suite_name"])).to(
+            equal(("application/json", "http_latency", "spam"))
+        )
+
+    def test_groups_requests_by_method_and_url_template(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        publish_response("http://spam/users/1", 0.1)
+        publish_response("http://spam/users/2", 0.2)
+        publish_response("http://spam/users/2", 0.2, method="DELETE")
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="spam")
+        groups = [(r["method"], r["url"], r["count"]) for r in self.published_report()["requests"]]
+        expect(groups).to(equal([("DELETE", "http://spam/users/{id}", 1), ("GET", "http://spam/users/{id}", 2)]))
+
+    def test_reports_percentiles(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        for n in range(1, 101):
+            publish_response("http://spam", n / 100)
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="spam")
+        seconds = self.published_report()["requests"][0]["seconds"]
+        expect(seconds["p50"]).to(be_within(0.475, 0.525))
+        expect(seconds["p95"]).to(be_within(0.9, 1.0))
+        expect(seconds["p99"]).to(be_within(0.94, 1.0))
+        expect((seconds["min"], seconds["max"])).to(equal((0.01, 1.0)))
+
+    def test_reports_histogram_buckets(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        publish_response("http://spam", 0.1)
+        publish_response("http://spam", 0.1)
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="spam")
+        (bucket,) = self.published_report()["requests"][0]["histogram"]
+        expect(bucket["count"]).to(equal(2))
+        expect(bucket["le"] >= 0.1).to(equal(True))
+
+    def test_ignores_responses_without_timings(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        EventBroker.publish(event=TestEvent.http_response_received, http_method="GET", request_url="http://spam")
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="spam")
+        expect(self.artifacts.received).to(equal([]))
+
+    def test_starts_afresh_for_each_suite(self):
+        for suite_name in ("spam", "eggs"):
+            EventBroker.publish(event=TestEvent.suite_started, suite_name=suite_name)
+            publish_response("http://spam", 0.1)
+            EventBroker.publish(event=TestEvent.suite_ended, suite_name=suite_name)
+        counts = [json.loads(a["artifact"])["requests"][0]["count"] for a in self.artifacts.received]
+        expect(counts).to(equal([1, 1]))
+
+    def test_attributes_requests_outside_suite_to_next_suite_to_end(self):
+        publish_response("http://spam", 0.1)
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="spam")
+        publish_response("http://spam", 0.2)
+        EventBroker.publish(event=TestEvent.suite_ended, suite_name="spam")
+        expect(self.published_report()["requests"][0]["count"]).to(equal(2))
+
+
+if "__main__" == __name__:
+    main()
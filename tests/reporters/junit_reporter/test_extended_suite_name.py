@@ -50,6 +50,16 @@ class TestExtendedSuiteName(TestCase):
         prefix = ".".join(path.split("/"))
         expect(report.name).to(equal(".".join((prefix, suite_name))))
 
+    def test_uses_entry_script_of_suite_run_by_another_process(self):
+        self.context.inject(path_to_entry_script, lambda: "run_all.py")
+        suite_name = "ForwardedSuite"
+        self.results.suite_name = suite_name
+        EventBroker.publish(
+            event=TestEvent.suite_started, suite_name=suite_name, entry_script=os.path.join("one/two", "test_tea.py")
+        )
+        self.publish_results()
+        expect(self.retrieve_report().name).to(equal("one.two." + suite_name))
+
     def test_masks_path_to_workspace_if_set(self):
         workspace_path = "/path/to/workspace"
         relative_path = "tests/something"
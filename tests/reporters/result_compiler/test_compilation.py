@@ -1,9 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase, main
 
 from expects import expect, be_a, contain, equal, have_length, raise_error
 
 from questions_three.constants import TestEvent, TestStatus
-from questions_three.event_broker import EventBroker
+from questions_three.event_broker import EventBroker, propagate_event_context
 from questions_three.reporters.result_compiler import ResultCompiler
 
 
@@ -283,6 +284,40 @@ class TestResultCompiler(TestCase):
         expect(results.tests).to(have_length(1))
         expect(results.tests[0].status).to(equal(TestStatus.running))
 
+    def test_keeps_interleaved_suites_apart(self):
+        compiled = []
+
+        def receive(suite_results, **kwargs):
+            compiled.append(suite_results)
+
+        EventBroker.subscribe(event=TestEvent.suite_results_compiled, func=receive)
+        for suite_name in ("first", "second"):
+            EventBroker.publish(event=TestEvent.suite_started, suite_name=suite_name)
+        for suite_name in ("first", "second"):
+            EventBroker.publish(event=TestEvent.test_started, suite_name=suite_name, test_name=suite_name + " test")
+        for suite_name in ("second", "first"):
+            EventBroker.publish(event=TestEvent.suite_ended, suite_name=suite_name)
+        expect({r.suite_name: [t.name for t in r.tests] for r in compiled}).to(
+            equal({"first": ["first test"], "second": ["second test"]})
+        )
+
+    def test_attributes_artifacts_from_tests_in_parallel_threads(self):
+        names = ["test %d" % n for n in range(20)]
+
+        def run_test(name):
+            start_test(name)
+            EventBroker.publish(event=TestEvent.artifact_created, artifact=name)
+            end_test(name)
+
+        start_suite()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(propagate_event_context(run_test), names))
+        end_suite()
+        results = self.retrieve_results()
+        expect(results.tests).to(have_length(len(names)))
+        expect({t.name: t.artifacts for t in results.tests}).to(equal({name: [name] for name in names}))
+        expect(results.artifacts).to(equal([]))
+
 
 if "__main__" == __name__:
     main()
@@ -90,6 +90,14 @@ class TestTimestamps(TestCase):
         end_suite()
         expect(self.results.suite_end_time).to(equal(expected))
 
+    def test_uses_time_the_event_was_published(self):
+        published = datetime.fromtimestamp(1516896985.203114)
+        self.fake_time.fixed_time = datetime.fromtimestamp(0)
+        with test_suite():
+            EventBroker.publish(event=TestEvent.test_started, test_name="spam", event_time=published)
+            end_test()
+        expect(self.results.tests[0].start_time).to(equal(published))
+
 
 if "__main__" == __name__:
     main()
@@ -1,10 +1,14 @@
 from unittest import TestCase, main
 
 from expects import expect, equal
+from multiprocessing.connection import Client
 from twin_sister import open_dependency_context
+from twin_sister.fakes import EmptyFake
 
 from questions_three.event_broker import EventBroker
+from questions_three.event_broker.event_bus import EVENT_BUS_ADDRESS_ENV_VAR, EVENT_BUS_KEY_ENV_VAR, EventForwarder
 from questions_three.reporters.artifact_saver import ArtifactSaver
+from questions_three.reporters.event_journal import EventJournal
 from questions_three.reporters.event_logger import EventLogger
 from questions_three.reporters.junit_reporter import JunitReporter
 from questions_three.reporters.result_compiler import ResultCompiler
@@ -32,6 +36,17 @@ class TestConfiguredReporters(TestCase):
         activate_reporters()
         expect(extract_active_reporters()).to(equal({EventLogger, ResultCompiler}))
 
+    def test_can_activate_optional_reporter(self):
+        self.context.set_env(EVENT_REPORTERS="EventJournal,ResultCompiler")
+        activate_reporters()
+        expect(extract_active_reporters()).to(equal({EventJournal, ResultCompiler}))
+
+    def test_only_forwards_events_when_launched_by_event_bus(self):
+        self.context.set_env(**{EVENT_BUS_ADDRESS_ENV_VAR: "/tmp/bus", EVENT_BUS_KEY_ENV_VAR: "00ff"})
+        self.context.inject(Client, lambda *args, **kwargs: EmptyFake())
+        activate_reporters()
+        expect(extract_active_reporters()).to(equal({EventForwarder}))
+
 
 if "__main__" == __name__:
     main()
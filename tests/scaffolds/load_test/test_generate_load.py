@@ -0,0 +1,198 @@
+from threading import Barrier, Lock
+from time import perf_counter, sleep
+from unittest import TestCase, main
+
+from expects import expect, be_above, be_a, be_below, equal, raise_error
+from twin_sister import open_dependency_context
+
+from questions_three.constants import TestEvent
+from questions_three.event_broker import EventBroker
+from questions_three.scaffolds.load_test import generate_load
+
+
+class Recorder:
+    def __init__(self, *events):
+        self.received = []
+        EventBroker.subscribe(events=events, func=self.receive)
+
+    def receive(self, **kwargs):
+        self.received.append(kwargs)
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+        self.lock = Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+
+
+class FakeClock:
+    """
+    Stands in for perf_counter and sleep.  Time passes only in sleep.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestGenerateLoad(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+
+    def tearDown(self):
+        self.context.close()
+        EventBroker.reset()
+
+    def test_makes_the_specified_number_of_calls(self):
+        func = Counter()
+        generate_load(func=func, virtual_users=3, iterations=10, suite_name="spam")
+        expect(func.calls).to(equal(10))
+
+    def test_runs_virtual_users_at_once(self):
+        barrier = Barrier(4)
+
+        def func():
+            barrier.wait(timeout=2)
+
+        measurements = generate_load(func=func, virtual_users=4, iterations=4, suite_name="spam")
+        expect(measurements["error_count"]).to(equal(0))
+
+    def test_stops_after_duration(self):
+        started = perf_counter()
+        generate_load(func=lambda: None, duration_seconds=0.1, suite_name="spam")
+        expect(perf_counter() - started).to(be_above(0.099))
+        expect(perf_counter() - started).to(be_below(1))
+
+    def test_starts_calls_at_target_rate(self):
+        started = perf_counter()
+        generate_load(func=lambda: None, virtual_users=2, iterations=5, requests_per_second=50, suite_name="spam")
+        # Calls start at 0, 20, 40, 60 and 80 ms
+        expect(perf_counter() - started).to(be_above(0.079))
+
+    def use_fake_clock(self):
+        clock = FakeClock()
+        self.context.inject(perf_counter, clock.perf_counter)
+        self.context.inject(sleep, clock.sleep)
+        return clock
+
+    def test_waits_between_calls_at_target_rate(self):
+        clock = self.use_fake_clock()
+        generate_load(func=lambda: None, iterations=4, requests_per_second=10, suite_name="spam")
+        expect([round(seconds, 6) for seconds in clock.sleeps]).to(equal([0.1, 0.1, 0.1]))
+
+    def test_starts_no_calls_after_duration(self):
+        self.use_fake_clock()
+        func = Counter()
+        generate_load(func=func, duration_seconds=1, requests_per_second=10, suite_name="spam")
+        expect(func.calls).to(equal(10))
+
+    def test_counts_exceptions_as_errors(self):
+        calls = Counter()
+
+        def func():
+            calls()
+            if calls.calls % 2:
+                raise RuntimeError("nope")
+
+        measurements = generate_load(func=func, iterations=10, suite_name="spam")
+        expect((measurements["error_count"], measurements["error_rate"])).to(equal((5, 0.5)))
+        expect(measurements["error_types"]).to(equal({"RuntimeError": 5}))
+
+    def test_reports_throughput_and_latency(self):
+        measurements = generate_load(func=lambda: None, iterations=100, suite_name="spam")
+        expect(measurements["request_count"]).to(equal(100))
+        expect(measurements["throughput_per_second"]).to(be_above(0))
+        expect(measurements["latency_seconds"]["p99"]).to(be_a(float))
+
+    def test_publishes_load_measured(self):
+        recorder = Recorder(TestEvent.load_measured)
+        generate_load(func=lambda: None, iterations=3, suite_name="spam", test_name="eggs")
+        (published,) = recorder.received
+        expect((published["suite_name"], published["test_name"], published["request_count"])).to(
+            equal(("spam", "eggs", 3))
+        )
+
+    def test_publishes_lifecycle_events_in_order(self):
+        recorder = Recorder(*list(TestEvent))
+        generate_load(func=lambda: None, iterations=1, suite_name="spam")
+        expect([published["event"] for published in recorder.received]).to(
+            equal(
+                [
+                    TestEvent.suite_started,
+                    TestEvent.test_started,
+                    TestEvent.load_measured,
+                    TestEvent.test_ended,
+                    TestEvent.suite_ended,
+                ]
+            )
+        )
+
+    def test_joins_suite_in_progress(self):
+        EventBroker.publish(event=TestEvent.suite_started, suite_name="outer")
+        recorder = Recorder(*list(TestEvent))
+        generate_load(func=lambda: None, iterations=1, suite_name="spam")
+        expect([(published["event"], published["suite_name"]) for published in recorder.received]).to(
+            equal(
+                [
+                    (TestEvent.test_started, "outer"),
+                    (TestEvent.load_measured, "outer"),
+                    (TestEvent.test_ended, "outer"),
+                ]
+            )
+        )
+
+    def test_names_suite_and_test_after_func(self):
+        recorder = Recorder(TestEvent.load_measured)
+
+        def check_spam():
+            pass
+
+        generate_load(func=check_spam, iterations=1)
+        expect((recorder.received[0]["suite_name"], recorder.received[0]["test_name"])).to(
+            equal(("check_spam", "check_spam under load"))
+        )
+
+    def test_fails_test_when_error_rate_exceeds_maximum(self):
+        recorder = Recorder(TestEvent.test_failed)
+
+        def func():
+            raise RuntimeError("nope")
+
+        generate_load(func=func, iterations=2, max_error_rate=0.1, suite_name="spam")
+        expect(recorder.received[0]["exception"]).to(be_a(AssertionError))
+
+    def test_passes_test_within_maximum_error_rate(self):
+        recorder = Recorder(TestEvent.test_failed, TestEvent.test_erred)
+        generate_load(func=lambda: None, iterations=2, max_error_rate=0.1, suite_name="spam")
+        expect(recorder.received).to(equal([]))
+
+    def test_events_from_virtual_users_name_the_test(self):
+        recorder = Recorder(TestEvent.http_request_sent)
+
+        def func():
+            EventBroker.publish(event=TestEvent.http_request_sent)
+
+        generate_load(func=func, virtual_users=2, iterations=2, suite_name="spam", test_name="eggs")
+        expect({(p["suite_name"], p["test_name"]) for p in recorder.received}).to(equal({("spam", "eggs")}))
+
+    def test_requires_duration_or_iterations(self):
+        expect(lambda: generate_load(func=lambda: None)).to(raise_error(TypeError))
+
+    def test_requires_positive_virtual_users(self):
+        expect(lambda: generate_load(func=lambda: None, iterations=1, virtual_users=0)).to(raise_error(TypeError))
+
+
+if "__main__" == __name__:
+    main()
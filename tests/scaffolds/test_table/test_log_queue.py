@@ -0,0 +1,55 @@
+from logging import StreamHandler
+from time import sleep
+from unittest import TestCase, main
+
+from expects import expect, have_length
+from twin_sister import open_dependency_context
+
+from questions_three.event_broker import EventBroker
+from questions_three.logging import disable_log_queue, log_queue_is_enabled, logger_for_module
+from questions_three.scaffolds.common.activate_reporters import activate_reporters
+from questions_three.scaffolds.test_table import execute_test_table
+
+
+class SlowSpyHandler(StreamHandler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        sleep(0.01)
+        self.messages.append(self.format(record))
+
+
+class TestLogQueue(TestCase):
+    def setUp(self):
+        EventBroker.reset()
+        self.context = open_dependency_context(supply_env=True, supply_logging=True)
+        self.spy = SlowSpyHandler()
+        self.context.logging.StreamHandler = lambda *args, **kwargs: self.spy
+        self.context.set_env(EVENT_REPORTERS="", LOG_QUEUE_ENABLED="true")
+        # As importing the scaffold does
+        activate_reporters()
+
+    def tearDown(self):
+        disable_log_queue()
+        self.context.close()
+        EventBroker.reset()
+
+    def test_activating_reporters_starts_queue(self):
+        assert log_queue_is_enabled(), "Log queue was not enabled"
+
+    def test_messages_are_written_by_end_of_table(self):
+        logger = logger_for_module("spam.eggs")
+
+        def test_func(n):
+            logger.info("message %d" % n)
+
+        execute_test_table(
+            suite_name="spam", table=(("n",), *((n,) for n in range(5))), func=test_func, randomize_order=False
+        )
+        expect(self.spy.messages).to(have_length(5))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,46 @@
+from unittest import TestCase, main
+
+from expects import expect, be_none, be_within, equal, have_length
+
+from questions_three.vanilla import LatencyHistogram
+
+
+class TestLatencyHistogram(TestCase):
+    def test_percentiles_are_within_five_percent(self):
+        histogram = LatencyHistogram()
+        for n in range(1, 1001):
+            histogram.add(n / 1000)
+        expect(histogram.percentile(50)).to(be_within(0.5 * 0.95, 0.5 * 1.05))
+        expect(histogram.percentile(95)).to(be_within(0.95 * 0.95, 0.95 * 1.05))
+        expect(histogram.percentile(99)).to(be_within(0.99 * 0.95, 0.99 * 1.05))
+
+    def test_percentile_stays_within_observed_range(self):
+        histogram = LatencyHistogram()
+        histogram.add(0.123)
+        expect(histogram.percentile(99)).to(equal(0.123))
+
+    def test_percentile_of_empty_histogram_is_none(self):
+        expect(LatencyHistogram().percentile(50)).to(be_none)
+
+    def test_memory_does_not_grow_with_sample_count(self):
+        histogram = LatencyHistogram()
+        for _ in range(10000):
+            histogram.add(0.05)
+        expect(histogram.buckets).to(have_length(1))
+
+    def test_merge_combines_counts(self):
+        first = LatencyHistogram()
+        first.add(0.1)
+        second = LatencyHistogram()
+        second.add(0.3)
+        first.merge(second)
+        expect((first.count, first.min, first.max)).to(equal((2, 0.1, 0.3)))
+
+    def test_statistics_include_percentiles(self):
+        histogram = LatencyHistogram()
+        histogram.add(0.2)
+        expect(sorted(histogram.statistics().keys())).to(equal(["max", "mean", "min", "p50", "p95", "p99"]))
+
+
+if "__main__" == __name__:
+    main()